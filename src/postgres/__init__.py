@@ -1,9 +1,33 @@
 from __future__ import annotations
 
+from postgres._backup_watch import WalStatus, get_wal_status, to_wal_status
+from postgres._basebackup import (
+    basebackup,
+    combine_backup,
+    get_backup_chain,
+    get_incremental_base,
+    list_backup_labels,
+    to_backup_label,
+    to_backup_type,
+)
+from postgres._bench import (
+    BenchResult,
+    append_bench_history,
+    parse_pgbench_output,
+    percentile,
+    read_bench_history,
+    read_pgbench_latencies,
+)
 from postgres._click import (
     ClickRepoNumOrName,
+    db_exclude_option,
+    db_include_option,
+    engine_option,
+    jobs_option,
+    metrics_dir_option,
     print_option,
     process_max_option,
+    progress_option,
     repo_option,
     stanza_argument,
     stanza_option,
@@ -12,46 +36,357 @@ from postgres._click import (
     user_option,
     version_option,
 )
-from postgres._constants import PATH_CONFIGS, PORT, PROCESS_MAX, VERSION
+from postgres._clones import (
+    CloneSpec,
+    find_free_port,
+    get_clones_path,
+    get_cluster_ports,
+    prune_clones,
+    read_clones,
+    to_clone_spec,
+    write_clones,
+)
+from postgres._constants import (
+    CLONE_TTL,
+    JOBS,
+    MAX_CLIENT_CONN,
+    MAX_CONNECTIONS,
+    PATH_CONFIGS,
+    POOLER_PORT,
+    PORT,
+    PREWARM_LIMIT,
+    PROCESS_MAX,
+    SHARED_BUFFERS,
+    VERSION,
+)
+from postgres._databases import (
+    DatabaseSize,
+    format_database_sizes,
+    get_database_sizes,
+    is_database_restored,
+    parse_manifest_sizes,
+)
 from postgres._enums import (
+    DEFAULT_BACKUP_ENGINE,
     DEFAULT_BACKUP_TYPE,
     DEFAULT_CIPHER_TYPE,
+    DEFAULT_DUMP_FORMAT,
     DEFAULT_REPO_TYPE,
+    DEFAULT_UPGRADE_MODE,
+    BackupEngine,
     BackupType,
+    BenchWorkload,
     CipherType,
+    DumpFormat,
+    FleetAction,
+    PoolerAction,
     RepoType,
+    UpgradeMode,
+)
+from postgres._fleet import (
+    FleetMember,
+    FleetResult,
+    format_fleet_results,
+    get_inventory_path,
+    read_inventory,
+    run_fleet,
+    summarize_info,
+    write_inventory,
+)
+from postgres._host import (
+    HostTuning,
+    get_cluster_shared_buffers,
+    get_host_tuning,
+    get_hugepage_size,
+    get_nr_hugepages,
+    parse_memory,
+    set_up_host,
+    write_host_tuning,
+)
+from postgres._logical import TableTimer, run_with_table_timings
+from postgres._maintain import (
+    BloatEstimate,
+    MaintenanceResult,
+    estimate_expected_size,
+    estimate_freed,
+    get_bloat_estimates,
+    group_by_table,
+    maintain_relation,
+    read_maintain_state,
+    select_bloated,
+    write_maintain_state,
+)
+from postgres._metrics import CommandMetrics, write_metrics, yield_metrics
+from postgres._pooler import PoolSizes, get_pool_sizes, set_up_pooler
+from postgres._progress import (
+    ProgressCallback,
+    ProgressEvent,
+    ProgressTracker,
+    format_bytes,
+    log_progress,
+    run_with_progress,
+)
+from postgres._recovery import (
+    ReplayStatus,
+    format_lsn,
+    get_archive_max_lsn,
+    parse_lsn,
+    parse_recovery_state,
+    wait_until_ready,
+    wal_segment_to_lsn,
+)
+from postgres._recovery_profile import (
+    RecoveryProfile,
+    apply_recovery_profile,
+    revert_recovery_profile,
+)
+from postgres._repo_stats import (
+    BackupTypeStats,
+    RepoStats,
+    compute_repo_stats,
+    format_repo_stats,
+)
+from postgres._restore_estimate import (
+    RestoreEstimate,
+    RunKind,
+    RunRecord,
+    append_run_history,
+    estimate_restores,
+    format_restore_estimates,
+    get_history_path,
+    read_run_history,
+    record_run,
+)
+from postgres._session import (
+    close_pools,
+    execute,
+    format_rows,
+    has_driver,
+    is_accepting,
+    is_connection_error,
+    set_role_password,
 )
 from postgres._settings import RetentionSettings
+from postgres._top_queries import (
+    QueryStats,
+    diff_query_stats,
+    format_top_queries,
+    get_query_stats,
+    get_top_queries,
+    read_query_stats,
+    write_query_stats,
+)
 from postgres._types import RepoNameMapping, RepoNumOrName
-from postgres._utilities import drop_cluster, get_pg_root, run_or_as_user, to_repo_num
+from postgres._utilities import (
+    analyze_in_stages,
+    drop_cluster,
+    get_info_json,
+    get_pg_bin,
+    get_pg_data,
+    get_pg_root,
+    get_restore_set,
+    read_json_state,
+    read_postgresql_conf,
+    run_or_as_user,
+    run_psql,
+    stream_or_as_user,
+    to_path_map,
+    to_repo_num,
+    write_json_state,
+)
+from postgres._verify import (
+    VerifyParser,
+    VerifyResult,
+    read_verify_state,
+    select_backup_sets,
+    write_verify_state,
+)
+from postgres._warm_up import (
+    get_hot_relations,
+    prewarm_relations,
+    read_hot_relations,
+    save_hot_relations,
+    warm_up,
+    write_hot_relations,
+)
 
 __all__ = [
+    "CLONE_TTL",
+    "DEFAULT_BACKUP_ENGINE",
     "DEFAULT_BACKUP_TYPE",
     "DEFAULT_CIPHER_TYPE",
+    "DEFAULT_DUMP_FORMAT",
     "DEFAULT_REPO_TYPE",
+    "DEFAULT_UPGRADE_MODE",
+    "JOBS",
+    "MAX_CLIENT_CONN",
+    "MAX_CONNECTIONS",
     "PATH_CONFIGS",
+    "POOLER_PORT",
     "PORT",
+    "PREWARM_LIMIT",
     "PROCESS_MAX",
+    "SHARED_BUFFERS",
     "VERSION",
+    "BackupEngine",
     "BackupType",
+    "BackupTypeStats",
+    "BenchResult",
+    "BenchWorkload",
+    "BloatEstimate",
     "CipherType",
     "ClickRepoNumOrName",
+    "CloneSpec",
+    "CommandMetrics",
+    "DatabaseSize",
+    "DumpFormat",
+    "FleetAction",
+    "FleetMember",
+    "FleetResult",
+    "HostTuning",
+    "MaintenanceResult",
+    "PoolSizes",
+    "PoolerAction",
+    "ProgressCallback",
+    "ProgressEvent",
+    "ProgressTracker",
+    "QueryStats",
+    "RecoveryProfile",
+    "ReplayStatus",
     "RepoNameMapping",
     "RepoNumOrName",
+    "RepoStats",
     "RepoType",
+    "RestoreEstimate",
     "RetentionSettings",
+    "RunKind",
+    "RunRecord",
+    "TableTimer",
+    "UpgradeMode",
+    "VerifyParser",
+    "VerifyResult",
+    "WalStatus",
+    "analyze_in_stages",
+    "append_bench_history",
+    "append_run_history",
+    "apply_recovery_profile",
+    "basebackup",
+    "close_pools",
+    "combine_backup",
+    "compute_repo_stats",
+    "db_exclude_option",
+    "db_include_option",
+    "diff_query_stats",
     "drop_cluster",
+    "engine_option",
+    "estimate_expected_size",
+    "estimate_freed",
+    "estimate_restores",
+    "execute",
+    "find_free_port",
+    "format_bytes",
+    "format_database_sizes",
+    "format_fleet_results",
+    "format_lsn",
+    "format_repo_stats",
+    "format_restore_estimates",
+    "format_rows",
+    "format_top_queries",
+    "get_archive_max_lsn",
+    "get_backup_chain",
+    "get_bloat_estimates",
+    "get_clones_path",
+    "get_cluster_ports",
+    "get_cluster_shared_buffers",
+    "get_database_sizes",
+    "get_history_path",
+    "get_host_tuning",
+    "get_hot_relations",
+    "get_hugepage_size",
+    "get_incremental_base",
+    "get_info_json",
+    "get_inventory_path",
+    "get_nr_hugepages",
+    "get_pg_bin",
+    "get_pg_data",
     "get_pg_root",
+    "get_pool_sizes",
+    "get_query_stats",
+    "get_restore_set",
+    "get_top_queries",
+    "get_wal_status",
+    "group_by_table",
+    "has_driver",
+    "is_accepting",
+    "is_connection_error",
+    "is_database_restored",
+    "jobs_option",
+    "list_backup_labels",
+    "log_progress",
+    "maintain_relation",
+    "metrics_dir_option",
+    "parse_lsn",
+    "parse_manifest_sizes",
+    "parse_memory",
+    "parse_pgbench_output",
+    "parse_recovery_state",
+    "percentile",
+    "prewarm_relations",
     "print_option",
     "process_max_option",
+    "progress_option",
+    "prune_clones",
+    "read_bench_history",
+    "read_clones",
+    "read_hot_relations",
+    "read_inventory",
+    "read_json_state",
+    "read_maintain_state",
+    "read_pgbench_latencies",
+    "read_postgresql_conf",
+    "read_query_stats",
+    "read_run_history",
+    "read_verify_state",
+    "record_run",
     "repo_option",
+    "revert_recovery_profile",
+    "run_fleet",
     "run_or_as_user",
+    "run_psql",
+    "run_with_progress",
+    "run_with_table_timings",
+    "save_hot_relations",
+    "select_backup_sets",
+    "select_bloated",
+    "set_role_password",
+    "set_up_host",
+    "set_up_pooler",
     "stanza_argument",
     "stanza_option",
+    "stream_or_as_user",
+    "summarize_info",
+    "to_backup_label",
+    "to_backup_type",
+    "to_clone_spec",
+    "to_path_map",
     "to_repo_num",
+    "to_wal_status",
     "type_default_option",
     "type_no_default_option",
     "user_option",
     "version_option",
+    "wait_until_ready",
+    "wal_segment_to_lsn",
+    "warm_up",
+    "write_clones",
+    "write_host_tuning",
+    "write_hot_relations",
+    "write_inventory",
+    "write_json_state",
+    "write_maintain_state",
+    "write_metrics",
+    "write_query_stats",
+    "write_verify_state",
+    "yield_metrics",
 ]
 __version__ = "0.2.15"
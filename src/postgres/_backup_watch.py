@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from utilities.core import to_logger
+
+from postgres._constants import PORT
+from postgres._progress import format_bytes
+from postgres._recovery import parse_lsn
+from postgres._utilities import run_psql
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+_LOGGER = to_logger(__name__)
+_DAY = 24 * 60 * 60
+_LSN_SQL = """
+SELECT CASE WHEN pg_is_in_recovery()
+    THEN pg_last_wal_replay_lsn()
+    ELSE pg_current_wal_lsn()
+END
+"""
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class WalStatus:
+    lsn: int = field()
+    last_backup_lsn: int | None = field(default=None)
+    last_backup_time: float | None = field(default=None)
+    recent_backups: int = field(default=0)
+
+    @property
+    def wal_since_backup(self) -> int | None:
+        """Bytes of WAL generated since the last backup stopped."""
+        if self.last_backup_lsn is None:
+            return None
+        return max(self.lsn - self.last_backup_lsn, 0)
+
+    def decide(
+        self,
+        *,
+        now: float,
+        threshold: int,
+        min_interval: float = 0.0,
+        max_per_day: int | None = None,
+    ) -> tuple[bool, str]:
+        """Decide whether to back up now, and why."""
+        wal = self.wal_since_backup
+        if (wal is not None) and (wal < threshold):
+            return False, (
+                f"{format_bytes(wal)} of WAL since the last backup, "
+                f"below {format_bytes(threshold)}"
+            )
+        if (self.last_backup_time is not None) and (
+            (since := now - self.last_backup_time) < min_interval
+        ):
+            return False, (
+                f"last backup was {since:.0f}s ago, within the {min_interval:.0f}s "
+                "minimum interval"
+            )
+        if (max_per_day is not None) and (self.recent_backups >= max_per_day):
+            return False, f"{self.recent_backups} backup(s) in the last day already"
+        if wal is None:
+            return True, "no backup yet"
+        return True, (
+            f"{format_bytes(wal)} of WAL since the last backup, "
+            f"reaching {format_bytes(threshold)}"
+        )
+
+
+##
+
+
+def get_wal_status(
+    info: Iterable[dict[str, Any]],
+    /,
+    *,
+    stanza: str,
+    now: float,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> WalStatus | None:
+    """Get the WAL generated since a stanza's last backup.
+
+    Returns 'None' while a standby has yet to replay any WAL.
+    """
+    output = run_psql(_LSN_SQL, port=port, user=user).strip()
+    if output == "":
+        return None
+    return to_wal_status(info, stanza=stanza, lsn=parse_lsn(output), now=now)
+
+
+def to_wal_status(
+    info: Iterable[dict[str, Any]], /, *, stanza: str, lsn: int, now: float
+) -> WalStatus:
+    """Combine a 'pgbackrest info' output with the cluster's current LSN."""
+    backups = [b for s in info if s["name"] == stanza for b in s.get("backup", [])]
+    if len(backups) == 0:
+        return WalStatus(lsn=lsn)
+    last = max(backups, key=lambda b: int(b["timestamp"]["stop"]))
+    return WalStatus(
+        lsn=lsn,
+        last_backup_lsn=parse_lsn(last["lsn"]["stop"]),
+        last_backup_time=float(last["timestamp"]["stop"]),
+        recent_backups=sum(int(b["timestamp"]["stop"]) > now - _DAY for b in backups),
+    )
+
+
+__all__ = ["WalStatus", "get_wal_status", "to_wal_status"]
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, assert_never
+
+from utilities.core import to_logger
+from utilities.subprocess import chown
+
+from postgres._constants import PORT, VERSION
+from postgres._enums import DEFAULT_BACKUP_TYPE, BackupType
+from postgres._progress import format_bytes
+from postgres._utilities import get_pg_bin, run_or_as_user
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+_SUFFIXES: dict[str, BackupType] = {t.suffix: t for t in BackupType}
+
+
+##
+
+
+def basebackup(
+    stanza: str,
+    /,
+    *,
+    path: PathLike,
+    type_: BackupType = DEFAULT_BACKUP_TYPE,
+    version: int = VERSION,
+    port: int = PORT,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+    now: datetime | None = None,
+) -> Path:
+    """Back up a cluster with 'pg_basebackup', incrementally if possible."""
+    root = Path(path, stanza)
+    existing = list_backup_labels(root)
+    base = get_incremental_base(existing, type_=type_)
+    if (type_ is not BackupType.full) and (base is None):
+        _LOGGER.warning("No prior backup for %s backup; taking full", type_.desc)
+        type_ = BackupType.full
+    label = to_backup_label(type_, now=now)
+    dest = root / label
+    _LOGGER.info(
+        "%s 'pg_basebackup' of %r to %r...", type_.desc.title(), stanza, str(dest)
+    )
+    args: list[str] = [
+        str(get_pg_bin("pg_basebackup", version=version)),
+        f"--pgdata={dest}",
+        f"--port={port}",
+        "--checkpoint=fast",
+        "--wal-method=stream",
+        "--no-password",
+    ]
+    if base is not None:
+        args.append(f"--incremental={root / base / 'backup_manifest'}")
+    run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
+    size = sum(p.stat().st_size for p in dest.rglob("*") if p.is_file())
+    _LOGGER.info(
+        "Finished %s 'pg_basebackup' of %r to %r (%s)",
+        type_.desc,
+        stanza,
+        str(dest),
+        format_bytes(size),
+    )
+    return dest
+
+
+def combine_backup(
+    stanza: str,
+    /,
+    *,
+    path: PathLike,
+    output: PathLike,
+    label: str | None = None,
+    version: int = VERSION,
+    user: str | None = None,
+    sudo: bool = False,
+    print: bool = True,  # noqa: A002
+) -> None:
+    """Reconstruct a data directory from a chain of 'pg_basebackup' backups."""
+    root = Path(path, stanza)
+    chain = get_backup_chain(list_backup_labels(root), label=label)
+    _LOGGER.info("Combining %s into %r...", ", ".join(chain), str(output))
+    run_or_as_user(
+        str(get_pg_bin("pg_combinebackup", version=version)),
+        *(str(root / c) for c in chain),
+        f"--output={output}",
+        user=user,
+        print=print,
+        logger=_LOGGER,
+    )
+    chown(output, sudo=sudo, recursive=True, owner="postgres", group="postgres")
+    _LOGGER.info("Finished combining %s into %r", chain[-1], str(output))
+
+
+##
+
+
+def get_backup_chain(
+    labels: Iterable[str], /, *, label: str | None = None
+) -> list[str]:
+    """Get the chain of backups needed to restore a given backup."""
+    sorted_ = sorted(labels)
+    if len(sorted_) == 0:
+        msg = "Expected at least 1 backup"
+        raise ValueError(msg)
+    if label is None:
+        label = sorted_[-1]
+    if label not in sorted_:
+        msg = f"Backup {label!r} not found"
+        raise ValueError(msg)
+    chain: list[str] = [label]
+    current = label
+    while (type_ := to_backup_type(current)) is not BackupType.full:
+        before = sorted_[: sorted_.index(current)]
+        if type_ is BackupType.diff:
+            before = [b for b in before if to_backup_type(b) is BackupType.full]
+        if len(before) == 0:
+            msg = f"Backup {current!r} has no parent"
+            raise ValueError(msg)
+        current = before[-1]
+        chain.append(current)
+    return chain[::-1]
+
+
+def get_incremental_base(
+    labels: Iterable[str], /, *, type_: BackupType = DEFAULT_BACKUP_TYPE
+) -> str | None:
+    """Get the backup which a new backup should be taken relative to."""
+    sorted_ = sorted(labels)
+    match type_:
+        case BackupType.full:
+            return None
+        case BackupType.diff:
+            fulls = [b for b in sorted_ if to_backup_type(b) is BackupType.full]
+            return fulls[-1] if len(fulls) >= 1 else None
+        case BackupType.incr:
+            return sorted_[-1] if len(sorted_) >= 1 else None
+        case never:
+            assert_never(never)
+
+
+def list_backup_labels(path: PathLike, /) -> list[str]:
+    """List the backups under a stanza directory."""
+    path = Path(path)
+    if not path.is_dir():
+        return []
+    return sorted(
+        p.name
+        for p in path.iterdir()
+        if p.is_dir()
+        and (p.name[-1:] in _SUFFIXES)
+        and (p / "backup_manifest").is_file()
+    )
+
+
+def to_backup_label(type_: BackupType, /, *, now: datetime | None = None) -> str:
+    """Get the label of a new backup."""
+    now_use = datetime.now(tz=UTC) if now is None else now
+    return f"{now_use:%Y%m%d-%H%M%S}{type_.suffix}"
+
+
+def to_backup_type(label: str, /) -> BackupType:
+    """Get the type of a backup from its label."""
+    try:
+        return _SUFFIXES[label[-1:]]
+    except KeyError:
+        msg = f"Invalid backup label {label!r}"
+        raise ValueError(msg) from None
+
+
+__all__ = [
+    "basebackup",
+    "combine_backup",
+    "get_backup_chain",
+    "get_incremental_base",
+    "list_backup_labels",
+    "to_backup_label",
+    "to_backup_type",
+]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass, field
+from json import dumps, loads
+from math import ceil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from utilities.core import to_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+_TPS = re.compile(r"^tps = (?P<tps>\d+(?:\.\d+)?)", flags=re.MULTILINE)
+_LATENCY = re.compile(
+    r"^latency average = (?P<latency>\d+(?:\.\d+)?) ms", flags=re.MULTILINE
+)
+_TRANSACTIONS = re.compile(
+    r"^number of transactions actually processed: (?P<n>\d+)", flags=re.MULTILINE
+)
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class BenchResult:
+    timestamp: str = field()
+    host: str = field()
+    label: str | None = field(default=None)
+    server_version: str | None = field(default=None)
+    scale: int = field()
+    workload: str = field()
+    clients: int = field()
+    jobs: int = field()
+    duration: int = field()
+    transactions: int = field(default=0)
+    tps: float = field(default=0.0)
+    latency_avg_ms: float | None = field(default=None)
+    latency_p50_ms: float | None = field(default=None)
+    latency_p95_ms: float | None = field(default=None)
+    latency_p99_ms: float | None = field(default=None)
+
+    @property
+    def text(self) -> str:
+        def fmt(value: float | None, /) -> str:
+            return "?" if value is None else f"{value:.2f}"
+
+        return (
+            f"{self.workload} x{self.clients}: {self.tps:.1f} tps, latency avg "
+            f"{fmt(self.latency_avg_ms)} / p50 {fmt(self.latency_p50_ms)} / "
+            f"p95 {fmt(self.latency_p95_ms)} / p99 {fmt(self.latency_p99_ms)} ms"
+        )
+
+
+##
+
+
+def parse_pgbench_output(text: str, /) -> tuple[float, float | None, int]:
+    """Parse the TPS, average latency and transactions printed by 'pgbench'."""
+    tps = _TPS.search(text)
+    latency = _LATENCY.search(text)
+    transactions = _TRANSACTIONS.search(text)
+    return (
+        0.0 if tps is None else float(tps["tps"]),
+        None if latency is None else float(latency["latency"]),
+        0 if transactions is None else int(transactions["n"]),
+    )
+
+
+def read_pgbench_latencies(paths: Iterable[PathLike], /) -> list[float]:
+    """Read per-transaction latencies, in ms, from 'pgbench --log' files."""
+    latencies: list[float] = []
+    for path in paths:
+        for line in Path(path).read_text().splitlines():
+            parts = line.split()
+            if len(parts) >= 3:
+                latencies.append(int(parts[2]) / 1000)
+    return latencies
+
+
+def percentile(values: Iterable[float], q: float, /) -> float | None:
+    """Get a percentile by the nearest-rank method."""
+    sorted_ = sorted(values)
+    if len(sorted_) == 0:
+        return None
+    rank = max(ceil(q / 100 * len(sorted_)), 1)
+    return sorted_[rank - 1]
+
+
+##
+
+
+def append_bench_history(results: Iterable[BenchResult], /, *, path: PathLike) -> None:
+    """Append results to a JSON lines history file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open(mode="a") as fh:
+        for result in results:
+            _ = fh.write(f"{dumps(asdict(result))}\n")
+    _LOGGER.info("Appended results to %r", str(path))
+
+
+def read_bench_history(path: PathLike, /) -> list[BenchResult]:
+    """Read a JSON lines history file."""
+    path = Path(path)
+    if not path.is_file():
+        return []
+    results: list[BenchResult] = []
+    for line in path.read_text().splitlines():
+        if line.strip() != "":
+            data: dict[str, Any] = loads(line)
+            results.append(BenchResult(**data))
+    return results
+
+
+__all__ = [
+    "BenchResult",
+    "append_bench_history",
+    "parse_pgbench_output",
+    "percentile",
+    "read_bench_history",
+    "read_pgbench_latencies",
+]
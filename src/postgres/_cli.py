@@ -5,22 +5,53 @@ from utilities.click import CONTEXT_SETTINGS
 
 from postgres import __version__
 from postgres.commands._backup import make_backup_cmd
+from postgres.commands._backup_watch import make_backup_watch_cmd
+from postgres.commands._bench import make_bench_cmd
 from postgres.commands._check import make_check_cmd
+from postgres.commands._clone import make_clone_cmd, make_prune_clones_cmd
+from postgres.commands._databases import make_databases_cmd
+from postgres.commands._dump import make_dump_cmd
+from postgres.commands._expire import make_expire_cmd
+from postgres.commands._fleet import make_fleet_cmd
 from postgres.commands._info import make_info_cmd
+from postgres.commands._load import make_load_cmd
+from postgres.commands._maintain import make_maintain_cmd
+from postgres.commands._pooler import make_pooler_cmd
+from postgres.commands._repo_stats import make_repo_stats_cmd
 from postgres.commands._restore import make_restore_cmd
 from postgres.commands._set_up import make_set_up_cmd
+from postgres.commands._set_up_standby import make_set_up_standby_cmd
 from postgres.commands._stanza_create import make_stanza_create_cmd
 from postgres.commands._start import make_start_cmd
 from postgres.commands._stop import make_stop_cmd
+from postgres.commands._top_queries import make_top_queries_cmd
+from postgres.commands._upgrade import make_upgrade_cmd
+from postgres.commands._verify import make_verify_cmd
 
 backup_cli = make_backup_cmd()
+backup_watch_cli = make_backup_watch_cmd()
+bench_cli = make_bench_cmd()
 check_cli = make_check_cmd()
+clone_cli = make_clone_cmd()
+databases_cli = make_databases_cmd()
+dump_cli = make_dump_cmd()
+expire_cli = make_expire_cmd()
+fleet_cli = make_fleet_cmd()
 info_cli = make_info_cmd()
+load_cli = make_load_cmd()
+maintain_cli = make_maintain_cmd()
+pooler_cli = make_pooler_cmd()
+prune_clones_cli = make_prune_clones_cmd()
+repo_stats_cli = make_repo_stats_cmd()
 restore_cli = make_restore_cmd()
 set_up_cli = make_set_up_cmd()
+set_up_standby_cli = make_set_up_standby_cmd()
 stanza_create_cli = make_stanza_create_cmd()
 start_cli = make_start_cmd()
 stop_cli = make_stop_cmd()
+top_queries_cli = make_top_queries_cmd()
+upgrade_cli = make_upgrade_cmd()
+verify_cli = make_verify_cmd()
 
 
 @group(**CONTEXT_SETTINGS)
@@ -29,23 +60,55 @@ def group_cli() -> None: ...
 
 
 _ = make_backup_cmd(cli=group_cli.command, name="backup")
+_ = make_backup_watch_cmd(cli=group_cli.command, name="backup-watch")
+_ = make_bench_cmd(cli=group_cli.command, name="bench")
 _ = make_check_cmd(cli=group_cli.command, name="check")
+_ = make_clone_cmd(cli=group_cli.command, name="clone")
+_ = make_databases_cmd(cli=group_cli.command, name="databases")
+_ = make_dump_cmd(cli=group_cli.command, name="dump")
+_ = make_expire_cmd(cli=group_cli.command, name="expire")
+_ = make_fleet_cmd(cli=group_cli.command, name="fleet")
 _ = make_info_cmd(cli=group_cli.command, name="info")
+_ = make_load_cmd(cli=group_cli.command, name="load")
+_ = make_maintain_cmd(cli=group_cli.command, name="maintain")
+_ = make_pooler_cmd(cli=group_cli.command, name="pooler")
+_ = make_prune_clones_cmd(cli=group_cli.command, name="prune-clones")
+_ = make_repo_stats_cmd(cli=group_cli.command, name="repo-stats")
 _ = make_restore_cmd(cli=group_cli.command, name="restore")
 _ = make_set_up_cmd(cli=group_cli.command, name="set-up")
+_ = make_set_up_standby_cmd(cli=group_cli.command, name="set-up-standby")
 _ = make_stanza_create_cmd(cli=group_cli.command, name="stanza-create")
 _ = make_start_cmd(cli=group_cli.command, name="start")
 _ = make_stop_cmd(cli=group_cli.command, name="stop")
+_ = make_top_queries_cmd(cli=group_cli.command, name="top-queries")
+_ = make_upgrade_cmd(cli=group_cli.command, name="upgrade")
+_ = make_verify_cmd(cli=group_cli.command, name="verify")
 
 
 __all__ = [
     "backup_cli",
+    "backup_watch_cli",
+    "bench_cli",
     "check_cli",
+    "clone_cli",
+    "databases_cli",
+    "dump_cli",
+    "expire_cli",
+    "fleet_cli",
     "group_cli",
     "info_cli",
+    "load_cli",
+    "maintain_cli",
+    "pooler_cli",
+    "prune_clones_cli",
+    "repo_stats_cli",
     "restore_cli",
     "set_up_cli",
+    "set_up_standby_cli",
     "stanza_create_cli",
     "start_cli",
     "stop_cli",
+    "top_queries_cli",
+    "upgrade_cli",
+    "verify_cli",
 ]
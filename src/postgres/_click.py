@@ -2,11 +2,17 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, override
 
+import utilities.click
 from click import Context, Parameter, ParamType
 from utilities.click import Enum, Str, argument, flag, option
 
-from postgres._constants import PROCESS_MAX, VERSION
-from postgres._enums import DEFAULT_BACKUP_TYPE, BackupType
+from postgres._constants import JOBS, PROCESS_MAX, VERSION
+from postgres._enums import (
+    DEFAULT_BACKUP_ENGINE,
+    DEFAULT_BACKUP_TYPE,
+    BackupEngine,
+    BackupType,
+)
 
 if TYPE_CHECKING:
     from postgres._types import RepoNumOrName
@@ -33,7 +39,37 @@ class ClickRepoNumOrName(ParamType):
 # options
 
 
+db_exclude_option = option(
+    "--db-exclude",
+    type=Str(),
+    multiple=True,
+    help="Database to exclude from a selective restore",
+)
+db_include_option = option(
+    "--db-include",
+    type=Str(),
+    multiple=True,
+    help="Database to include in a selective restore",
+)
+engine_option = option(
+    "--engine",
+    type=Enum(BackupEngine),
+    default=DEFAULT_BACKUP_ENGINE,
+    help="Backup engine",
+)
+jobs_option = option(
+    "--jobs", type=int, default=JOBS, help="Number of parallel jobs to use"
+)
+metrics_dir_option = option(
+    "--metrics-dir",
+    type=utilities.click.Path(exist="dir if exists"),
+    default=None,
+    help="Node exporter textfile directory to write metrics to",
+)
 print_option = flag("--print", default=True, help="Print the output to the console")
+progress_option = flag(
+    "--progress", default=False, help="Report progress while running"
+)
 process_max_option = option(
     "--process-max",
     type=int,
@@ -55,8 +91,14 @@ version_option = option("--version", type=int, default=VERSION, help="Postgres v
 
 __all__ = [
     "ClickRepoNumOrName",
+    "db_exclude_option",
+    "db_include_option",
+    "engine_option",
+    "jobs_option",
+    "metrics_dir_option",
     "print_option",
     "process_max_option",
+    "progress_option",
     "repo_option",
     "stanza_argument",
     "stanza_option",
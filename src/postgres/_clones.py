@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import socket
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from json import loads
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from installer import get_root
+from utilities.core import to_logger
+from utilities.subprocess import RunCalledProcessError, RunFileNotFoundError
+
+from postgres._constants import CLONE_TTL, PORT, VERSION
+from postgres._utilities import drop_cluster, run_or_as_user, write_json_state
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class CloneSpec:
+    name: str = field()
+    stanza: str = field()
+    version: int = field(default=VERSION)
+    port: int = field()
+    datadir: Path = field()
+    created: datetime = field()
+    expires: datetime = field()
+
+    def is_expired(self, *, now: datetime | None = None) -> bool:
+        now_use = datetime.now(tz=UTC) if now is None else now
+        return self.expires <= now_use
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "stanza": self.stanza,
+            "version": self.version,
+            "port": self.port,
+            "datadir": str(self.datadir),
+            "created": self.created.isoformat(),
+            "expires": self.expires.isoformat(),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], /) -> CloneSpec:
+        return cls(
+            name=data["name"],
+            stanza=data["stanza"],
+            version=int(data["version"]),
+            port=int(data["port"]),
+            datadir=Path(data["datadir"]),
+            created=datetime.fromisoformat(data["created"]),
+            expires=datetime.fromisoformat(data["expires"]),
+        )
+
+
+def to_clone_spec(
+    name: str,
+    stanza: str,
+    /,
+    *,
+    version: int = VERSION,
+    port: int,
+    datadir: PathLike,
+    ttl: timedelta = CLONE_TTL,
+    now: datetime | None = None,
+) -> CloneSpec:
+    """Make the record of a new clone."""
+    now_use = datetime.now(tz=UTC) if now is None else now
+    return CloneSpec(
+        name=name,
+        stanza=stanza,
+        version=version,
+        port=port,
+        datadir=Path(datadir),
+        created=now_use,
+        expires=now_use + ttl,
+    )
+
+
+##
+
+
+def get_clones_path(*, root: PathLike | None = None) -> Path:
+    """Get the path of the clone registry."""
+    return get_root(root=root) / "var/lib/postgresql/clones.json"
+
+
+def read_clones(*, root: PathLike | None = None) -> list[CloneSpec]:
+    """Read the clone registry."""
+    path = get_clones_path(root=root)
+    try:
+        text = path.read_text()
+    except FileNotFoundError:
+        return []
+    return sorted(CloneSpec.from_json(c) for c in loads(text))
+
+
+def write_clones(
+    clones: Iterable[CloneSpec], /, *, root: PathLike | None = None
+) -> None:
+    """Write the clone registry, atomically."""
+    state = [c.to_json() for c in sorted(clones)]
+    write_json_state(state, path=get_clones_path(root=root))
+
+
+def prune_clones(
+    *, now: datetime | None = None, root: PathLike | None = None, sudo: bool = False
+) -> list[CloneSpec]:
+    """Drop the clones whose TTL has expired."""
+    clones = read_clones(root=root)
+    expired = [c for c in clones if c.is_expired(now=now)]
+    for clone in expired:
+        _LOGGER.info("Clone %r expired at %s; dropping...", clone.name, clone.expires)
+        drop_cluster(clone.name, version=clone.version, sudo=sudo)
+    if len(expired) >= 1:
+        write_clones([c for c in clones if c not in expired], root=root)
+    return expired
+
+
+##
+
+
+def find_free_port(*, start: int = PORT + 1, used: Iterable[int] = ()) -> int:
+    """Find a port which no cluster is configured for and nothing is bound to."""
+    used_set = set(used)
+    for port in range(start, 65536):
+        if port in used_set:
+            continue
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(("127.0.0.1", port))
+            except OSError:
+                continue
+        return port
+    msg = f"No free port at or above {start}"
+    raise RuntimeError(msg)
+
+
+def get_cluster_ports() -> list[int]:
+    """Get the ports of all configured clusters."""
+    try:
+        output = run_or_as_user("pg_lsclusters", "--no-header", return_stdout=True)
+    except (RunCalledProcessError, RunFileNotFoundError):
+        return []
+    return [int(line.split()[2]) for line in output.splitlines() if line.strip()]
+
+
+__all__ = [
+    "CloneSpec",
+    "find_free_port",
+    "get_clones_path",
+    "get_cluster_ports",
+    "prune_clones",
+    "read_clones",
+    "to_clone_spec",
+    "write_clones",
+]
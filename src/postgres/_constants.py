@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from utilities.constants import CPU_COUNT
@@ -9,12 +10,31 @@ if TYPE_CHECKING:
     from pathlib import Path
 
 
+CLONE_TTL: timedelta = timedelta(hours=24)
+JOBS: int = CPU_COUNT
+MAX_CLIENT_CONN: int = 5000
+MAX_CONNECTIONS: int = 100
 PORT: int = 5432
+POOLER_PORT: int = 6432
+PREWARM_LIMIT: int = 100
 PROCESS_MAX: int = max(round(CPU_COUNT / 4), 1)
+SHARED_BUFFERS: str = "128MB"
 VERSION: int = 17
 
 
 PATH_CONFIGS: Path = files(anchor="postgres") / "configs"
 
 
-__all__ = ["PATH_CONFIGS", "PORT", "PROCESS_MAX", "VERSION"]
+__all__ = [
+    "CLONE_TTL",
+    "JOBS",
+    "MAX_CLIENT_CONN",
+    "MAX_CONNECTIONS",
+    "PATH_CONFIGS",
+    "POOLER_PORT",
+    "PORT",
+    "PREWARM_LIMIT",
+    "PROCESS_MAX",
+    "SHARED_BUFFERS",
+    "VERSION",
+]
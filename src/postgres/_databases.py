@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from json import loads
+from typing import TYPE_CHECKING, Any
+
+from utilities.core import always_iterable, to_logger
+
+from postgres._progress import format_bytes
+from postgres._utilities import (
+    get_info_json,
+    get_restore_set,
+    run_or_as_user,
+    to_repo_num,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from utilities.types import MaybeIterable
+
+    from postgres._types import RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+_FILE = re.compile(
+    r"^pg_(?:data/base|tblspc/\d+/[^/]+)/(?P<oid>\d+)/[^=]+=(?P<info>.*)$"
+)
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class DatabaseSize:
+    name: str = field()
+    oid: int = field()
+    size: int = field(default=0)
+
+
+##
+
+
+def get_database_sizes[T: str](
+    stanza: str,
+    /,
+    *,
+    set_: str | None = None,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: Mapping[T, int] | None = None,
+    user: str | None = None,
+) -> list[DatabaseSize]:
+    """Get the databases in a backup, and their sizes, from its manifest."""
+    info = get_info_json(stanza=stanza, repo=repo, repo_mapping=repo_mapping, user=user)
+    repo_num = None if repo is None else to_repo_num(repo=repo, mapping=repo_mapping)
+    backup = _get_backup_set(info, stanza=stanza, set_=set_, repo=repo_num)
+    label = backup["label"]
+    repo_key = int(backup["database"]["repo-key"])
+    _LOGGER.info(
+        "Reading manifest of %r backup %r in repo%d...", stanza, label, repo_key
+    )
+    manifest = run_or_as_user(
+        "pgbackrest",
+        f"--repo={repo_key}",
+        f"--stanza={stanza}",
+        "repo-get",
+        f"backup/{stanza}/{label}/backup.manifest",
+        user=user,
+        return_stdout=True,
+    )
+    sizes = parse_manifest_sizes(manifest)
+    names = _get_database_names(stanza, label=label, repo=repo_key, user=user)
+    return sorted(
+        (DatabaseSize(name=n, oid=o, size=sizes.get(o, 0)) for o, n in names.items()),
+        key=lambda d: d.size,
+        reverse=True,
+    )
+
+
+def _get_backup_set(
+    info: Iterable[Mapping[str, Any]],
+    /,
+    *,
+    stanza: str,
+    set_: str | None = None,
+    repo: int | None = None,
+) -> Mapping[str, Any]:
+    if set_ is None:
+        backup = get_restore_set(info, stanza=stanza, repo=repo)
+        if backup is None:
+            msg = f"Stanza {stanza!r} has no backups"
+            raise ValueError(msg)
+        return backup
+    for s in info:
+        if s["name"] == stanza:
+            for b in s.get("backup", []):
+                if (b["label"] == set_) and (
+                    (repo is None) or (int(b["database"]["repo-key"]) == repo)
+                ):
+                    return b
+    msg = f"Stanza {stanza!r} has no backup set {set_!r}"
+    raise ValueError(msg)
+
+
+def _get_database_names(
+    stanza: str, /, *, label: str, repo: int, user: str | None = None
+) -> dict[int, str]:
+    args: list[str] = [
+        "pgbackrest",
+        f"--repo={repo}",
+        f"--stanza={stanza}",
+        f"--set={label}",
+        "--output=json",
+        "info",
+    ]
+    info = loads(run_or_as_user(*args, user=user, return_stdout=True))
+    return {
+        int(d["oid"]): d["name"]
+        for s in info
+        if s["name"] == stanza
+        for b in s.get("backup", [])
+        if b["label"] == label
+        for d in b.get("database-list", [])
+    }
+
+
+def parse_manifest_sizes(text: str, /) -> dict[int, int]:
+    """Sum the file sizes per database OID in a 'backup.manifest'."""
+    sizes: dict[int, int] = {}
+    in_files = False
+    for line in text.splitlines():
+        if line.startswith("["):
+            in_files = line.strip() == "[target:file]"
+            continue
+        if in_files and ((match := _FILE.match(line)) is not None):
+            oid = int(match["oid"])
+            sizes[oid] = sizes.get(oid, 0) + int(loads(match["info"]).get("size", 0))
+    return sizes
+
+
+##
+
+
+def format_database_sizes(
+    sizes: Iterable[DatabaseSize],
+    /,
+    *,
+    include: MaybeIterable[str] | None = None,
+    exclude: MaybeIterable[str] | None = None,
+) -> str:
+    """Format database sizes, with the transfer a selective restore would need."""
+    sizes = list(sizes)
+    width = max((len(d.name) for d in sizes), default=0)
+    lines: list[str] = []
+    selected = 0
+    for database in sizes:
+        restored = is_database_restored(database.name, include=include, exclude=exclude)
+        if restored:
+            selected += database.size
+        mark = "" if restored else " (skipped)"
+        lines.append(
+            f"{database.name:<{width}}  {format_bytes(database.size):>10}{mark}"
+        )
+    total = sum(d.size for d in sizes)
+    lines.append(
+        f"Restoring {format_bytes(selected)} of {format_bytes(total)} (saving {format_bytes(total - selected)})"
+    )
+    return "\n".join(lines)
+
+
+def is_database_restored(
+    name: str,
+    /,
+    *,
+    include: MaybeIterable[str] | None = None,
+    exclude: MaybeIterable[str] | None = None,
+) -> bool:
+    """Check if a database is restored under the include/exclude filters."""
+    if name in {"postgres", "template0", "template1"}:
+        return True
+    includes = [] if include is None else list(always_iterable(include))
+    excludes = [] if exclude is None else list(always_iterable(exclude))
+    if (len(includes) >= 1) and (name not in includes):
+        return False
+    return name not in excludes
+
+
+__all__ = [
+    "DatabaseSize",
+    "format_database_sizes",
+    "get_database_sizes",
+    "is_database_restored",
+    "parse_manifest_sizes",
+]
@@ -22,6 +22,18 @@ class BackupType(StrEnum):
             case never:
                 assert_never(never)
 
+    @property
+    def suffix(self) -> str:
+        match self:
+            case BackupType.full:
+                return "F"
+            case BackupType.diff:
+                return "D"
+            case BackupType.incr:
+                return "I"
+            case never:
+                assert_never(never)
+
 
 DEFAULT_BACKUP_TYPE = BackupType.incr
 
@@ -29,6 +41,28 @@ DEFAULT_BACKUP_TYPE = BackupType.incr
 ##
 
 
+@unique
+class BackupEngine(StrEnum):
+    pgbackrest = "pgbackrest"
+    pg_basebackup = "pg_basebackup"
+
+
+DEFAULT_BACKUP_ENGINE = BackupEngine.pgbackrest
+
+
+##
+
+
+@unique
+class BenchWorkload(StrEnum):
+    select_only = "select-only"
+    tpcb_like = "tpcb-like"
+    simple_update = "simple-update"
+
+
+##
+
+
 @unique
 class CipherType(StrEnum):
     aes_256_cbc = "aes-256-cbc"
@@ -40,6 +74,52 @@ DEFAULT_CIPHER_TYPE = CipherType.aes_256_cbc
 ##
 
 
+@unique
+class DumpFormat(StrEnum):
+    directory = "directory"
+    custom = "custom"
+
+    @property
+    def flag(self) -> str:
+        match self:
+            case DumpFormat.directory:
+                return "d"
+            case DumpFormat.custom:
+                return "c"
+            case never:
+                assert_never(never)
+
+
+DEFAULT_DUMP_FORMAT = DumpFormat.directory
+
+
+##
+
+
+@unique
+class FleetAction(StrEnum):
+    check = "check"
+    info = "info"
+    backup = "backup"
+    start = "start"
+    stop = "stop"
+
+
+##
+
+
+@unique
+class PoolerAction(StrEnum):
+    start = "start"
+    stop = "stop"
+    restart = "restart"
+    reload = "reload"
+    status = "status"
+
+
+##
+
+
 @unique
 class RepoType(StrEnum):
     azure = "azure"
@@ -53,11 +133,33 @@ class RepoType(StrEnum):
 DEFAULT_REPO_TYPE = RepoType.posix
 
 
+##
+
+
+@unique
+class UpgradeMode(StrEnum):
+    link = "link"
+    clone = "clone"
+    copy = "copy"
+
+
+DEFAULT_UPGRADE_MODE = UpgradeMode.link
+
+
 __all__ = [
+    "DEFAULT_BACKUP_ENGINE",
     "DEFAULT_BACKUP_TYPE",
     "DEFAULT_CIPHER_TYPE",
+    "DEFAULT_DUMP_FORMAT",
     "DEFAULT_REPO_TYPE",
+    "DEFAULT_UPGRADE_MODE",
+    "BackupEngine",
     "BackupType",
+    "BenchWorkload",
     "CipherType",
+    "DumpFormat",
+    "FleetAction",
+    "PoolerAction",
     "RepoType",
+    "UpgradeMode",
 ]
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from json import dumps, loads
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from installer import get_root
+from utilities.core import to_logger
+from utilities.subprocess import RunCalledProcessError
+
+from postgres._constants import JOBS, PORT, VERSION
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from utilities.types import PathLike
+
+    from postgres._enums import FleetAction
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class FleetMember:
+    cluster: str = field()
+    version: int = field(default=VERSION)
+    port: int = field(default=PORT)
+    stanza: str = field()
+    repos: tuple[int, ...] = field(default=())
+
+    @property
+    def name(self) -> str:
+        return f"{self.version}-{self.cluster}"
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "cluster": self.cluster,
+            "version": self.version,
+            "port": self.port,
+            "stanza": self.stanza,
+            "repos": list(self.repos),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], /) -> FleetMember:
+        return cls(
+            cluster=data["cluster"],
+            version=int(data.get("version", VERSION)),
+            port=int(data.get("port", PORT)),
+            stanza=data["stanza"],
+            repos=tuple(int(r) for r in data.get("repos", [])),
+        )
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class FleetResult:
+    member: FleetMember = field()
+    action: FleetAction = field()
+    ok: bool = field()
+    elapsed: float = field()
+    detail: str = field(default="")
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            **self.member.to_json(),
+            "action": self.action.value,
+            "ok": self.ok,
+            "elapsed": round(self.elapsed, 3),
+            "detail": self.detail,
+        }
+
+
+##
+
+
+def get_inventory_path(*, root: PathLike | None = None) -> Path:
+    """Get the default path of the fleet inventory."""
+    return get_root(root=root) / "etc/pgbackrest/inventory.json"
+
+
+def read_inventory(
+    path: PathLike | None = None, /, *, root: PathLike | None = None
+) -> list[FleetMember]:
+    """Read a fleet inventory: a JSON list of clusters and their stanzas."""
+    path_use = get_inventory_path(root=root) if path is None else Path(path)
+    return sorted(FleetMember.from_json(m) for m in loads(path_use.read_text()))
+
+
+def write_inventory(
+    members: Iterable[FleetMember],
+    /,
+    *,
+    path: PathLike | None = None,
+    root: PathLike | None = None,
+) -> None:
+    """Write a fleet inventory."""
+    path_use = get_inventory_path(root=root) if path is None else Path(path)
+    path_use.parent.mkdir(parents=True, exist_ok=True)
+    text = dumps([m.to_json() for m in sorted(members)], indent=2)
+    _ = path_use.write_text(f"{text}\n")
+
+
+##
+
+
+def run_fleet(
+    members: Iterable[FleetMember],
+    func: Callable[[FleetMember], str],
+    /,
+    *,
+    action: FleetAction,
+    jobs: int = JOBS,
+) -> list[FleetResult]:
+    """Run an action across the fleet, with at most 'jobs' members at once.
+
+    A member that fails, for whatever reason, is recorded as such; the rest of
+    the fleet still runs.
+    """
+    members = list(members)
+
+    def run_one(member: FleetMember, /) -> FleetResult:
+        _LOGGER.info(
+            "Running %r on %r (%r)...", action.value, member.name, member.stanza
+        )
+        start = monotonic()
+        try:
+            detail = func(member)
+        except Exception as error:  # noqa: BLE001
+            if isinstance(error, RunCalledProcessError):
+                lines = error.stderr.strip().splitlines()
+                detail = (
+                    lines[-1] if len(lines) >= 1 else f"exit code {error.return_code}"
+                )
+            else:
+                detail = repr(error)
+            _LOGGER.warning("%r failed on %r: %s", action.value, member.name, detail)
+            return FleetResult(
+                member=member,
+                action=action,
+                ok=False,
+                elapsed=monotonic() - start,
+                detail=detail,
+            )
+        return FleetResult(
+            member=member,
+            action=action,
+            ok=True,
+            elapsed=monotonic() - start,
+            detail=detail,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(min(jobs, len(members)), 1)) as pool:
+        return list(pool.map(run_one, members))
+
+
+def summarize_info(info: list[dict[str, Any]], /, *, stanza: str) -> str:
+    """Summarize a stanza's 'pgbackrest info' as one line."""
+    for stanza_i in info:
+        if stanza_i["name"] != stanza:
+            continue
+        status = stanza_i.get("status", {}).get("message", "?")
+        backups = stanza_i.get("backup", [])
+        if len(backups) == 0:
+            return f"{status}; no backups"
+        last = backups[-1]
+        return f"{status}; {len(backups)} backup(s), last {last['label']}"
+    return "missing"
+
+
+def format_fleet_results(results: Iterable[FleetResult], /) -> str:
+    """Format fleet results as a table."""
+    results = list(results)
+    rows = [("CLUSTER", "PORT", "STANZA", "STATUS", "TIME", "DETAIL")]
+    rows.extend(
+        (
+            r.member.name,
+            str(r.member.port),
+            r.member.stanza,
+            "ok" if r.ok else "FAILED",
+            f"{r.elapsed:.1f}s",
+            r.detail,
+        )
+        for r in results
+    )
+    widths = [max(len(row[i]) for row in rows) for i in range(5)]
+    lines = [
+        "  ".join([
+            *(c.ljust(w) for c, w in zip(row[:5], widths, strict=True)),
+            row[5],
+        ]).rstrip()
+        for row in rows
+    ]
+    failed = sum(not r.ok for r in results)
+    lines.append(f"{len(results) - failed} ok, {failed} failed")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "FleetMember",
+    "FleetResult",
+    "format_fleet_results",
+    "get_inventory_path",
+    "read_inventory",
+    "run_fleet",
+    "summarize_info",
+    "write_inventory",
+]
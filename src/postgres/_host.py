@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from math import ceil
+from typing import TYPE_CHECKING, Self
+
+from installer import get_root
+from utilities.constants import Sentinel, sentinel
+from utilities.core import replace_non_sentinel, to_logger
+from utilities.subprocess import copy_text, maybe_sudo_cmd, run
+
+from postgres._constants import PATH_CONFIGS, SHARED_BUFFERS
+from postgres._utilities import get_pg_root, read_postgresql_conf
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+_HUGEPAGE_SIZE = 2 * 1024**2
+_HUGEPAGE_SIZE_PATTERN = re.compile(
+    r"^Hugepagesize:\s+(?P<size>\d+)\s+kB$", re.MULTILINE
+)
+_MEMORY_PATTERN = re.compile(r"^\s*(?P<value>\d+)\s*(?P<unit>B|kB|MB|GB|TB)?\s*$")
+_MEMORY_UNITS: dict[str, int] = {
+    "B": 1,
+    "kB": 1024,
+    "MB": 1024**2,
+    "GB": 1024**3,
+    "TB": 1024**4,
+}
+_MIN_SHARED_MEMORY_OVERHEAD = 64 * 1024**2
+_SYSCTL_PATH = "etc/sysctl.d/60-postgres.conf"
+_TMPFILES_PATH = "etc/tmpfiles.d/postgres-transparent-hugepage.conf"
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class HostTuning:
+    nr_hugepages: int = field(default=0)
+    dirty_background_ratio: int = field(default=3)
+    dirty_ratio: int = field(default=10)
+    swappiness: int = field(default=1)
+    transparent_hugepage: str = field(default="never")
+
+    def replace(
+        self,
+        *,
+        nr_hugepages: int | Sentinel = sentinel,
+        dirty_background_ratio: int | Sentinel = sentinel,
+        dirty_ratio: int | Sentinel = sentinel,
+        swappiness: int | Sentinel = sentinel,
+        transparent_hugepage: str | Sentinel = sentinel,
+    ) -> Self:
+        return replace_non_sentinel(
+            self,
+            nr_hugepages=nr_hugepages,
+            dirty_background_ratio=dirty_background_ratio,
+            dirty_ratio=dirty_ratio,
+            swappiness=swappiness,
+            transparent_hugepage=transparent_hugepage,
+        )
+
+
+def get_host_tuning(
+    *,
+    shared_buffers: str = SHARED_BUFFERS,
+    others: Iterable[str] = (),
+    root: PathLike | None = None,
+) -> HostTuning:
+    """Tune the host for a cluster with the given 'shared_buffers'.
+
+    'vm.nr_hugepages' is host-wide, so it covers the 'shared_buffers' of the
+    'others' clusters on the host too.
+    """
+    hugepage_size = get_hugepage_size(root=root)
+    nr_hugepages = sum(
+        get_nr_hugepages(parse_memory(s), hugepage_size=hugepage_size)
+        for s in [shared_buffers, *others]
+    )
+    return HostTuning(nr_hugepages=nr_hugepages)
+
+
+def get_cluster_shared_buffers(
+    *, root: PathLike | None = None, exclude: tuple[int, str] | None = None
+) -> list[str]:
+    """Get the 'shared_buffers' of each cluster on the host, bar 'exclude'."""
+    result: list[str] = []
+    for conf in sorted(get_pg_root(root=root).glob("*/*/postgresql.conf")):
+        pg_root = conf.parent
+        if not pg_root.parent.name.isdigit():
+            continue
+        if (int(pg_root.parent.name), pg_root.name) == exclude:
+            continue
+        settings: dict[str, str] = {}
+        for path in [conf, *sorted(pg_root.glob("conf.d/*.conf"))]:
+            settings |= read_postgresql_conf(path)
+        result.append(settings.get("shared_buffers", SHARED_BUFFERS))
+    return result
+
+
+def get_nr_hugepages(
+    shared_buffers: int, /, *, hugepage_size: int = _HUGEPAGE_SIZE
+) -> int:
+    """Get the huge pages needed to back a cluster's shared memory.
+
+    Shared memory is 'shared_buffers' plus the WAL buffers, lock tables and
+    other fixed structures, allowed for here as 5% with a floor of 64MiB.
+    """
+    overhead = max(shared_buffers // 20, _MIN_SHARED_MEMORY_OVERHEAD)
+    return ceil((shared_buffers + overhead) / hugepage_size)
+
+
+def get_hugepage_size(*, root: PathLike | None = None) -> int:
+    """Get the kernel's default huge page size, in bytes."""
+    path = get_root(root=root) / "proc/meminfo"
+    try:
+        text = path.read_text()
+    except FileNotFoundError:
+        return _HUGEPAGE_SIZE
+    if (match := _HUGEPAGE_SIZE_PATTERN.search(text)) is None:
+        return _HUGEPAGE_SIZE
+    return 1024 * int(match["size"])
+
+
+def parse_memory(text: str, /) -> int:
+    """Parse a Postgres memory setting, like '128MB', into bytes."""
+    if (match := _MEMORY_PATTERN.match(text)) is None:
+        msg = f"Invalid memory setting {text!r}"
+        raise ValueError(msg)
+    unit = match["unit"]
+    if unit is None:  # a bare 'shared_buffers' counts 8kB blocks
+        return int(match["value"]) * 8 * 1024
+    return int(match["value"]) * _MEMORY_UNITS[unit]
+
+
+##
+
+
+def set_up_host(
+    tuning: HostTuning, /, *, root: PathLike | None = None, sudo: bool = False
+) -> None:
+    """Write the host tuning to 'sysctl.d' and 'tmpfiles.d', and apply it."""
+    paths = write_host_tuning(tuning, root=root, sudo=sudo)
+    _LOGGER.info("Applying host tuning...")
+    run(*maybe_sudo_cmd("sysctl", f"--load={paths[0]}", sudo=sudo))
+    run(*maybe_sudo_cmd("systemd-tmpfiles", "--create", str(paths[1]), sudo=sudo))
+
+
+def write_host_tuning(
+    tuning: HostTuning, /, *, root: PathLike | None = None, sudo: bool = False
+) -> tuple[Path, Path]:
+    """Write the host tuning to 'sysctl.d' and 'tmpfiles.d'."""
+    _LOGGER.info(
+        "Tuning host with %d huge page(s), dirty ratios %d%%/%d%%, swappiness %d and transparent huge pages %r...",
+        tuning.nr_hugepages,
+        tuning.dirty_background_ratio,
+        tuning.dirty_ratio,
+        tuning.swappiness,
+        tuning.transparent_hugepage,
+    )
+    root_use = get_root(root=root)
+    sysctl, tmpfiles = root_use / _SYSCTL_PATH, root_use / _TMPFILES_PATH
+    copy_text(
+        PATH_CONFIGS / "sysctl.conf",
+        sysctl,
+        sudo=sudo,
+        substitutions={
+            "NR_HUGEPAGES": tuning.nr_hugepages,
+            "DIRTY_BACKGROUND_RATIO": tuning.dirty_background_ratio,
+            "DIRTY_RATIO": tuning.dirty_ratio,
+            "SWAPPINESS": tuning.swappiness,
+        },
+        perms="u=rw,g=r,o=r",
+    )
+    copy_text(
+        PATH_CONFIGS / "transparent_hugepage.conf",
+        tmpfiles,
+        sudo=sudo,
+        substitutions={"TRANSPARENT_HUGEPAGE": tuning.transparent_hugepage},
+        perms="u=rw,g=r,o=r",
+    )
+    return sysctl, tmpfiles
+
+
+__all__ = [
+    "HostTuning",
+    "get_cluster_shared_buffers",
+    "get_host_tuning",
+    "get_hugepage_size",
+    "get_nr_hugepages",
+    "parse_memory",
+    "set_up_host",
+    "write_host_tuning",
+]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from sys import stdout
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+
+from postgres._utilities import stream_or_as_user
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+_LOGGER = to_logger(__name__)
+# serial & parallel 'pg_dump', and 'pg_restore' (whose workers log this too)
+_START = re.compile(
+    r'^\S+: (?:dumping contents of|processing data for) table "(?P<table>.+)"$'
+)
+# parallel only; the tag is the bare table name
+_END = re.compile(r"^\S+: finished item \d+ TABLE DATA (?P<tag>.+)$")
+
+##
+
+
+@dataclass(kw_only=True, slots=True)
+class TableTimer:
+    clock: Callable[[], float] = field(default=monotonic)
+    parallel: bool = field(default=False)
+    timings: dict[str, float] = field(default_factory=dict)
+    _running: dict[str, float] = field(default_factory=dict)
+
+    def feed(self, line: str, /) -> None:
+        """Update the timer from a line of output.
+
+        A serial run logs nothing while copying a table, so the table ends at
+        the next line; a parallel run logs when each worker finishes.
+        """
+        now = self.clock()
+        if (match := _END.search(line)) is not None:
+            tag = match["tag"]
+            for table in self._running:
+                if table.endswith(f".{tag}"):
+                    self._finish(table, now=now)
+                    break
+            return
+        if not self.parallel:
+            self.close(now=now)
+        if (match := _START.search(line)) is not None:
+            self._running[match["table"]] = now
+
+    def close(self, *, now: float | None = None) -> None:
+        """Finish all running tables."""
+        now_use = self.clock() if now is None else now
+        for table in list(self._running):
+            self._finish(table, now=now_use)
+
+    def slowest(self, n: int = 10, /) -> list[tuple[str, float]]:
+        """Get the slowest tables."""
+        return sorted(self.timings.items(), key=lambda x: x[1], reverse=True)[:n]
+
+    def _finish(self, table: str, /, *, now: float) -> None:
+        if (start := self._running.pop(table, None)) is not None:
+            self.timings[table] = self.timings.get(table, 0.0) + (now - start)
+
+
+##
+
+
+def run_with_table_timings(
+    cmd: str,
+    /,
+    *args: str,
+    parallel: bool = False,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+    top: int = 10,
+) -> dict[str, float]:
+    """Run 'pg_dump'/'pg_restore' verbosely, logging the slowest tables."""
+    timer = TableTimer(parallel=parallel)
+
+    def on_line(line: str, /) -> None:
+        timer.feed(line)
+        if print:
+            _ = stdout.write(f"{line}\n")
+
+    start = monotonic()
+    stream_or_as_user(cmd, *args, "--verbose", user=user, on_line=on_line)
+    timer.close()
+    _LOGGER.info(
+        "%r took %.1fs over %d table(s)", cmd, monotonic() - start, len(timer.timings)
+    )
+    for table, duration in timer.slowest(top):
+        _LOGGER.info("  %s: %.1fs", table, duration)
+    return timer.timings
+
+
+__all__ = ["TableTimer", "run_with_table_timings"]
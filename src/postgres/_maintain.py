@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from json import loads
+from math import ceil
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Literal
+
+from utilities.core import to_logger
+
+from postgres._constants import PORT
+from postgres._progress import format_bytes
+from postgres._utilities import (
+    read_json_state,
+    run_or_as_user,
+    run_psql,
+    write_json_state,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from utilities.types import PathLike
+
+
+type RelationKind = Literal["table", "index"]
+_LOGGER = to_logger(__name__)
+_BLOCK_SIZE = 8192
+_PAGE_HEADER = 24
+_BTREE_SPECIAL = 16
+_HEAP_TUPLE_HEADER = 24
+_INDEX_TUPLE_HEADER = 8
+_LINE_POINTER = 4
+_ESTIMATES_SQL = """
+SELECT coalesce(json_agg(t), '[]')::text
+FROM (
+    SELECT
+        CASE WHEN c.relkind = 'i' THEN 'index' ELSE 'table' END AS kind,
+        quote_ident(n.nspname) || '.' || quote_ident(c.relname) AS relation,
+        quote_ident(n.nspname) || '.' || quote_ident(coalesce(tc.relname, c.relname))
+            AS "table",
+        pg_relation_size(c.oid) AS size,
+        c.reltuples::float8 AS tuples,
+        (
+            SELECT coalesce(sum(
+                coalesce(s.avg_width, CASE WHEN a.attlen > 0 THEN a.attlen ELSE 32 END)
+            ), 0)
+            FROM pg_attribute AS a
+            LEFT JOIN pg_stats AS s
+                ON s.schemaname = n.nspname
+                AND s.tablename = coalesce(tc.relname, c.relname)
+                AND s.attname = a.attname
+                AND NOT s.inherited
+            WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        ) AS width,
+        coalesce(
+            (
+                SELECT split_part(o, '=', 2)::int
+                FROM unnest(c.reloptions) AS o
+                WHERE o LIKE 'fillfactor=%'
+            ),
+            CASE WHEN c.relkind = 'i' THEN 90 ELSE 100 END
+        ) AS fillfactor,
+        coalesce(
+            (
+                SELECT st.n_tup_ins + st.n_tup_upd + st.n_tup_del
+                FROM pg_stat_all_tables AS st
+                WHERE st.relid = coalesce(tc.oid, c.oid)
+            ),
+            0
+        ) AS changes
+    FROM pg_class AS c
+    JOIN pg_namespace AS n ON n.oid = c.relnamespace
+    LEFT JOIN pg_am AS am ON am.oid = c.relam
+    LEFT JOIN pg_index AS i ON i.indexrelid = c.oid
+    LEFT JOIN pg_class AS tc ON tc.oid = i.indrelid
+    WHERE c.relkind IN ('r', 'm', 'i')
+        AND c.relpersistence <> 't'
+        AND c.reltuples > 0
+        AND (c.relkind <> 'i' OR am.amname = 'btree')
+        AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+        AND n.nspname NOT LIKE 'pg_toast%'
+) AS t
+"""
+_TUPLES_SQL = """
+SELECT n_live_tup, n_dead_tup, n_tup_ins + n_tup_upd + n_tup_del
+FROM pg_stat_all_tables
+WHERE relid = {table}::regclass
+"""
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class BloatEstimate:
+    dbname: str = field()
+    kind: RelationKind = field()
+    relation: str = field()
+    table: str = field()
+    size: int = field()
+    expected_size: int = field()
+    changes: int = field(default=0)
+
+    @property
+    def bloat(self) -> int:
+        """Bytes beyond what the live tuples need."""
+        return max(self.size - self.expected_size, 0)
+
+    @property
+    def key(self) -> str:
+        return f"{self.dbname}/{self.relation}"
+
+    @property
+    def ratio(self) -> float:
+        return 0.0 if self.size == 0 else self.bloat / self.size
+
+    @property
+    def text(self) -> str:
+        return (
+            f"{self.kind} {self.dbname}.{self.relation}: "
+            f"{format_bytes(self.bloat)} of {format_bytes(self.size)} bloat "
+            f"({100 * self.ratio:.0f}%)"
+        )
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class MaintenanceResult:
+    estimate: BloatEstimate = field()
+    size_after: int = field()
+    elapsed: float = field()
+    freed: int = field(default=0)
+    changes_after: int = field(default=0)
+
+    @property
+    def reclaimed(self) -> int:
+        """Bytes given back to the OS, or freed for reuse by a 'VACUUM'."""
+        return max(self.estimate.size - self.size_after, self.freed)
+
+    @property
+    def text(self) -> str:
+        action = "Reindexed" if self.estimate.kind == "index" else "Vacuumed"
+        return (
+            f"{action} {self.estimate.dbname}.{self.estimate.relation}: "
+            f"{format_bytes(self.estimate.size)} -> {format_bytes(self.size_after)} "
+            f"(reclaimed {format_bytes(self.reclaimed)}) in {self.elapsed:.1f}s"
+        )
+
+
+##
+
+
+def estimate_expected_size(
+    *, kind: RelationKind, tuples: float, width: float, fillfactor: int
+) -> int:
+    """Estimate the size a relation would have if it were freshly packed."""
+    if tuples <= 0:
+        return 0
+    match kind:
+        case "table":
+            header, usable = _HEAP_TUPLE_HEADER, _BLOCK_SIZE - _PAGE_HEADER
+            meta = 0
+        case "index":
+            header = _INDEX_TUPLE_HEADER
+            usable = _BLOCK_SIZE - _PAGE_HEADER - _BTREE_SPECIAL
+            meta = 1
+    tuple_size = header + _align(width) + _LINE_POINTER
+    per_page = max(int(usable * fillfactor / 100) // tuple_size, 1)
+    return (ceil(tuples / per_page) + meta) * _BLOCK_SIZE
+
+
+def _align(width: float, /, *, alignment: int = 8) -> int:
+    return alignment * ceil(width / alignment)
+
+
+def get_bloat_estimates(
+    *, dbname: str = "postgres", port: int = PORT, user: str | None = "postgres"
+) -> list[BloatEstimate]:
+    """Estimate the bloat of every table and B-tree index in a database."""
+    rows: list[dict[str, Any]] = loads(
+        run_psql(_ESTIMATES_SQL, dbname=dbname, port=port, user=user)
+    )
+    return [
+        BloatEstimate(
+            dbname=dbname,
+            kind=r["kind"],
+            relation=r["relation"],
+            table=r["table"],
+            size=r["size"],
+            expected_size=estimate_expected_size(
+                kind=r["kind"],
+                tuples=r["tuples"],
+                width=r["width"],
+                fillfactor=r["fillfactor"],
+            ),
+            changes=r["changes"],
+        )
+        for r in rows
+    ]
+
+
+def select_bloated(
+    estimates: Iterable[BloatEstimate],
+    /,
+    *,
+    min_ratio: float = 0.2,
+    min_bloat: int = 10 * 1024**2,
+    limit: int | None = None,
+    maintained: Mapping[str, Mapping[str, int]] | None = None,
+) -> list[BloatEstimate]:
+    """Select the worst offenders, most bloat first.
+
+    A relation in 'maintained' is skipped while its size and its table's
+    modification count are as they were after it was last maintained: a plain
+    'VACUUM' frees space for reuse without shrinking the file, so the estimate
+    alone would pick it again.
+    """
+    maintained_use = {} if maintained is None else maintained
+    selected = sorted(
+        (
+            e
+            for e in estimates
+            if (e.ratio >= min_ratio)
+            and (e.bloat >= min_bloat)
+            and (maintained_use.get(e.key) != {"size": e.size, "changes": e.changes})
+        ),
+        key=lambda e: e.bloat,
+        reverse=True,
+    )
+    return selected if limit is None else selected[:limit]
+
+
+def group_by_table(estimates: Iterable[BloatEstimate], /) -> list[list[BloatEstimate]]:
+    """Group estimates by their table, in order of first appearance.
+
+    'VACUUM' and 'REINDEX CONCURRENTLY' lock their table against each other,
+    so each group is maintained serially.
+    """
+    groups: dict[tuple[str, str], list[BloatEstimate]] = {}
+    for estimate in estimates:
+        groups.setdefault((estimate.dbname, estimate.table), []).append(estimate)
+    return list(groups.values())
+
+
+##
+
+
+def maintain_relation(
+    estimate: BloatEstimate,
+    /,
+    *,
+    parallel: int | None = None,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> MaintenanceResult:
+    """Vacuum a bloated table, or rebuild a bloated index concurrently."""
+    _LOGGER.info("Maintaining %s...", estimate.text)
+    args: list[str] = [f"--port={port}", f"--dbname={estimate.dbname}"]
+    live, dead_before, _ = _get_tuples(estimate, port=port, user=user)
+    start = monotonic()
+    match estimate.kind:
+        case "table":
+            if parallel is not None:
+                args.append(f"--parallel={parallel}")
+            run_or_as_user(
+                "vacuumdb",
+                *args,
+                "--analyze",
+                f"--table={estimate.relation}",
+                user=user,
+            )
+        case "index":
+            run_or_as_user(
+                "reindexdb",
+                *args,
+                "--concurrently",
+                f"--index={estimate.relation}",
+                user=user,
+            )
+    elapsed = monotonic() - start
+    sql = f"SELECT pg_relation_size({_quote_literal(estimate.relation)}::regclass)"
+    size_after = int(run_psql(sql, dbname=estimate.dbname, port=port, user=user))
+    _, dead_after, changes_after = _get_tuples(estimate, port=port, user=user)
+    freed = (
+        estimate_freed(
+            size=estimate.size,
+            live=live,
+            dead_before=dead_before,
+            dead_after=dead_after,
+        )
+        if estimate.kind == "table"
+        else 0
+    )
+    result = MaintenanceResult(
+        estimate=estimate,
+        size_after=size_after,
+        elapsed=elapsed,
+        freed=freed,
+        changes_after=changes_after,
+    )
+    _LOGGER.info("%s", result.text)
+    return result
+
+
+def _get_tuples(
+    estimate: BloatEstimate, /, *, port: int = PORT, user: str | None = "postgres"
+) -> tuple[int, int, int]:
+    sql = _TUPLES_SQL.replace("{table}", _quote_literal(estimate.table))
+    output = run_psql(sql, dbname=estimate.dbname, port=port, user=user)
+    if output == "":
+        return 0, 0, 0
+    live, dead, changes = output.split("|")
+    return int(live), int(dead), int(changes)
+
+
+def estimate_freed(*, size: int, live: int, dead_before: int, dead_after: int) -> int:
+    """Estimate the bytes a 'VACUUM' freed for reuse, from its dead tuples."""
+    tuple_size = size / max(live + dead_before, 1)
+    return round(max(dead_before - dead_after, 0) * tuple_size)
+
+
+def _quote_literal(value: str, /) -> str:
+    escaped = value.replace("'", "''")
+    return f"'{escaped}'"
+
+
+##
+
+
+def read_maintain_state(path: PathLike, /) -> dict[str, dict[str, int]]:
+    """Read the size & modification count of each maintained relation.
+
+    Keyed by 'dbname/relation'.
+    """
+    state = read_json_state(path)
+    return {} if state is None else state
+
+
+def write_maintain_state(
+    state: Mapping[str, Mapping[str, int]], /, *, path: PathLike
+) -> None:
+    """Write the size & modification count of each maintained relation, atomically."""
+    write_json_state(state, path=path)
+    _LOGGER.info("Wrote maintenance state to %r", str(path))
+
+
+__all__ = [
+    "BloatEstimate",
+    "MaintenanceResult",
+    "RelationKind",
+    "estimate_expected_size",
+    "estimate_freed",
+    "get_bloat_estimates",
+    "group_by_table",
+    "maintain_relation",
+    "read_maintain_state",
+    "select_bloated",
+    "write_maintain_state",
+]
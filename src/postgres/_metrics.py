@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field, replace
+from json import JSONDecodeError
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
+
+from utilities.core import normalize_str, to_logger
+from utilities.subprocess import RunCalledProcessError, RunFileNotFoundError
+
+from postgres._utilities import get_info_json, get_restore_set
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from utilities.types import PathLike
+
+    from postgres._enums import BackupType
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class CommandMetrics:
+    command: str = field()
+    stanza: str | None = field(default=None)
+    repo: int | None = field(default=None)
+    type_: BackupType | None = field(default=None)
+    duration: float = field(default=0.0)
+    status: int = field(default=0)
+    bytes: int | None = field(default=None)
+    repo_size: int | None = field(default=None)
+    last_success: float | None = field(default=None)
+
+    @property
+    def file_name(self) -> str:
+        parts: list[str] = ["pgbackrest", self.command]
+        if self.stanza is not None:
+            parts.append(self.stanza)
+        if self.repo is not None:
+            parts.append(f"repo{self.repo}")
+        if self.type_ is not None:
+            parts.append(self.type_.value)
+        return f"{'_'.join(parts)}.prom"
+
+    @property
+    def labels(self) -> str:
+        pairs: list[tuple[str, str]] = []
+        if self.stanza is not None:
+            pairs.append(("stanza", self.stanza))
+        if self.repo is not None:
+            pairs.append(("repo", str(self.repo)))
+        if self.type_ is not None:
+            pairs.append(("type", self.type_.value))
+        if len(pairs) == 0:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+    @property
+    def text(self) -> str:
+        lines: list[str] = []
+        for suffix, desc, value in [
+            ("duration_seconds", "Duration of the last run", self.duration),
+            ("exit_status", "Exit status of the last run", self.status),
+            (
+                "last_success_timestamp_seconds",
+                "Timestamp of the last successful run",
+                self.last_success,
+            ),
+            ("bytes", "Bytes transferred by the last successful run", self.bytes),
+            ("repo_size_bytes", "Repository size after the last run", self.repo_size),
+        ]:
+            if value is not None:
+                name = self.metric_name(suffix)
+                lines.extend([
+                    f"# HELP {name} {desc} of '{self.command}'",
+                    f"# TYPE {name} gauge",
+                    f"{name}{self.labels} {value}",
+                ])
+        return normalize_str("\n".join(lines))
+
+    def metric_name(self, suffix: str, /) -> str:
+        return f"pgbackrest_{self.command.replace('-', '_')}_{suffix}"
+
+
+##
+
+
+@contextmanager
+def yield_metrics(
+    command: str,
+    /,
+    *,
+    path: PathLike | None = None,
+    stanza: str | None = None,
+    repo: int | None = None,
+    type_: BackupType | None = None,
+    user: str | None = None,
+    sizes: bool = True,
+) -> Generator[None]:
+    """Time a command and write its metrics to a textfile directory.
+
+    On success the byte counts are read from 'pgbackrest info', unless 'sizes'
+    is off (e.g. the command did not go through pgbackrest).
+    """
+    if path is None:
+        yield
+        return
+    metrics = CommandMetrics(command=command, stanza=stanza, repo=repo, type_=type_)
+    start = monotonic()
+    status = 1
+    try:
+        yield
+        status = 0
+    except RunCalledProcessError as error:
+        status = error.return_code
+        raise
+    finally:
+        metrics = replace(
+            metrics, duration=round(monotonic() - start, 3), status=status
+        )
+        if status == 0:
+            metrics = replace(metrics, last_success=round(time(), 3))
+            if sizes and (stanza is not None):
+                metrics = _add_sizes(metrics, stanza=stanza, user=user)
+        else:
+            metrics = replace(metrics, last_success=_read_last_success(metrics, path))
+        _ = write_metrics(metrics, path=path)
+
+
+def _add_sizes(
+    metrics: CommandMetrics, /, *, stanza: str, user: str | None = None
+) -> CommandMetrics:
+    try:
+        info = get_info_json(stanza=stanza, repo=metrics.repo, user=user)
+        return _with_sizes(metrics, info, stanza=stanza)
+    except (RunCalledProcessError, RunFileNotFoundError, JSONDecodeError, KeyError):
+        _LOGGER.warning("Failed to get info for %r; skipping sizes", stanza)
+        return metrics
+
+
+def _with_sizes(
+    metrics: CommandMetrics, info: list[dict[str, Any]], /, *, stanza: str
+) -> CommandMetrics:
+    backups = [
+        b
+        for s in info
+        if s["name"] == stanza
+        for b in s.get("backup", [])
+        if (metrics.repo is None) or (b["database"]["repo-key"] == metrics.repo)
+    ]
+    if len(backups) == 0:
+        return metrics
+    repo_size = sum(int(b["info"]["repository"]["delta"]) for b in backups)
+    match metrics.command:
+        case "backup":
+            latest: dict[str, Any] = backups[-1]["info"]
+            return replace(metrics, bytes=int(latest["delta"]), repo_size=repo_size)
+        case "restore":
+            restored = get_restore_set(info, stanza=stanza, repo=metrics.repo)
+            size = None if restored is None else int(restored["info"]["size"])
+            return replace(metrics, bytes=size, repo_size=repo_size)
+        case _:
+            return replace(metrics, repo_size=repo_size)
+
+
+def _read_last_success(metrics: CommandMetrics, path: PathLike, /) -> float | None:
+    file = Path(path, metrics.file_name)
+    name = metrics.metric_name("last_success_timestamp_seconds")
+    with suppress(FileNotFoundError):
+        for line in file.read_text().splitlines():
+            if line.startswith(name):
+                return float(line.split()[-1])
+    return None
+
+
+##
+
+
+def write_metrics(metrics: CommandMetrics, /, *, path: PathLike) -> Path:
+    """Write a set of metrics to a textfile directory, atomically."""
+    dest = Path(path, metrics.file_name)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(
+        mode="w", dir=dest.parent, prefix=".", suffix=".tmp", delete=False
+    ) as temp:
+        _ = temp.write(metrics.text)
+    Path(temp.name).chmod(0o644)
+    _ = Path(temp.name).replace(dest)
+    _LOGGER.info("Wrote metrics to %r", str(dest))
+    return dest
+
+
+__all__ = ["CommandMetrics", "write_metrics", "yield_metrics"]
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from secrets import token_urlsafe
+from typing import TYPE_CHECKING, Self
+
+from installer import get_root
+from utilities.constants import CPU_COUNT, Sentinel, sentinel
+from utilities.core import TemporaryFile, get_local_ip, replace_non_sentinel, to_logger
+from utilities.pydantic import extract_secret
+from utilities.subprocess import chown, copy_text, maybe_sudo_cmd, run
+
+from postgres._constants import (
+    MAX_CLIENT_CONN,
+    MAX_CONNECTIONS,
+    PATH_CONFIGS,
+    POOLER_PORT,
+    PORT,
+    VERSION,
+)
+from postgres._session import execute, has_driver
+from postgres._utilities import get_pg_root, run_or_as_user, run_psql
+
+if TYPE_CHECKING:
+    from utilities.types import PathLike, SecretLike
+
+
+_LOGGER = to_logger(__name__)
+_AUTH_USER = "pgbouncer"
+_AUTH_QUERY = "SELECT usename, passwd FROM pgbouncer.get_auth($1)"
+_AUTH_SQL = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT FROM pg_roles WHERE rolname = '{user}') THEN
+        CREATE ROLE {user} WITH LOGIN;
+    END IF;
+END
+$$;
+ALTER ROLE {user} WITH LOGIN PASSWORD '{password}';
+CREATE SCHEMA IF NOT EXISTS pgbouncer AUTHORIZATION postgres;
+CREATE OR REPLACE FUNCTION pgbouncer.get_auth(p_usename TEXT)
+RETURNS TABLE(usename name, passwd text)
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = pg_catalog
+AS $$
+    SELECT usename, passwd FROM pg_shadow WHERE usename = p_usename
+$$;
+REVOKE ALL ON FUNCTION pgbouncer.get_auth(TEXT) FROM PUBLIC;
+GRANT USAGE ON SCHEMA pgbouncer TO {user};
+GRANT EXECUTE ON FUNCTION pgbouncer.get_auth(TEXT) TO {user};
+"""
+_SUPERUSER_RESERVED = 3
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class PoolSizes:
+    default_pool_size: int = field()
+    min_pool_size: int = field()
+    reserve_pool_size: int = field()
+    max_db_connections: int = field()
+    max_client_conn: int = field(default=MAX_CLIENT_CONN)
+
+    def replace(
+        self,
+        *,
+        default_pool_size: int | Sentinel = sentinel,
+        min_pool_size: int | Sentinel = sentinel,
+        reserve_pool_size: int | Sentinel = sentinel,
+        max_db_connections: int | Sentinel = sentinel,
+        max_client_conn: int | Sentinel = sentinel,
+    ) -> Self:
+        return replace_non_sentinel(
+            self,
+            default_pool_size=default_pool_size,
+            min_pool_size=min_pool_size,
+            reserve_pool_size=reserve_pool_size,
+            max_db_connections=max_db_connections,
+            max_client_conn=max_client_conn,
+        )
+
+
+def get_pool_sizes(
+    *,
+    cpu_count: int = CPU_COUNT,
+    max_connections: int = MAX_CONNECTIONS,
+    max_client_conn: int = MAX_CLIENT_CONN,
+) -> PoolSizes:
+    """Size the pools from the CPU count and the cluster's 'max_connections'.
+
+    Active server connections are capped near '2 * cores + 1', beyond which
+    throughput falls, and never exceed what the cluster has left once superuser
+    and maintenance connections are set aside.
+    """
+    headroom = max(round(0.1 * max_connections), 5)
+    budget = max(max_connections - _SUPERUSER_RESERVED - headroom, 1)
+    default = min(2 * cpu_count + 1, budget)
+    reserve = min(max(default // 4, 1), max(budget - default, 0))
+    return PoolSizes(
+        default_pool_size=default,
+        min_pool_size=max(default // 4, 1),
+        reserve_pool_size=reserve,
+        max_db_connections=budget,
+        max_client_conn=max_client_conn,
+    )
+
+
+##
+
+
+def set_up_pooler(
+    cluster: str,
+    /,
+    *,
+    version: int = VERSION,
+    port: int = PORT,
+    pooler_port: int = POOLER_PORT,
+    password: SecretLike | None = None,
+    sizes: PoolSizes | None = None,
+    root: PathLike | None = None,
+    sudo: bool = False,
+) -> None:
+    """Install PgBouncer in front of a running cluster."""
+    _LOGGER.info("Setting up 'pgbouncer'...")
+    run(*maybe_sudo_cmd("apt-get", "install", "-y", "pgbouncer", sudo=sudo))
+    sizes_use = get_pool_sizes() if sizes is None else sizes
+    password_use = token_urlsafe(32) if password is None else extract_secret(password)
+    _set_up_auth(password_use, port=port)
+    _set_up_pg_hba(cluster, version=version, root=root, sudo=sudo)
+    _set_up_pgbouncer_conf(
+        port=port, pooler_port=pooler_port, sizes=sizes_use, root=root, sudo=sudo
+    )
+    _set_up_userlist(password_use, root=root, sudo=sudo)
+    _ = run_psql("SELECT pg_reload_conf()", port=port)
+    _LOGGER.info("Restarting 'pgbouncer'...")
+    run(*maybe_sudo_cmd("systemctl", "restart", "pgbouncer", sudo=sudo))
+    _LOGGER.info("Finished setting up 'pgbouncer'")
+
+
+def _set_up_auth(password: str, /, *, port: int = PORT) -> None:
+    _LOGGER.info("Setting up 'pgbouncer' auth user %r...", _AUTH_USER)
+    sql = _AUTH_SQL.format(user=_AUTH_USER, password=password.replace("'", "''"))
+    if has_driver(user="postgres"):
+        _ = execute(sql, port=port, user="postgres")
+        return
+    # the SQL holds the password, so only 'postgres' may read it
+    with TemporaryFile(
+        text=sql, perms="u=rw", owner="postgres", group="postgres"
+    ) as temp:
+        run_or_as_user(
+            "psql",
+            f"--port={port}",
+            "--set=ON_ERROR_STOP=1",
+            "-f",
+            str(temp),
+            user="postgres",
+        )
+
+
+def _set_up_pg_hba(
+    cluster: str,
+    /,
+    *,
+    version: int = VERSION,
+    root: PathLike | None = None,
+    sudo: bool = False,
+) -> None:
+    _LOGGER.info(
+        "Setting up '%d-%s' 'pg_hba.conf' for 'pgbouncer'...", version, cluster
+    )
+    pg_root = get_pg_root(root=root, version=version, name=cluster)
+    copy_text(
+        PATH_CONFIGS / "pg_hba.pgbouncer.conf",
+        pg_root / "pg_hba.conf.d/pgbouncer.conf",
+        sudo=sudo,
+        substitutions={"AUTH_USER": _AUTH_USER},
+        perms="u=rw,g=r,o=r",
+    )
+
+
+def _set_up_pgbouncer_conf(
+    *,
+    port: int = PORT,
+    pooler_port: int = POOLER_PORT,
+    sizes: PoolSizes,
+    root: PathLike | None = None,
+    sudo: bool = False,
+) -> None:
+    _LOGGER.info("Setting up 'pgbouncer.ini'...")
+    path = get_root(root=root) / "etc/pgbouncer"
+    copy_text(
+        PATH_CONFIGS / "pgbouncer.ini",
+        path / "pgbouncer.ini",
+        sudo=sudo,
+        substitutions={
+            "PORT": port,
+            "AUTH_USER": _AUTH_USER,
+            "AUTH_QUERY": _AUTH_QUERY,
+            "LISTEN_ADDRESSES": get_local_ip(),
+            "POOLER_PORT": pooler_port,
+            "MAX_CLIENT_CONN": sizes.max_client_conn,
+            "DEFAULT_POOL_SIZE": sizes.default_pool_size,
+            "MIN_POOL_SIZE": sizes.min_pool_size,
+            "RESERVE_POOL_SIZE": sizes.reserve_pool_size,
+            "MAX_DB_CONNECTIONS": sizes.max_db_connections,
+        },
+        perms="u=rw,g=r,o=r",
+    )
+    copy_text(
+        PATH_CONFIGS / "pgbouncer_hba.conf",
+        path / "pg_hba.conf",
+        sudo=sudo,
+        perms="u=rw,g=r,o=r",
+    )
+
+
+def _set_up_userlist(
+    password: str, /, *, root: PathLike | None = None, sudo: bool = False
+) -> None:
+    _LOGGER.info("Setting up 'pgbouncer' 'userlist.txt'...")
+    path = get_root(root=root) / "etc/pgbouncer"
+    escaped = password.replace('"', '""')
+    with TemporaryFile(text=f'"{_AUTH_USER}" "{escaped}"\n') as temp:
+        copy_text(temp, path / "userlist.txt", sudo=sudo)
+    chown(path, sudo=sudo, recursive=True, owner="postgres", group="postgres")
+    run(*maybe_sudo_cmd("chmod", "600", str(path / "userlist.txt"), sudo=sudo))
+
+
+__all__ = ["PoolSizes", "get_pool_sizes", "set_up_pooler"]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+from sys import stdout
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+
+from postgres._utilities import stream_or_as_user
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from utilities.types import LoggerLike
+
+
+_LOGGER = to_logger(__name__)
+_PATTERN = re.compile(
+    r"(?:backup|restore) file \S+ \((?:bundle [^,]+, )?(?P<size>\d+(?:\.\d+)?)(?P<unit>[KMGTP]?B), (?P<percent>\d+(?:\.\d+)?)%\)"
+)
+_UNITS: dict[str, int] = {
+    "B": 1,
+    "KB": 1024,
+    "MB": 1024**2,
+    "GB": 1024**3,
+    "TB": 1024**4,
+    "PB": 1024**5,
+}
+
+
+type ProgressCallback = Callable[[ProgressEvent], None]
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class ProgressEvent:
+    files: int = field()
+    bytes: int = field()
+    percent: float = field()
+    elapsed: float = field()
+
+    @property
+    def rate(self) -> float:
+        """Bytes per second."""
+        return 0.0 if self.elapsed <= 0 else self.bytes / self.elapsed
+
+    @property
+    def eta(self) -> float | None:
+        """Seconds remaining."""
+        if self.percent <= 0:
+            return None
+        return self.elapsed * (100 - self.percent) / self.percent
+
+    @property
+    def text(self) -> str:
+        eta = "?" if self.eta is None else str(timedelta(seconds=round(self.eta)))
+        return (
+            f"{self.percent:.2f}% ({self.files} files, {format_bytes(self.bytes)}, "
+            f"{format_bytes(round(self.rate))}/s, ETA {eta})"
+        )
+
+
+@dataclass(kw_only=True, slots=True)
+class ProgressTracker:
+    start: float = field(default_factory=monotonic)
+    files: int = field(default=0)
+    bytes: int = field(default=0)
+
+    def feed(self, line: str, /) -> ProgressEvent | None:
+        """Update the tracker from a line of output."""
+        if (match := _PATTERN.search(line)) is None:
+            return None
+        self.files += 1
+        self.bytes += round(float(match["size"]) * _UNITS[match["unit"]])
+        return ProgressEvent(
+            files=self.files,
+            bytes=self.bytes,
+            percent=float(match["percent"]),
+            elapsed=monotonic() - self.start,
+        )
+
+
+##
+
+
+def format_bytes(n: int, /) -> str:
+    """Format a number of bytes."""
+    value = float(n)
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if abs(value) < 1024:
+            return f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}PiB"
+
+
+def log_progress(
+    *, logger: LoggerLike = _LOGGER, interval: float = 10.0
+) -> ProgressCallback:
+    """Make a callback which logs progress at most once per interval."""
+    logger_use = to_logger(logger)
+    last: float | None = None
+
+    def callback(event: ProgressEvent, /) -> None:
+        nonlocal last
+        if (last is None) or (event.elapsed - last >= interval):
+            logger_use.info("Progress: %s", event.text)
+            last = event.elapsed
+
+    return callback
+
+
+def run_with_progress(
+    cmd: str,
+    /,
+    *args: str,
+    callback: ProgressCallback,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+) -> None:
+    """Run a 'pgbackrest' command, streaming progress events to a callback."""
+    tracker = ProgressTracker()
+
+    def on_line(line: str, /) -> None:
+        if (event := tracker.feed(line)) is not None:
+            callback(event)
+        elif print and (" DETAIL: " not in line):
+            _ = stdout.write(f"{line}\n")
+
+    *opts, sub_cmd = args
+    stream_or_as_user(
+        cmd, *opts, "--log-level-console=detail", sub_cmd, user=user, on_line=on_line
+    )
+
+
+__all__ = [
+    "ProgressCallback",
+    "ProgressEvent",
+    "ProgressTracker",
+    "format_bytes",
+    "log_progress",
+    "run_with_progress",
+]
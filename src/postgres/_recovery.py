@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from time import monotonic, sleep
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+from utilities.subprocess import RunCalledProcessError
+
+from postgres._constants import PORT
+from postgres._progress import format_bytes
+from postgres._session import has_driver, is_accepting, is_connection_error
+from postgres._utilities import get_info_json, run_or_as_user, run_psql
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from postgres._types import RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+_WAL_SEGMENT_SIZE = 16 * 1024**2
+_RECOVERY_STATE_SQL = """
+SELECT
+    pg_is_in_recovery(),
+    pg_last_wal_replay_lsn(),
+    CASE WHEN pg_is_in_recovery() THEN pg_get_wal_replay_pause_state() END
+"""
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class ReplayStatus:
+    start_lsn: int = field()
+    lsn: int = field()
+    elapsed: float = field()
+    target_lsn: int | None = field(default=None)
+
+    @property
+    def replayed(self) -> int:
+        """Bytes of WAL replayed."""
+        return max(self.lsn - self.start_lsn, 0)
+
+    @property
+    def rate(self) -> float:
+        """Bytes per second."""
+        return 0.0 if self.elapsed <= 0 else self.replayed / self.elapsed
+
+    @property
+    def eta(self) -> float | None:
+        """Seconds remaining."""
+        if (self.target_lsn is None) or (self.rate <= 0):
+            return None
+        return max(self.target_lsn - self.lsn, 0) / self.rate
+
+    @property
+    def text(self) -> str:
+        eta = "?" if self.eta is None else str(timedelta(seconds=round(self.eta)))
+        return (
+            f"{format_lsn(self.lsn)} ({format_bytes(self.replayed)} replayed, "
+            f"{self.rate / 1024**2:.1f} MB/s, ETA {eta})"
+        )
+
+
+##
+
+
+def wait_until_ready(
+    *,
+    port: int = PORT,
+    standby: bool = False,
+    target_lsn: int | None = None,
+    timeout: float = 3600.0,
+    interval: float = 0.1,
+    max_interval: float = 5.0,
+    report_interval: float = 10.0,
+    user: str | None = "postgres",
+    sudo: bool = False,
+) -> None:
+    """Wait for a cluster to accept writes, or reads if it is a standby.
+
+    Raises if recovery pauses, e.g. at a target with 'recovery_target_action =
+    pause', since the cluster will not accept writes until it is resumed.
+    """
+    _LOGGER.info("Waiting for cluster on port %d to be ready...", port)
+    start = monotonic()
+    delay = interval
+    while not _is_ready(port=port, user=user, sudo=sudo):
+        delay = _backoff(start, delay, timeout=timeout, max_interval=max_interval)
+    if standby:
+        _LOGGER.info("Cluster on port %d is accepting reads", port)
+        return
+    first: tuple[int, float] | None = None
+    last_report = monotonic()
+    delay = interval
+    while True:
+        in_recovery, lsn, paused = _get_recovery_state(port=port, user=user, sudo=sudo)
+        if not in_recovery:
+            break
+        if paused:
+            at = "?" if lsn is None else format_lsn(lsn)
+            msg = (
+                f"Recovery of cluster on port {port} is paused at {at}; resume with "
+                "'pg_wal_replay_resume()' or promote with 'pg_promote()'"
+            )
+            raise RuntimeError(msg)
+        if lsn is not None:
+            if first is None:
+                first = (lsn, monotonic())
+            if monotonic() - last_report >= report_interval:
+                status = ReplayStatus(
+                    start_lsn=first[0],
+                    lsn=lsn,
+                    elapsed=monotonic() - first[1],
+                    target_lsn=target_lsn,
+                )
+                _LOGGER.info("Replaying WAL: %s", status.text)
+                last_report = monotonic()
+        delay = _backoff(start, delay, timeout=timeout, max_interval=max_interval)
+    _LOGGER.info(
+        "Cluster on port %d is accepting writes after %.1fs", port, monotonic() - start
+    )
+
+
+def _is_ready(
+    *, port: int = PORT, user: str | None = "postgres", sudo: bool = False
+) -> bool:
+    if has_driver(user=user):
+        return is_accepting(port=port, user=user)
+    try:
+        run_or_as_user("pg_isready", f"--port={port}", "--quiet", user=user, sudo=sudo)
+    except RunCalledProcessError:
+        return False
+    return True
+
+
+def _get_recovery_state(
+    *, port: int = PORT, user: str | None = "postgres", sudo: bool = False
+) -> tuple[bool, int | None, bool]:
+    try:
+        output = run_psql(_RECOVERY_STATE_SQL, port=port, user=user, sudo=sudo)
+    except RunCalledProcessError as error:
+        # e.g. the cluster restarted after an end-of-recovery checkpoint
+        if is_connection_error(error):
+            return True, None, False
+        raise
+    return parse_recovery_state(output)
+
+
+def _backoff(
+    start: float, delay: float, /, *, timeout: float, max_interval: float
+) -> float:
+    if monotonic() - start >= timeout:
+        msg = f"Cluster did not become ready in {timeout}s"
+        raise TimeoutError(msg)
+    sleep(delay)
+    return min(2 * delay, max_interval)
+
+
+##
+
+
+def format_lsn(lsn: int, /) -> str:
+    """Format an LSN in Postgres' 'XXX/XXX' notation."""
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
+
+
+def parse_lsn(text: str, /) -> int:
+    """Parse an LSN in Postgres' 'XXX/XXX' notation."""
+    try:
+        high, low = text.split("/")
+        return (int(high, 16) << 32) + int(low, 16)
+    except ValueError:
+        msg = f"Invalid LSN {text!r}"
+        raise ValueError(msg) from None
+
+
+def parse_recovery_state(text: str, /) -> tuple[bool, int | None, bool]:
+    """Parse the output of the recovery state query.
+
+    Returns whether the cluster is in recovery, its replay LSN, and whether
+    replay is paused.
+    """
+    in_recovery, lsn, pause_state = text.strip().split("|")
+    return (
+        in_recovery == "t",
+        None if lsn == "" else parse_lsn(lsn),
+        pause_state == "paused",
+    )
+
+
+def wal_segment_to_lsn(name: str, /, *, segment_size: int = _WAL_SEGMENT_SIZE) -> int:
+    """Get the LSN at the end of a WAL segment, given its file name."""
+    if len(name) != 24:
+        msg = f"Invalid WAL segment {name!r}"
+        raise ValueError(msg)
+    log, seg = int(name[8:16], 16), int(name[16:24], 16)
+    return (log << 32) + (seg + 1) * segment_size
+
+
+def get_archive_max_lsn[T: str](
+    stanza: str,
+    /,
+    *,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: Mapping[T, int] | None = None,
+    user: str | None = None,
+) -> int | None:
+    """Get the LSN at the end of the newest archived WAL segment, if possible."""
+    try:
+        info = get_info_json(
+            stanza=stanza, repo=repo, repo_mapping=repo_mapping, user=user
+        )
+    except RunCalledProcessError:
+        _LOGGER.warning("Failed to get info for %r; no ETA available", stanza)
+        return None
+    maxes = [
+        a["max"]
+        for s in info
+        if s["name"] == stanza
+        for a in s.get("archive", [])
+        if a.get("max") is not None
+    ]
+    if len(maxes) == 0:
+        return None
+    return max(wal_segment_to_lsn(m) for m in maxes)
+
+
+__all__ = [
+    "ReplayStatus",
+    "format_lsn",
+    "get_archive_max_lsn",
+    "parse_lsn",
+    "parse_recovery_state",
+    "wait_until_ready",
+    "wal_segment_to_lsn",
+]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Self
+
+from utilities.constants import Sentinel, sentinel
+from utilities.core import TemporaryFile, normalize_str, replace_non_sentinel, to_logger
+from utilities.subprocess import RunError, copy_text, rm
+
+from postgres._constants import PORT, PROCESS_MAX, VERSION
+from postgres._utilities import get_pg_root, run_psql
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class RecoveryProfile:
+    archive_get_queue_max: str = field(default="4GiB")
+    process_max: int = field(default=PROCESS_MAX)
+    recovery_prefetch: str = field(default="on")
+    maintenance_io_concurrency: int = field(default=256)
+    max_wal_size: str = field(default="32GB")
+
+    def replace(
+        self,
+        *,
+        archive_get_queue_max: str | Sentinel = sentinel,
+        process_max: int | Sentinel = sentinel,
+        recovery_prefetch: str | Sentinel = sentinel,
+        maintenance_io_concurrency: int | Sentinel = sentinel,
+        max_wal_size: str | Sentinel = sentinel,
+    ) -> Self:
+        return replace_non_sentinel(
+            self,
+            archive_get_queue_max=archive_get_queue_max,
+            process_max=process_max,
+            recovery_prefetch=recovery_prefetch,
+            maintenance_io_concurrency=maintenance_io_concurrency,
+            max_wal_size=max_wal_size,
+        )
+
+    @property
+    def text(self) -> str:
+        lines: list[str] = [
+            "# Temporary recovery profile; removed once recovery finishes",
+            f"recovery_prefetch = {self.recovery_prefetch}",
+            f"maintenance_io_concurrency = {self.maintenance_io_concurrency}",
+            f"max_wal_size = '{self.max_wal_size}'",
+        ]
+        return normalize_str("\n".join(lines))
+
+    def restore_command(self, stanza: str, /) -> str:
+        return (
+            f"pgbackrest --stanza={stanza} --archive-async=y "
+            f"--archive-get-queue-max={self.archive_get_queue_max} "
+            f'--process-max={self.process_max} archive-get %f "%p"'
+        )
+
+
+##
+
+
+def apply_recovery_profile(
+    profile: RecoveryProfile,
+    cluster: str,
+    /,
+    *,
+    version: int = VERSION,
+    root: PathLike | None = None,
+    sudo: bool = False,
+) -> None:
+    """Write a temporary recovery profile into a cluster's 'conf.d'."""
+    _LOGGER.info("Applying recovery profile to '%d-%s'...", version, cluster)
+    path = _get_path(cluster, version=version, root=root)
+    with TemporaryFile(text=profile.text) as temp:
+        copy_text(temp, path, sudo=sudo, perms="u=rw,g=r,o=r")
+
+
+def revert_recovery_profile(
+    cluster: str,
+    /,
+    *,
+    stanza: str | None = None,
+    version: int = VERSION,
+    port: int = PORT,
+    root: PathLike | None = None,
+    sudo: bool = False,
+) -> None:
+    """Remove a temporary recovery profile and reload the cluster's config.
+
+    The profile's 'restore_command' in 'postgresql.auto.conf' is put back to
+    the plain 'pgbackrest' one if a stanza is given, and reset otherwise.
+    Failures are logged, not raised, since this runs on the way out of a
+    restore, which may itself be failing.
+    """
+    _LOGGER.info("Reverting recovery profile of '%d-%s'...", version, cluster)
+    path = _get_path(cluster, version=version, root=root)
+    try:
+        rm(path, sudo=sudo)
+    except (RunError, OSError):
+        _LOGGER.exception("Failed to remove recovery profile %r", str(path))
+    if stanza is None:
+        sql = "ALTER SYSTEM RESET restore_command"
+    else:
+        command = f'pgbackrest --stanza={stanza} archive-get %f "%p"'.replace("'", "''")
+        sql = f"ALTER SYSTEM SET restore_command = '{command}'"
+    try:
+        _ = run_psql(sql, port=port)
+        _ = run_psql("SELECT pg_reload_conf()", port=port)
+    except RunError:
+        _LOGGER.exception(
+            "Failed to reset 'restore_command' of '%d-%s'; is it running?",
+            version,
+            cluster,
+        )
+
+
+def _get_path(
+    cluster: str, /, *, version: int = VERSION, root: PathLike | None = None
+) -> Path:
+    pg_root = get_pg_root(root=root, version=version, name=cluster)
+    return pg_root / "conf.d/recovery.conf"
+
+
+__all__ = ["RecoveryProfile", "apply_recovery_profile", "revert_recovery_profile"]
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from postgres._progress import format_bytes
+from postgres._recovery import wal_segment_to_lsn
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+_DAY = 24 * 60 * 60
+_WAL_SEGMENT_SIZE = 16 * 1024**2
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class BackupTypeStats:
+    type_: str = field()
+    count: int = field(default=0)
+    size: int = field(default=0)
+    delta: int = field(default=0)
+    repo_size: int = field(default=0)
+    repo_delta: int = field(default=0)
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Bytes copied per byte stored in the repo."""
+        return None if self.repo_delta == 0 else self.delta / self.repo_delta
+
+    @property
+    def dedup(self) -> float | None:
+        """Fraction of the database not copied thanks to earlier backups."""
+        return None if self.size == 0 else 1 - self.delta / self.size
+
+    @property
+    def mean_repo_delta(self) -> float:
+        return 0.0 if self.count == 0 else self.repo_delta / self.count
+
+    @property
+    def text(self) -> str:
+        ratio = (
+            "?" if self.compression_ratio is None else f"{self.compression_ratio:.1f}x"
+        )
+        dedup = "?" if self.dedup is None else f"{self.dedup:.0%}"
+        return (
+            f"{self.type_:<4}  {self.count:>3}  size {format_bytes(self.size):>10}  "
+            f"copied {format_bytes(self.delta):>10}  "
+            f"stored {format_bytes(self.repo_delta):>10}  "
+            f"compression {ratio:>6}  dedup {dedup:>4}"
+        )
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class RepoStats:
+    stanza: str = field()
+    repo: int = field()
+    full: BackupTypeStats = field()
+    diff: BackupTypeStats = field()
+    incr: BackupTypeStats = field()
+    wal_per_day: float | None = field(default=None)
+    days_per_full: float | None = field(default=None)
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Bytes copied per byte stored in the repo, over all backups."""
+        delta = sum(t.delta for t in self.types)
+        repo_delta = sum(t.repo_delta for t in self.types)
+        return None if repo_delta == 0 else delta / repo_delta
+
+    @property
+    def repo_size(self) -> int:
+        """Repo bytes used by backups, excluding WAL."""
+        return sum(t.repo_delta for t in self.types)
+
+    @property
+    def types(self) -> tuple[BackupTypeStats, ...]:
+        return self.full, self.diff, self.incr
+
+    def project(
+        self, *, retention_full: int | None = None, retention_diff: int | None = None
+    ) -> int | None:
+        """Project the repo size once retention has reached a steady state."""
+        if self.full.count == 0:
+            return None
+        full = self.full.count if retention_full is None else retention_full
+        diffs_per_full = self.diff.count / self.full.count
+        incrs_per_full = self.incr.count / self.full.count
+        diff = self.diff.count if retention_diff is None else retention_diff
+        diff = min(diff, round(full * diffs_per_full))
+        size = (
+            full
+            * (self.full.mean_repo_delta + incrs_per_full * self.incr.mean_repo_delta)
+            + diff * self.diff.mean_repo_delta
+        )
+        if (
+            (self.wal_per_day is not None)
+            and (self.days_per_full is not None)
+            and ((ratio := self.compression_ratio) is not None)
+        ):
+            size += full * self.days_per_full * self.wal_per_day / ratio
+        return round(size)
+
+
+##
+
+
+def compute_repo_stats(
+    info: Iterable[dict[str, Any]], /, *, repo: int | None = None
+) -> list[RepoStats]:
+    """Compute storage statistics per stanza and repo from 'info' JSON."""
+    stats: list[RepoStats] = []
+    for stanza in info:
+        backups = stanza.get("backup", [])
+        archives = stanza.get("archive", [])
+        keys = sorted({b["database"]["repo-key"] for b in backups})
+        for key in keys:
+            if (repo is not None) and (key != repo):
+                continue
+            backups_i = [b for b in backups if b["database"]["repo-key"] == key]
+            archives_i = [a for a in archives if a["database"]["repo-key"] == key]
+            stats.append(
+                RepoStats(
+                    stanza=stanza["name"],
+                    repo=key,
+                    full=_get_type_stats("full", backups_i),
+                    diff=_get_type_stats("diff", backups_i),
+                    incr=_get_type_stats("incr", backups_i),
+                    wal_per_day=_get_wal_per_day(backups_i, archives_i),
+                    days_per_full=_get_days_per_full(backups_i),
+                )
+            )
+    return stats
+
+
+def _get_type_stats(
+    type_: str, backups: Iterable[dict[str, Any]], /
+) -> BackupTypeStats:
+    backups = [b for b in backups if b["type"] == type_]
+    return BackupTypeStats(
+        type_=type_,
+        count=len(backups),
+        size=sum(int(b["info"]["size"]) for b in backups),
+        delta=sum(int(b["info"]["delta"]) for b in backups),
+        repo_size=sum(int(b["info"]["repository"]["size"]) for b in backups),
+        repo_delta=sum(int(b["info"]["repository"]["delta"]) for b in backups),
+    )
+
+
+def _get_wal_per_day(
+    backups: Iterable[dict[str, Any]], archives: Iterable[dict[str, Any]], /
+) -> float | None:
+    backups = list(backups)
+    if len(backups) == 0:
+        return None
+    start = min(int(b["timestamp"]["start"]) for b in backups)
+    stop = max(int(b["timestamp"]["stop"]) for b in backups)
+    if stop <= start:
+        return None
+    ranges = [
+        (a["min"], a["max"])
+        for a in archives
+        if (a.get("min") is not None) and (a.get("max") is not None)
+    ]
+    if len(ranges) == 0:
+        return None
+    wal = sum(
+        wal_segment_to_lsn(max_) - wal_segment_to_lsn(min_) + _WAL_SEGMENT_SIZE
+        for min_, max_ in ranges
+    )
+    return wal * _DAY / (stop - start)
+
+
+def _get_days_per_full(backups: Iterable[dict[str, Any]], /) -> float | None:
+    starts = sorted(
+        int(b["timestamp"]["start"]) for b in backups if b["type"] == "full"
+    )
+    if len(starts) <= 1:
+        return None
+    return (starts[-1] - starts[0]) / (len(starts) - 1) / _DAY
+
+
+##
+
+
+def format_repo_stats(
+    stats: RepoStats,
+    /,
+    *,
+    retention_full: int | None = None,
+    retention_diff: int | None = None,
+) -> str:
+    """Format storage statistics, with the projected size under retention."""
+    lines = [f"Stanza {stats.stanza!r}, repo {stats.repo}:"]
+    lines.extend(f"  {t.text}" for t in stats.types)
+    wal = "?" if stats.wal_per_day is None else format_bytes(round(stats.wal_per_day))
+    lines.append(f"  WAL per day (uncompressed): {wal}")
+    lines.append(f"  Backups stored: {format_bytes(stats.repo_size)}")
+    projected = stats.project(
+        retention_full=retention_full, retention_diff=retention_diff
+    )
+    if projected is not None:
+        full = stats.full.count if retention_full is None else retention_full
+        diff = stats.diff.count if retention_diff is None else retention_diff
+        lines.append(
+            f"  Projected at retention full={full}, diff={diff}: {format_bytes(projected)} incl. WAL"
+        )
+    return "\n".join(lines)
+
+
+__all__ = ["BackupTypeStats", "RepoStats", "compute_repo_stats", "format_repo_stats"]
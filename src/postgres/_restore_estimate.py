@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from json import dumps, loads
+from pathlib import Path
+from statistics import median
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, Literal
+
+from installer import get_root
+from utilities.core import to_logger
+
+from postgres._progress import format_bytes
+from postgres._recovery import parse_lsn, wal_segment_to_lsn
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+    from utilities.types import PathLike
+
+
+type RunKind = Literal["restore", "replay"]
+_LOGGER = to_logger(__name__)
+_RECENT = 10
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class RunRecord:
+    kind: RunKind = field()
+    stanza: str = field()
+    repo: int = field()
+    bytes: int = field()
+    duration: float = field()
+    timestamp: float = field()
+
+    @property
+    def rate(self) -> float:
+        """Bytes per second."""
+        return 0.0 if self.duration <= 0 else self.bytes / self.duration
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class RestoreEstimate:
+    repo: int = field()
+    label: str = field()
+    backup_bytes: int = field()
+    wal_bytes: int | None = field(default=None)
+    copy_rate: float | None = field(default=None)
+    replay_rate: float | None = field(default=None)
+    copy_rate_source: str = field(default="restores")
+
+    @property
+    def copy_seconds(self) -> float | None:
+        if (self.copy_rate is None) or (self.copy_rate <= 0):
+            return None
+        return self.backup_bytes / self.copy_rate
+
+    @property
+    def replay_seconds(self) -> float | None:
+        if (self.wal_bytes is None) or (self.replay_rate is None):
+            return None
+        if self.replay_rate <= 0:
+            return None
+        return self.wal_bytes / self.replay_rate
+
+    @property
+    def seconds(self) -> float | None:
+        """Predicted duration; unknown without a measured repo throughput."""
+        if self.copy_seconds is None:
+            return None
+        return self.copy_seconds + (self.replay_seconds or 0.0)
+
+    @property
+    def text(self) -> str:
+        def fmt_rate(rate: float | None, /) -> str:
+            return "?" if rate is None else f"{format_bytes(round(rate))}/s"
+
+        def fmt_seconds(seconds: float | None, /) -> str:
+            return "?" if seconds is None else str(timedelta(seconds=round(seconds)))
+
+        wal = "?" if self.wal_bytes is None else format_bytes(self.wal_bytes)
+        return (
+            f"repo{self.repo} ({self.label}): "
+            f"copy {format_bytes(self.backup_bytes)} at {fmt_rate(self.copy_rate)} "
+            f"(from {self.copy_rate_source}) = {fmt_seconds(self.copy_seconds)}, "
+            f"replay {wal} at {fmt_rate(self.replay_rate)} = "
+            f"{fmt_seconds(self.replay_seconds)}; total {fmt_seconds(self.seconds)}"
+        )
+
+
+##
+
+
+def estimate_restores(
+    info: Iterable[dict[str, Any]],
+    history: Iterable[RunRecord],
+    /,
+    *,
+    stanza: str,
+    repo: int | None = None,
+) -> list[RestoreEstimate]:
+    """Estimate a restore of a stanza's latest backup from each repo, fastest first.
+
+    The copy uses the median throughput of recent restores from the repo, or of
+    recent backups to it if it has never been restored from; the replay uses
+    the median rate of recent replays of the stanza.
+    """
+    stanzas = [s for s in info if s["name"] == stanza]
+    backups = [b for s in stanzas for b in s.get("backup", [])]
+    archive_max: dict[int, int] = {}
+    for archive in (a for s in stanzas for a in s.get("archive", [])):
+        if archive.get("max") is not None:
+            key = int(archive["database"]["repo-key"])
+            lsn = wal_segment_to_lsn(archive["max"])
+            archive_max[key] = max(archive_max.get(key, lsn), lsn)
+    history = [r for r in history if r.stanza == stanza]
+    replay_rate = _median_rate(r for r in history if r.kind == "replay")
+    estimates: list[RestoreEstimate] = []
+    for key in sorted({int(b["database"]["repo-key"]) for b in backups}):
+        if (repo is not None) and (key != repo):
+            continue
+        in_repo = [b for b in backups if int(b["database"]["repo-key"]) == key]
+        latest = max(in_repo, key=lambda b: int(b["timestamp"]["stop"]))
+        copy_rate = _median_rate(
+            r for r in history if (r.kind == "restore") and (r.repo == key)
+        )
+        source = "restores"
+        if copy_rate is None:
+            copy_rate, source = _backup_rate(in_repo), "backups"
+        max_lsn = archive_max.get(key)
+        estimates.append(
+            RestoreEstimate(
+                repo=key,
+                label=latest["label"],
+                backup_bytes=int(latest["info"]["repository"]["size"]),
+                wal_bytes=None
+                if max_lsn is None
+                else max(max_lsn - parse_lsn(latest["lsn"]["stop"]), 0),
+                copy_rate=copy_rate,
+                replay_rate=replay_rate,
+                copy_rate_source=source,
+            )
+        )
+    return sorted(
+        estimates, key=lambda e: (e.seconds is None, e.seconds or 0.0, e.repo)
+    )
+
+
+def _median_rate(records: Iterable[RunRecord], /) -> float | None:
+    recent = sorted(records, key=lambda r: r.timestamp)[-_RECENT:]
+    rates = [r.rate for r in recent if r.rate > 0]
+    return median(rates) if len(rates) >= 1 else None
+
+
+def _backup_rate(backups: Iterable[dict[str, Any]], /) -> float | None:
+    recent = sorted(backups, key=lambda b: int(b["timestamp"]["stop"]))[-_RECENT:]
+    rates = [
+        int(b["info"]["repository"]["delta"]) / duration
+        for b in recent
+        if (duration := int(b["timestamp"]["stop"]) - int(b["timestamp"]["start"])) > 0
+    ]
+    return median(rates) if len(rates) >= 1 else None
+
+
+def format_restore_estimates(estimates: Iterable[RestoreEstimate], /) -> str:
+    """Format restore estimates, with the recommended repo."""
+    estimates = list(estimates)
+    lines = [e.text for e in estimates]
+    known = [e for e in estimates if e.seconds is not None]
+    if len(known) >= 1:
+        lines.append(f"Fastest to restore from: repo{known[0].repo}")
+    elif len(estimates) >= 1:
+        lines.append("No throughput measured yet; cannot recommend a repo")
+    else:
+        lines.append("No backups to restore")
+    return "\n".join(lines)
+
+
+##
+
+
+@contextmanager
+def record_run(
+    kind: RunKind,
+    /,
+    *,
+    stanza: str,
+    estimate: RestoreEstimate | None,
+    path: PathLike | None = None,
+) -> Generator[None]:
+    """Time a successful restore or replay, and append it to the history."""
+    start = monotonic()
+    yield
+    if estimate is None:
+        return
+    bytes_ = estimate.backup_bytes if kind == "restore" else estimate.wal_bytes
+    if bytes_ is None:
+        return
+    record = RunRecord(
+        kind=kind,
+        stanza=stanza,
+        repo=estimate.repo,
+        bytes=bytes_,
+        duration=round(monotonic() - start, 3),
+        timestamp=round(time(), 3),
+    )
+    _LOGGER.info(
+        "Recorded %s of %s in %.1fs", kind, format_bytes(bytes_), record.duration
+    )
+    append_run_history([record], path=path)
+
+
+def get_history_path(*, root: PathLike | None = None) -> Path:
+    """Get the path of the restore history."""
+    return get_root(root=root) / "var/lib/postgresql/restore_history.jsonl"
+
+
+def append_run_history(
+    records: Iterable[RunRecord], /, *, path: PathLike | None = None
+) -> None:
+    """Append records to the restore history, if possible."""
+    path_use = get_history_path() if path is None else Path(path)
+    try:
+        path_use.parent.mkdir(parents=True, exist_ok=True)
+        with path_use.open(mode="a") as fh:
+            for record in records:
+                _ = fh.write(f"{dumps(asdict(record))}\n")
+    except OSError:
+        _LOGGER.warning("Failed to append to %r", str(path_use))
+
+
+def read_run_history(path: PathLike | None = None, /) -> list[RunRecord]:
+    """Read the restore history."""
+    path_use = get_history_path() if path is None else Path(path)
+    if not path_use.is_file():
+        return []
+    records: list[RunRecord] = []
+    for line in path_use.read_text().splitlines():
+        if line.strip() != "":
+            data: dict[str, Any] = loads(line)
+            records.append(RunRecord(**data))
+    return records
+
+
+__all__ = [
+    "RestoreEstimate",
+    "RunKind",
+    "RunRecord",
+    "append_run_history",
+    "estimate_restores",
+    "format_restore_estimates",
+    "get_history_path",
+    "read_run_history",
+    "record_run",
+]
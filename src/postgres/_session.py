@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from atexit import register
+from getpass import getuser
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, LiteralString, cast
+
+from utilities.core import to_logger
+from utilities.subprocess import RunCalledProcessError
+
+from postgres._constants import PORT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from psycopg import Error
+    from psycopg_pool import ConnectionPool
+
+
+_LOGGER = to_logger(__name__)
+_HAS_DRIVER = (find_spec("psycopg") is not None) and (
+    find_spec("psycopg_pool") is not None
+)
+_POOLS: dict[tuple[str, int, str | None], ConnectionPool[Any]] = {}
+_SOCKET_DIR = "/var/run/postgresql"
+_IDENT_MAP = ("root", "postgres")
+_CONNECTION_FAILED = 2  # 'psql' exit code
+
+
+##
+
+
+def has_driver(*, user: str | None = None) -> bool:
+    """Check if SQL can run in-process, as 'user' by peer authentication.
+
+    Besides the current user, 'root' may connect as 'postgres', through the
+    'superuser' map that 'set-up' writes to 'pg_ident.conf'.
+    """
+    if not _HAS_DRIVER:
+        return False
+    current = getuser()
+    return (user is None) or (user == current) or ((current, user) == _IDENT_MAP)
+
+
+def execute(
+    sql: str,
+    params: Sequence[Any] | None = None,
+    /,
+    *,
+    dbname: str = "postgres",
+    port: int = PORT,
+    user: str | None = None,
+) -> list[tuple[Any, ...]]:
+    """Run a SQL statement over a pooled Unix socket connection."""
+    from psycopg import Error
+
+    pool = _get_pool(dbname=dbname, port=port, user=user)
+    try:
+        with pool.connection() as conn, conn.cursor() as cur:
+            query = cast("LiteralString", sql)
+            _ = cur.execute(query, params, prepare=params is not None)
+            return [] if cur.description is None else cur.fetchall()
+    except Error as error:
+        # match 'psql', so that callers handle failures the same on either path
+        # ...but without the SQL, which may hold a password
+        raise RunCalledProcessError(
+            cmd="psql",
+            cmds_or_args=[
+                f"--port={port}",
+                f"--dbname={dbname}",
+                "--command=<redacted>",
+            ],
+            user=user,
+            return_code=_CONNECTION_FAILED if _is_connection_failure(error) else 1,
+            stdout="",
+            stderr=f"{error}\n",
+        ) from error
+
+
+def _is_connection_failure(error: Error, /) -> bool:
+    from psycopg import OperationalError
+
+    if error.sqlstate is None:  # e.g. the pool timed out connecting
+        return isinstance(error, OperationalError)
+    return error.sqlstate.startswith(("08", "57P"))
+
+
+def is_connection_error(error: RunCalledProcessError, /) -> bool:
+    """Check if a SQL statement failed to connect, rather than to run.
+
+    'psql' exits with 2 if it cannot connect; 'execute' does the same.
+    """
+    return error.return_code == _CONNECTION_FAILED
+
+
+def is_accepting(*, port: int = PORT, user: str | None = None) -> bool:
+    """Check if a cluster accepts connections, like 'pg_isready'."""
+    from psycopg import OperationalError, connect
+
+    try:
+        with connect(**_get_kwargs(dbname="postgres", port=port, user=user)):
+            pass
+    except OperationalError:
+        return False
+    return True
+
+
+def set_role_password(
+    role: str, password: str, /, *, port: int = PORT, user: str | None = None
+) -> None:
+    """Set a role's password, composing the literal client-side."""
+    from psycopg import sql
+
+    query = sql.SQL("ALTER ROLE {} WITH PASSWORD {}").format(
+        sql.Identifier(role), sql.Literal(password)
+    )
+    pool = _get_pool(dbname="postgres", port=port, user=user)
+    with pool.connection() as conn:
+        _ = conn.execute(query)
+
+
+##
+
+
+def format_rows(rows: Iterable[Sequence[Any]], /) -> str:
+    """Format rows the way 'psql --no-align --tuples-only' prints them."""
+    return "\n".join("|".join(_format_value(v) for v in row) for row in rows)
+
+
+def _format_value(value: Any, /) -> str:
+    match value:
+        case None:
+            return ""
+        case bool():
+            return "t" if value else "f"
+        case _:
+            return str(value)
+
+
+##
+
+
+def close_pools() -> None:
+    """Close every pooled connection."""
+    for pool in _POOLS.values():
+        pool.close()
+    _POOLS.clear()
+
+
+def _get_pool(
+    *, dbname: str = "postgres", port: int = PORT, user: str | None = None
+) -> ConnectionPool[Any]:
+    key = (dbname, port, user)
+    try:
+        return _POOLS[key]
+    except KeyError:
+        pass
+    from psycopg_pool import ConnectionPool
+
+    _LOGGER.debug("Opening connection pool to %r on port %d...", dbname, port)
+    pool = ConnectionPool(
+        kwargs={**_get_kwargs(dbname=dbname, port=port, user=user), "autocommit": True},
+        min_size=1,
+        max_size=4,
+        open=True,
+        timeout=10.0,
+    )
+    _POOLS[key] = pool
+    return pool
+
+
+def _get_kwargs(
+    *, dbname: str = "postgres", port: int = PORT, user: str | None = None
+) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {
+        "host": _SOCKET_DIR,
+        "port": port,
+        "dbname": dbname,
+        "connect_timeout": 5,
+    }
+    if user is not None:
+        kwargs["user"] = user
+    return kwargs
+
+
+_ = register(close_pools)
+
+
+__all__ = [
+    "close_pools",
+    "execute",
+    "format_rows",
+    "has_driver",
+    "is_accepting",
+    "is_connection_error",
+    "set_role_password",
+]
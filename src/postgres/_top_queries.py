@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from json import dumps, loads
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, assert_never
+
+from utilities.core import to_logger
+
+from postgres._constants import PORT
+from postgres._progress import format_bytes
+from postgres._utilities import run_psql
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from utilities.types import PathLike
+
+
+type QueryStatsKey = Literal["time", "io", "temp"]
+_LOGGER = to_logger(__name__)
+_BLOCK_SIZE = 8192
+_SNAPSHOT_SQL = """
+SELECT coalesce(json_agg(t), '[]')::text
+FROM (
+    SELECT
+        s.dbid::text || ':' || s.userid::text || ':' || s.queryid::text AS key,
+        d.datname AS dbname,
+        s.query,
+        s.calls,
+        s.total_exec_time,
+        s.rows,
+        s.shared_blks_hit,
+        s.shared_blks_read,
+        s.shared_blks_written,
+        s.temp_blks_read,
+        s.temp_blks_written
+    FROM pg_stat_statements AS s
+    LEFT JOIN pg_database AS d ON d.oid = s.dbid
+    WHERE s.toplevel AND s.queryid IS NOT NULL
+) AS t
+"""
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class QueryStats:
+    key: str = field()
+    dbname: str | None = field(default=None)
+    query: str = field(default="")
+    calls: int = field(default=0)
+    total_exec_time: float = field(default=0.0)
+    rows: int = field(default=0)
+    shared_blks_hit: int = field(default=0)
+    shared_blks_read: int = field(default=0)
+    shared_blks_written: int = field(default=0)
+    temp_blks_read: int = field(default=0)
+    temp_blks_written: int = field(default=0)
+
+    @property
+    def io_blocks(self) -> int:
+        """Blocks read from or written to outside shared buffers."""
+        return self.shared_blks_read + self.shared_blks_written
+
+    @property
+    def mean_exec_time(self) -> float:
+        return 0.0 if self.calls == 0 else self.total_exec_time / self.calls
+
+    @property
+    def temp_blocks(self) -> int:
+        return self.temp_blks_read + self.temp_blks_written
+
+    @property
+    def text(self) -> str:
+        query = " ".join(self.query.split())
+        if len(query) > 120:
+            query = f"{query[:117]}..."
+        return (
+            f"{self.total_exec_time / 1000:.1f}s over {self.calls} call(s) "
+            f"({self.mean_exec_time:.1f}ms mean), "
+            f"I/O {format_bytes(self.io_blocks * _BLOCK_SIZE)}, "
+            f"temp {format_bytes(self.temp_blocks * _BLOCK_SIZE)} "
+            f"[{self.dbname}] {query}"
+        )
+
+    def sort_value(self, key: QueryStatsKey, /) -> float:
+        match key:
+            case "time":
+                return self.total_exec_time
+            case "io":
+                return self.io_blocks
+            case "temp":
+                return self.temp_blocks
+            case never:
+                assert_never(never)
+
+
+##
+
+
+def get_query_stats(
+    *, port: int = PORT, user: str | None = "postgres"
+) -> dict[str, QueryStats]:
+    """Snapshot 'pg_stat_statements'."""
+    rows: list[dict[str, Any]] = loads(run_psql(_SNAPSHOT_SQL, port=port, user=user))
+    return {r["key"]: QueryStats(**r) for r in rows}
+
+
+def diff_query_stats(
+    before: Mapping[str, QueryStats], after: Mapping[str, QueryStats], /
+) -> list[QueryStats]:
+    """Get the activity between two snapshots of 'pg_stat_statements'."""
+    diffs: list[QueryStats] = []
+    for key, stats in after.items():
+        prev = before.get(key)
+        if (prev is None) or (stats.calls < prev.calls):  # new, or reset since
+            diff = stats
+        else:
+            diff = QueryStats(
+                key=key,
+                dbname=stats.dbname,
+                query=stats.query,
+                calls=stats.calls - prev.calls,
+                total_exec_time=stats.total_exec_time - prev.total_exec_time,
+                rows=stats.rows - prev.rows,
+                shared_blks_hit=stats.shared_blks_hit - prev.shared_blks_hit,
+                shared_blks_read=stats.shared_blks_read - prev.shared_blks_read,
+                shared_blks_written=stats.shared_blks_written
+                - prev.shared_blks_written,
+                temp_blks_read=stats.temp_blks_read - prev.temp_blks_read,
+                temp_blks_written=stats.temp_blks_written - prev.temp_blks_written,
+            )
+        if diff.calls >= 1:
+            diffs.append(diff)
+    return diffs
+
+
+def get_top_queries(
+    stats: Iterable[QueryStats], /, *, key: QueryStatsKey = "time", limit: int = 10
+) -> list[QueryStats]:
+    """Get the queries with the highest total time, I/O or temp spill."""
+    ranked = sorted(stats, key=lambda s: s.sort_value(key), reverse=True)
+    return [s for s in ranked[:limit] if s.sort_value(key) > 0]
+
+
+def format_top_queries(stats: Iterable[QueryStats], /, *, limit: int = 10) -> str:
+    """Format the top queries by total time, I/O and temp spill."""
+    stats = list(stats)
+    titles: dict[QueryStatsKey, str] = {
+        "time": "By total time",
+        "io": "By I/O",
+        "temp": "By temp spill",
+    }
+    lines: list[str] = []
+    for key, title in titles.items():
+        lines.append(f"{title}:")
+        top = get_top_queries(stats, key=key, limit=limit)
+        if len(top) == 0:
+            lines.append("  (none)")
+        lines.extend(f"  {i}. {s.text}" for i, s in enumerate(top, start=1))
+    return "\n".join(lines)
+
+
+##
+
+
+def read_query_stats(path: PathLike, /) -> dict[str, QueryStats]:
+    """Read a snapshot written by 'write_query_stats'."""
+    rows: list[dict[str, Any]] = loads(Path(path).read_text())
+    return {r["key"]: QueryStats(**r) for r in rows}
+
+
+def write_query_stats(stats: Mapping[str, QueryStats], /, *, path: PathLike) -> None:
+    """Write a snapshot of 'pg_stat_statements'."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ = path.write_text(dumps([asdict(s) for s in stats.values()]))
+    _LOGGER.info("Wrote %d statement(s) to %r", len(stats), str(path))
+
+
+__all__ = [
+    "QueryStats",
+    "QueryStatsKey",
+    "diff_query_stats",
+    "format_top_queries",
+    "get_query_stats",
+    "get_top_queries",
+    "read_query_stats",
+    "write_query_stats",
+]
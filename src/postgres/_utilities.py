@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping
+import re
+from collections.abc import Callable, Iterable, Mapping
+from json import dumps, loads
 from pathlib import Path
 from shlex import join
-from typing import TYPE_CHECKING, assert_never
+from subprocess import DEVNULL, PIPE, STDOUT, Popen
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, Literal, assert_never, overload
 
 from installer import get_root
 from utilities.core import to_logger
-from utilities.subprocess import maybe_sudo_cmd, run
+from utilities.subprocess import (
+    RunCalledProcessError,
+    RunFileNotFoundError,
+    maybe_sudo_cmd,
+    run,
+)
 
-from postgres._constants import VERSION
+from postgres._constants import JOBS, PORT, VERSION
+from postgres._session import execute, format_rows, has_driver
 
 if TYPE_CHECKING:
     from utilities.types import LoggerLike, PathLike, Retry, StrStrMapping
@@ -18,6 +28,46 @@ if TYPE_CHECKING:
 
 
 _LOGGER = to_logger(__name__)
+_SETTING = re.compile(
+    r"^\s*([\w.]+)\s*=\s*('(?:[^']|'')*'|[^\s#]+)", flags=re.MULTILINE
+)
+
+
+##
+
+
+def analyze_in_stages(
+    *,
+    port: int = PORT,
+    jobs: int = JOBS,
+    dbnames: Iterable[str] | None = None,
+    user: str | None = "postgres",
+    print: bool = True,  # noqa: A002
+) -> None:
+    """Analyze databases in stages, so that planner statistics arrive early.
+
+    All databases are analyzed unless 'dbnames' is given.
+    """
+    targets: list[list[str]] = (
+        [["--all"]] if dbnames is None else [[f"--dbname={d}"] for d in dbnames]
+    )
+    _LOGGER.info(
+        "Analyzing %s in stages with %d job(s)...",
+        "all databases" if dbnames is None else f"{len(targets)} database(s)",
+        jobs,
+    )
+    for target in targets:
+        run_or_as_user(
+            "vacuumdb",
+            f"--port={port}",
+            *target,
+            "--analyze-in-stages",
+            f"--jobs={jobs}",
+            user=user,
+            print=print,
+            logger=_LOGGER,
+        )
+    _LOGGER.info("Finished analyzing databases")
 
 
 ##
@@ -33,6 +83,24 @@ def drop_cluster(name: str, /, *, version: int = VERSION, sudo: bool = False) ->
 ##
 
 
+def get_pg_bin(name: str, /, *, version: int = VERSION) -> Path:
+    """Get the path to a versioned Postgres binary."""
+    return Path("/usr/lib/postgresql", str(version), "bin", name)
+
+
+##
+
+
+def get_pg_data(
+    name: str, /, *, version: int = VERSION, root: PathLike | None = None
+) -> Path:
+    """Get the Postgres data directory of a cluster."""
+    return get_root(root=root) / f"var/lib/postgresql/{version}/{name}"
+
+
+##
+
+
 def get_pg_root(
     *, root: PathLike | None = None, version: int | None = None, name: str | None = None
 ) -> Path:
@@ -56,6 +124,62 @@ def get_pg_root(
 ##
 
 
+def get_info_json[T: str](
+    *,
+    stanza: str | None = None,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: Mapping[T, int] | None = None,
+    user: str | None = None,
+) -> list[dict[str, Any]]:
+    """Get the 'pgbackrest info' output as JSON."""
+    args: list[str] = ["pgbackrest"]
+    if repo is not None:
+        args.append(f"--repo={to_repo_num(repo=repo, mapping=repo_mapping)}")
+    if stanza is not None:
+        args.append(f"--stanza={stanza}")
+    args.extend(["--output=json", "info"])
+    output = run_or_as_user(*args, user=user, return_stdout=True)
+    return loads(output)
+
+
+def get_restore_set(
+    info: Iterable[Mapping[str, Any]], /, *, stanza: str, repo: int | None = None
+) -> Mapping[str, Any] | None:
+    """Get the backup set that 'pgbackrest restore' picks by default.
+
+    This is the latest set; if several repos hold it, the lowest-numbered one.
+    """
+    backups = [
+        b
+        for s in info
+        if s["name"] == stanza
+        for b in s.get("backup", [])
+        if (repo is None) or (int(b["database"]["repo-key"]) == repo)
+    ]
+    if len(backups) == 0:
+        return None
+    latest = max(int(b["timestamp"]["stop"]) for b in backups)
+    return min(
+        (b for b in backups if int(b["timestamp"]["stop"]) == latest),
+        key=lambda b: int(b["database"]["repo-key"]),
+    )
+
+
+##
+
+
+def to_path_map(items: Iterable[str], /) -> dict[str, Path]:
+    """Convert 'KEY=PATH' items to a mapping."""
+    mapping: dict[str, Path] = {}
+    for item in items:
+        key, sep, path = item.partition("=")
+        if (sep == "") or (key == "") or (path == ""):
+            msg = f"Expected an item of the form 'KEY=PATH'; got {item!r}"
+            raise ValueError(msg)
+        mapping[key] = Path(path)
+    return mapping
+
+
 def to_repo_num[T: str](
     *, repo: RepoNumOrName[T] | None = None, mapping: Mapping[T, int] | None = None
 ) -> int:
@@ -77,6 +201,45 @@ def to_repo_num[T: str](
 ##
 
 
+def read_postgresql_conf(path: PathLike, /) -> dict[str, str]:
+    """Read the settings of a 'postgresql.conf'-style file, unquoted."""
+    try:
+        text = Path(path).read_text()
+    except FileNotFoundError:
+        return {}
+    return {
+        key: value[1:-1].replace("''", "'") if value.startswith("'") else value
+        for key, value in _SETTING.findall(text)
+    }
+
+
+##
+
+
+def read_json_state(path: PathLike, /) -> Any:
+    """Read a JSON state file, or 'None' if it does not exist yet."""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    return loads(path.read_text())
+
+
+def write_json_state(state: Any, /, *, path: PathLike) -> None:
+    """Write a JSON state file, atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = dumps(state, indent=2, sort_keys=True)
+    with NamedTemporaryFile(
+        mode="w", dir=path.parent, prefix=".", suffix=".tmp", delete=False
+    ) as temp:
+        _ = temp.write(f"{text}\n")
+    _ = Path(temp.name).replace(path)
+
+
+##
+
+
+@overload
 def run_or_as_user(
     cmd: str,
     /,
@@ -86,18 +249,58 @@ def run_or_as_user(
     cwd: PathLike | None = None,
     env: StrStrMapping | None = None,
     user: str | int | None = None,
+    sudo: bool = False,
+    print: bool = False,
+    print_stdout: bool = False,
+    print_stderr: bool = False,
+    return_stdout: Literal[True],
+    suppress: bool = False,
+    retry: Retry | None = None,
+    retry_skip: Callable[[int, str, str], bool] | None = None,
+    logger: LoggerLike | None = None,
+) -> str: ...
+@overload
+def run_or_as_user(
+    cmd: str,
+    /,
+    *args: str,
+    executable: str | None = None,
+    shell: bool = False,
+    cwd: PathLike | None = None,
+    env: StrStrMapping | None = None,
+    user: str | int | None = None,
+    sudo: bool = False,
+    print: bool = False,
+    print_stdout: bool = False,
+    print_stderr: bool = False,
+    return_stdout: Literal[False] = False,
+    suppress: bool = False,
+    retry: Retry | None = None,
+    retry_skip: Callable[[int, str, str], bool] | None = None,
+    logger: LoggerLike | None = None,
+) -> None: ...
+def run_or_as_user(
+    cmd: str,
+    /,
+    *args: str,
+    executable: str | None = None,
+    shell: bool = False,
+    cwd: PathLike | None = None,
+    env: StrStrMapping | None = None,
+    user: str | int | None = None,
+    sudo: bool = False,
     print: bool = False,  # noqa: A002
     print_stdout: bool = False,
     print_stderr: bool = False,
+    return_stdout: bool = False,
     suppress: bool = False,
     retry: Retry | None = None,
     retry_skip: Callable[[int, str, str], bool] | None = None,
     logger: LoggerLike | None = None,
-) -> None:
+) -> str | None:
     if user is None:
-        run(
-            cmd,
-            *args,
+        return run(
+            *maybe_sudo_cmd(cmd, *args, sudo=sudo),
             executable=executable,
             shell=shell,
             cwd=cwd,
@@ -105,29 +308,129 @@ def run_or_as_user(
             print=print,
             print_stdout=print_stdout,
             print_stderr=print_stderr,
+            return_stdout=return_stdout,
             suppress=suppress,
             retry=retry,
             retry_skip=retry_skip,
             logger=logger,
         )
+    return run(
+        *maybe_sudo_cmd("su", "-", str(user), sudo=sudo),
+        executable=executable,
+        shell=shell,
+        cwd=cwd,
+        env=env,
+        input=join([cmd, *args]),
+        print=print,
+        print_stdout=print_stdout,
+        print_stderr=print_stderr,
+        return_stdout=return_stdout,
+        suppress=suppress,
+        retry=retry,
+        retry_skip=retry_skip,
+        logger=logger,
+    )
+
+
+##
+
+
+def run_psql(
+    sql: str,
+    /,
+    *,
+    dbname: str = "postgres",
+    port: int = PORT,
+    user: str | None = "postgres",
+    sudo: bool = False,
+) -> str:
+    """Run a SQL statement and return its unaligned output.
+
+    The statement runs in-process over a pooled connection if 'psycopg' is
+    installed and 'user' is the current user, and with 'psql' otherwise.
+    """
+    if has_driver(user=user):
+        return format_rows(execute(sql, dbname=dbname, port=port, user=user))
+    return run_or_as_user(
+        "psql",
+        f"--port={port}",
+        f"--dbname={dbname}",
+        "--no-align",
+        "--tuples-only",
+        "--quiet",
+        f"--command={sql}",
+        user=user,
+        sudo=sudo,
+        return_stdout=True,
+    )
+
+
+##
+
+
+def stream_or_as_user(
+    cmd: str,
+    /,
+    *args: str,
+    user: str | int | None = None,
+    on_line: Callable[[str], None],
+) -> None:
+    """Run a command, passing each line of its output to a callback as it arrives.
+
+    Failures raise the same errors as 'run_or_as_user'; the output, with
+    'stderr' merged in, is attached as 'stderr'.
+    """
+    if user is None:
+        popen_args, input_ = [cmd, *args], None
     else:
-        run(
-            "su",
-            "-",
-            str(user),
-            executable=executable,
-            shell=shell,
-            cwd=cwd,
-            env=env,
-            input=join([cmd, *args]),
-            print=print,
-            print_stdout=print_stdout,
-            print_stderr=print_stderr,
-            suppress=suppress,
-            retry=retry,
-            retry_skip=retry_skip,
-            logger=logger,
+        popen_args, input_ = ["su", "-", str(user)], join([cmd, *args])
+    lines: list[str] = []
+    try:
+        proc = Popen(
+            popen_args,
+            stdin=DEVNULL if input_ is None else PIPE,
+            stdout=PIPE,
+            stderr=STDOUT,
+            text=True,
+            bufsize=1,
+        )
+    except FileNotFoundError:
+        raise RunFileNotFoundError(
+            cmd=popen_args[0], cmds_or_args=popen_args[1:]
+        ) from None
+    with proc:
+        if (proc.stdin is not None) and (input_ is not None):
+            _ = proc.stdin.write(input_)
+            proc.stdin.close()
+        if proc.stdout is not None:
+            for line in proc.stdout:
+                lines.append(line)
+                on_line(line.rstrip("\n"))
+    if proc.returncode != 0:
+        raise RunCalledProcessError(
+            cmd=popen_args[0],
+            cmds_or_args=popen_args[1:],
+            return_code=proc.returncode,
+            input=input_,
+            stdout="",
+            stderr="".join(lines),
         )
 
 
-__all__ = ["drop_cluster", "get_pg_root", "run_or_as_user", "to_repo_num"]
+__all__ = [
+    "analyze_in_stages",
+    "drop_cluster",
+    "get_info_json",
+    "get_pg_bin",
+    "get_pg_data",
+    "get_pg_root",
+    "get_restore_set",
+    "read_json_state",
+    "read_postgresql_conf",
+    "run_or_as_user",
+    "run_psql",
+    "stream_or_as_user",
+    "to_path_map",
+    "to_repo_num",
+    "write_json_state",
+]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+
+from postgres._progress import format_bytes
+from postgres._utilities import read_json_state, write_json_state
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+_CHECKED = re.compile(
+    r"total files checked: (?P<checked>\d+), total valid files: (?P<valid>\d+)"
+)
+_BAD_FILE = re.compile(
+    r"(?:invalid|missing|mismatch|error)[^']*'(?P<path>[^']+)'", flags=re.IGNORECASE
+)
+
+
+##
+
+
+@dataclass(order=True, unsafe_hash=True, kw_only=True, slots=True)
+class VerifyResult:
+    stanza: str = field()
+    repo: int | None = field(default=None)
+    set_: str | None = field(default=None)
+    duration: float = field(default=0.0)
+    size: int = field(default=0)
+    files_checked: int = field(default=0)
+    files_valid: int = field(default=0)
+    bad_files: tuple[str, ...] = field(default=())
+
+    @property
+    def ok(self) -> bool:
+        return (len(self.bad_files) == 0) and (self.files_checked == self.files_valid)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return 0.0 if self.duration <= 0 else self.size / self.duration
+
+    @property
+    def text(self) -> str:
+        target = "all sets" if self.set_ is None else self.set_
+        repo = "default repo" if self.repo is None else f"repo {self.repo}"
+        status = "ok" if self.ok else f"{len(self.bad_files)} bad file(s)"
+        return (
+            f"{self.stanza} {target} in {repo}: {status}, "
+            f"{self.files_valid}/{self.files_checked} file(s) valid, "
+            f"{format_bytes(self.size)} in {self.duration:.1f}s "
+            f"({format_bytes(round(self.throughput))}/s)"
+        )
+
+
+@dataclass(kw_only=True, slots=True)
+class VerifyParser:
+    """Collect file counts and bad files from 'pgbackrest verify' output."""
+
+    files_checked: int = field(default=0)
+    files_valid: int = field(default=0)
+    bad_files: list[str] = field(default_factory=list)
+
+    def feed(self, line: str, /) -> None:
+        if (match := _CHECKED.search(line)) is not None:
+            self.files_checked += int(match["checked"])
+            self.files_valid += int(match["valid"])
+        elif ((" WARN: " in line) or (" ERROR: " in line)) and (
+            (match := _BAD_FILE.search(line)) is not None
+        ):
+            self.bad_files.append(match["path"])
+
+
+##
+
+
+def select_backup_sets(
+    labels: Iterable[str], /, *, sample: int, verified: Mapping[str, str] | None = None
+) -> list[str]:
+    """Select the backup sets verified least recently, never-verified first."""
+    verified_use: Mapping[str, str] = {} if verified is None else verified
+    ordered = sorted(labels, key=lambda label: (verified_use.get(label, ""), label))
+    return sorted(ordered[:sample])
+
+
+##
+
+
+def read_verify_state(path: PathLike, /) -> dict[str, dict[str, str]]:
+    """Read the last verification time of each backup set, keyed by 'stanza/repo'."""
+    state = read_json_state(path)
+    return {} if state is None else state
+
+
+def write_verify_state(
+    state: Mapping[str, Mapping[str, str]], /, *, path: PathLike
+) -> None:
+    """Write the last verification time of each backup set, atomically."""
+    write_json_state(state, path=path)
+    _LOGGER.info("Wrote verification state to %r", str(path))
+
+
+__all__ = [
+    "VerifyParser",
+    "VerifyResult",
+    "read_verify_state",
+    "select_backup_sets",
+    "write_verify_state",
+]
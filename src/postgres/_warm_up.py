@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from utilities.core import to_logger
+from utilities.subprocess import RunCalledProcessError
+
+from postgres._constants import JOBS, PORT, PREWARM_LIMIT
+from postgres._databases import is_database_restored
+from postgres._recovery import wait_until_ready
+from postgres._utilities import analyze_in_stages, run_psql
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from utilities.types import MaybeIterable, PathLike
+
+
+_LOGGER = to_logger(__name__)
+_HOT_RELATIONS_SQL = """
+SELECT quote_ident(schemaname) || '.' || quote_ident(relname)
+FROM (
+    SELECT schemaname, relname, heap_blks_hit + heap_blks_read AS blks
+    FROM pg_statio_user_tables
+    UNION ALL
+    SELECT schemaname, indexrelname, idx_blks_hit + idx_blks_read
+    FROM pg_statio_user_indexes
+) AS t
+WHERE blks > 0
+ORDER BY blks DESC
+LIMIT {limit}
+"""
+
+
+##
+
+
+def warm_up(
+    *,
+    port: int = PORT,
+    analyze: bool = False,
+    jobs: int = JOBS,
+    prewarm: PathLike | None = None,
+    db_include: MaybeIterable[str] | None = None,
+    db_exclude: MaybeIterable[str] | None = None,
+    timeout: float = 3600.0,
+    user: str | None = "postgres",
+    print: bool = True,  # noqa: A002
+) -> dict[str, float]:
+    """Wait for recovery, then refresh statistics and warm the buffer cache.
+
+    After a selective restore, pass the same filters so that only the restored
+    databases are touched.
+    """
+    _LOGGER.info("Warming up cluster on port %d...", port)
+    timings: dict[str, float] = {}
+    start = monotonic()
+    wait_until_ready(port=port, timeout=timeout, user=user)
+    timings["recovery"] = monotonic() - start
+    dbnames: list[str] | None = None
+    if (db_include is not None) or (db_exclude is not None):
+        dbnames = [
+            d
+            for d in _get_dbnames(port=port, user=user)
+            if is_database_restored(d, include=db_include, exclude=db_exclude)
+        ]
+    if analyze:
+        start = monotonic()
+        analyze_in_stages(port=port, jobs=jobs, dbnames=dbnames, user=user, print=print)
+        timings["analyze"] = monotonic() - start
+    if prewarm is not None:
+        start = monotonic()
+        _prewarm_stage(prewarm, port=port, dbnames=dbnames, user=user)
+        timings["prewarm"] = monotonic() - start
+    for stage, duration in timings.items():
+        _LOGGER.info("Stage %r took %.1fs", stage, duration)
+    _LOGGER.info("Finished warming up cluster on port %d", port)
+    return timings
+
+
+def _prewarm_stage(
+    path: PathLike,
+    /,
+    *,
+    port: int = PORT,
+    dbnames: Iterable[str] | None = None,
+    user: str | None = "postgres",
+) -> None:
+    if Path(path).is_file():
+        relations = read_hot_relations(path)
+        if dbnames is not None:
+            keep = set(dbnames)
+            relations = [(d, r) for d, r in relations if d in keep]
+        _ = prewarm_relations(relations, port=port, user=user)
+        return
+    libraries = run_psql("SHOW shared_preload_libraries", port=port, user=user)
+    if "pg_prewarm" in libraries:
+        _LOGGER.info("No relations saved at %r; relying on autoprewarm", str(path))
+    else:
+        _LOGGER.warning("No relations saved at %r; skipping prewarm", str(path))
+
+
+##
+
+
+def get_hot_relations(
+    *, limit: int = PREWARM_LIMIT, port: int = PORT, user: str | None = "postgres"
+) -> list[tuple[str, str]]:
+    """Get the most-read relations of every database."""
+    sql = _HOT_RELATIONS_SQL.format(limit=limit)
+    return [
+        (dbname, relation)
+        for dbname in _get_dbnames(port=port, user=user)
+        for relation in run_psql(sql, dbname=dbname, port=port, user=user).splitlines()
+    ]
+
+
+def _get_dbnames(*, port: int = PORT, user: str | None = "postgres") -> list[str]:
+    return run_psql(
+        "SELECT datname FROM pg_database WHERE datallowconn AND NOT datistemplate",
+        port=port,
+        user=user,
+    ).splitlines()
+
+
+def prewarm_relations(
+    relations: Iterable[tuple[str, str]],
+    /,
+    *,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> int:
+    """Load relations into the buffer cache with 'pg_prewarm'."""
+    by_dbname: dict[str, list[str]] = {}
+    for dbname, relation in relations:
+        by_dbname.setdefault(dbname, []).append(relation)
+    total = 0
+    for dbname, relations_i in by_dbname.items():
+        _LOGGER.info("Prewarming %d relation(s) in %r...", len(relations_i), dbname)
+        _ = run_psql(
+            "CREATE EXTENSION IF NOT EXISTS pg_prewarm",
+            dbname=dbname,
+            port=port,
+            user=user,
+        )
+        for relation in relations_i:
+            sql = f"SELECT pg_prewarm({_quote_literal(relation)})"
+            try:
+                blocks = run_psql(sql, dbname=dbname, port=port, user=user)
+            except RunCalledProcessError:
+                _LOGGER.warning("Failed to prewarm %r in %r", relation, dbname)
+            else:
+                total += int(blocks)
+    _LOGGER.info("Prewarmed %d block(s)", total)
+    return total
+
+
+def _quote_literal(value: str, /) -> str:
+    escaped = value.replace("'", "''")
+    return f"'{escaped}'"
+
+
+##
+
+
+def read_hot_relations(path: PathLike, /) -> list[tuple[str, str]]:
+    """Read a list of relations written by 'write_hot_relations'."""
+    relations: list[tuple[str, str]] = []
+    for line in Path(path).read_text().splitlines():
+        if line.strip() == "":
+            continue
+        dbname, relation = line.split("\t", maxsplit=1)
+        relations.append((dbname, relation))
+    return relations
+
+
+def save_hot_relations(
+    path: PathLike,
+    /,
+    *,
+    limit: int = PREWARM_LIMIT,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> None:
+    """Save the most-read relations of a running cluster, if possible."""
+    _LOGGER.info("Saving hot relations to %r...", str(path))
+    try:
+        relations = get_hot_relations(limit=limit, port=port, user=user)
+    except RunCalledProcessError:
+        _LOGGER.warning("Failed to get hot relations; keeping %r as is", str(path))
+        return
+    if len(relations) == 0:
+        _LOGGER.warning("No hot relations found; keeping %r as is", str(path))
+        return
+    write_hot_relations(relations, path=path)
+
+
+def write_hot_relations(
+    relations: Iterable[tuple[str, str]], /, *, path: PathLike
+) -> None:
+    """Write a list of relations, one '<dbname>\\t<relation>' per line."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [f"{dbname}\t{relation}\n" for dbname, relation in relations]
+    _ = path.write_text("".join(lines))
+    _LOGGER.info("Wrote %d relation(s) to %r", len(lines), str(path))
+
+
+__all__ = [
+    "get_hot_relations",
+    "prewarm_relations",
+    "read_hot_relations",
+    "save_hot_relations",
+    "warm_up",
+    "write_hot_relations",
+]
@@ -1,30 +1,90 @@
 from __future__ import annotations
 
 from postgres.commands._backup import backup, make_backup_cmd
+from postgres.commands._backup_watch import backup_watch, make_backup_watch_cmd
+from postgres.commands._bench import bench, make_bench_cmd
 from postgres.commands._check import check, make_check_cmd
+from postgres.commands._clone import clone, make_clone_cmd, make_prune_clones_cmd
+from postgres.commands._databases import databases, make_databases_cmd
+from postgres.commands._dump import dump, make_dump_cmd
+from postgres.commands._expire import expire, make_expire_cmd
+from postgres.commands._fleet import fleet, make_fleet_cmd
 from postgres.commands._info import info, make_info_cmd
-from postgres.commands._restore import make_restore_cmd, restore
-from postgres.commands._set_up import RepoSpec, make_set_up_cmd, set_up
+from postgres.commands._load import load, make_load_cmd
+from postgres.commands._maintain import maintain, make_maintain_cmd
+from postgres.commands._pooler import make_pooler_cmd, pooler
+from postgres.commands._repo_stats import make_repo_stats_cmd, repo_stats
+from postgres.commands._restore import (
+    estimate_restore,
+    get_data_links,
+    make_restore_cmd,
+    restore,
+)
+from postgres.commands._set_up import PGHostSpec, RepoSpec, make_set_up_cmd, set_up
+from postgres.commands._set_up_standby import (
+    make_set_up_standby_cmd,
+    set_up_standby,
+    to_primary_conninfo,
+)
 from postgres.commands._stanza_create import make_stanza_create_cmd, stanza_create
 from postgres.commands._start import make_start_cmd, start
 from postgres.commands._stop import make_stop_cmd, stop
+from postgres.commands._top_queries import make_top_queries_cmd, top_queries
+from postgres.commands._upgrade import make_upgrade_cmd, to_pg_upgrade_args, upgrade
+from postgres.commands._verify import make_verify_cmd, verify
 
 __all__ = [
+    "PGHostSpec",
     "RepoSpec",
     "backup",
+    "backup_watch",
+    "bench",
     "check",
+    "clone",
+    "databases",
+    "dump",
+    "estimate_restore",
+    "expire",
+    "fleet",
+    "get_data_links",
     "info",
+    "load",
+    "maintain",
     "make_backup_cmd",
+    "make_backup_watch_cmd",
+    "make_bench_cmd",
     "make_check_cmd",
+    "make_clone_cmd",
+    "make_databases_cmd",
+    "make_dump_cmd",
+    "make_expire_cmd",
+    "make_fleet_cmd",
     "make_info_cmd",
+    "make_load_cmd",
+    "make_maintain_cmd",
+    "make_pooler_cmd",
+    "make_prune_clones_cmd",
+    "make_repo_stats_cmd",
     "make_restore_cmd",
     "make_set_up_cmd",
+    "make_set_up_standby_cmd",
     "make_stanza_create_cmd",
     "make_start_cmd",
     "make_stop_cmd",
+    "make_top_queries_cmd",
+    "make_upgrade_cmd",
+    "make_verify_cmd",
+    "pooler",
+    "repo_stats",
     "restore",
     "set_up",
+    "set_up_standby",
     "stanza_create",
     "start",
     "stop",
+    "to_pg_upgrade_args",
+    "to_primary_conninfo",
+    "top_queries",
+    "upgrade",
+    "verify",
 ]
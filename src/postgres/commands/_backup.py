@@ -2,28 +2,38 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import utilities.click
 from click import command
-from utilities.click import CONTEXT_SETTINGS
+from utilities.click import CONTEXT_SETTINGS, flag, option
 from utilities.core import always_iterable, is_pytest, set_up_logging, to_logger
 
 from postgres import __version__
+from postgres._basebackup import basebackup
 from postgres._click import (
+    engine_option,
+    metrics_dir_option,
     print_option,
+    progress_option,
     repo_option,
     stanza_argument,
     type_default_option,
     user_option,
+    version_option,
 )
-from postgres._enums import DEFAULT_BACKUP_TYPE
+from postgres._constants import PORT, VERSION
+from postgres._enums import DEFAULT_BACKUP_ENGINE, DEFAULT_BACKUP_TYPE, BackupEngine
+from postgres._metrics import yield_metrics
+from postgres._progress import log_progress, run_with_progress
 from postgres._utilities import run_or_as_user, to_repo_num
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Mapping
 
     from click import Command
-    from utilities.types import MaybeIterable
+    from utilities.types import MaybeIterable, PathLike
 
     from postgres._enums import BackupType
+    from postgres._progress import ProgressCallback
     from postgres._types import RepoNumOrName
 
 
@@ -42,9 +52,54 @@ def backup[T: str](
     type_: BackupType = DEFAULT_BACKUP_TYPE,
     user: str | None = None,
     print: bool = True,  # noqa: A002
+    metrics_dir: PathLike | None = None,
+    progress: ProgressCallback | None = None,
+    backup_standby: bool | None = None,
+    engine: BackupEngine = DEFAULT_BACKUP_ENGINE,
+    path: PathLike | None = None,
+    version: int = VERSION,
+    port: int = PORT,
 ) -> None:
+    if engine is BackupEngine.pg_basebackup:
+        if path is None:
+            msg = f"Expected 'path' for the {engine.value!r} engine"
+            raise ValueError(msg)
+        for key, value in [
+            ("repo", repo),
+            ("progress", progress),
+            ("backup_standby", backup_standby),
+        ]:
+            if value is not None:
+                msg = f"Expected no {key!r} for the {engine.value!r} engine"
+                raise ValueError(msg)
+        with yield_metrics(
+            "backup",
+            path=metrics_dir,
+            stanza=stanza,
+            type_=type_,
+            user=user,
+            sizes=False,
+        ):
+            _ = basebackup(
+                stanza,
+                path=path,
+                type_=type_,
+                version=version,
+                port=port,
+                user=user,
+                print=print,
+            )
+        return
     if repo is None:
-        _backup_core(stanza, type_=type_, user=user, print=print)
+        _backup_core(
+            stanza,
+            type_=type_,
+            user=user,
+            print=print,
+            metrics_dir=metrics_dir,
+            progress=progress,
+            backup_standby=backup_standby,
+        )
     else:
         for repo_i in always_iterable(repo):
             _backup_core(
@@ -54,6 +109,9 @@ def backup[T: str](
                 type_=type_,
                 user=user,
                 print=print,
+                metrics_dir=metrics_dir,
+                progress=progress,
+                backup_standby=backup_standby,
             )
 
 
@@ -66,17 +124,27 @@ def _backup_core[T: str](
     type_: BackupType = DEFAULT_BACKUP_TYPE,
     user: str | None = None,
     print: bool = True,  # noqa: A002
+    metrics_dir: PathLike | None = None,
+    progress: ProgressCallback | None = None,
+    backup_standby: bool | None = None,
 ) -> None:
     args: list[str] = ["pgbackrest"]
+    repo_num = to_repo_num(repo=repo, mapping=repo_mapping)
     if repo is None:
         _LOGGER.info("%s backup %r to default repo...", type_.desc.title(), stanza)
-        repo_num = repo
     else:
         _LOGGER.info("%s backup %r to repo %r...", type_.desc.title(), stanza, repo)
-        repo_num = to_repo_num(repo=repo, mapping=repo_mapping)
         args.append(f"--repo={repo_num}")
+    if backup_standby is not None:
+        args.append(f"--backup-standby={'y' if backup_standby else 'n'}")
     args.extend([f"--stanza={stanza}", f"--type={type_.value}", "backup"])
-    run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
+    with yield_metrics(
+        "backup", path=metrics_dir, stanza=stanza, repo=repo_num, type_=type_, user=user
+    ):
+        if progress is None:
+            run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
+        else:
+            run_with_progress(*args, callback=progress, user=user, print=print)
     if repo is None:
         _LOGGER.info("Finished %s backup %r to default repo", type_.desc, stanza)
     else:
@@ -94,6 +162,22 @@ def make_backup_cmd(
     @repo_option
     @user_option
     @print_option
+    @metrics_dir_option
+    @progress_option
+    @flag(
+        "--backup-standby",
+        default=None,
+        help="Copy files from a standby rather than the primary",
+    )
+    @engine_option
+    @option(
+        "--path",
+        type=utilities.click.Path(exist="dir if exists"),
+        default=None,
+        help="Backup directory for the 'pg_basebackup' engine",
+    )
+    @version_option
+    @option("--port", type=int, default=PORT, help="Cluster port")
     def func[T: str](
         *,
         stanza: str,
@@ -101,11 +185,31 @@ def make_backup_cmd(
         repo: RepoNumOrName[T] | None,
         user: str | None,
         print: bool,  # noqa: A002
+        metrics_dir: PathLike | None,
+        progress: bool,
+        backup_standby: bool | None,
+        engine: BackupEngine,
+        path: PathLike | None,
+        version: int,
+        port: int,
     ) -> None:
         if is_pytest():
             return
         set_up_logging(__name__, root=True, log_version=__version__)
-        backup(stanza, repo=repo, type_=type_, user=user, print=print)
+        backup(
+            stanza,
+            repo=repo,
+            type_=type_,
+            user=user,
+            print=print,
+            metrics_dir=metrics_dir,
+            progress=log_progress(logger=_LOGGER) if progress else None,
+            backup_standby=backup_standby,
+            engine=engine,
+            path=path,
+            version=version,
+            port=port,
+        )
 
     return cli(name=name, help="Backup a database cluster", **CONTEXT_SETTINGS)(func)
 
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from time import sleep, time
+from typing import TYPE_CHECKING
+
+from click import command
+from utilities.click import CONTEXT_SETTINGS, Str, flag, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import __version__
+from postgres._backup_watch import get_wal_status
+from postgres._click import (
+    metrics_dir_option,
+    repo_option,
+    stanza_argument,
+    type_default_option,
+    user_option,
+)
+from postgres._constants import PORT
+from postgres._enums import DEFAULT_BACKUP_TYPE
+from postgres._host import parse_memory
+from postgres._progress import format_bytes
+from postgres._utilities import get_info_json
+from postgres.commands._backup import backup
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+    from postgres._enums import BackupType
+    from postgres._types import RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+_THRESHOLD = 16 * 1024**3
+
+
+##
+
+
+def backup_watch[T: str](
+    stanza: str,
+    /,
+    *,
+    threshold: int = _THRESHOLD,
+    interval: float = 60.0,
+    min_interval: float = 3600.0,
+    max_per_day: int | None = 24,
+    once: bool = False,
+    repo: RepoNumOrName[T] | None = None,
+    type_: BackupType = DEFAULT_BACKUP_TYPE,
+    port: int = PORT,
+    user: str | None = None,
+    db_user: str | None = "postgres",
+    metrics_dir: PathLike | None = None,
+) -> None:
+    """Back up whenever enough WAL has been generated since the last backup.
+
+    Bounding the WAL after each backup bounds the replay at restore, however
+    the write load changes; 'min_interval' and 'max_per_day' cap the rate.
+    """
+    _LOGGER.info(
+        "Watching %r for %s of WAL every %.0fs...",
+        stanza,
+        format_bytes(threshold),
+        interval,
+    )
+    while True:
+        try:
+            _check(
+                stanza,
+                threshold=threshold,
+                min_interval=min_interval,
+                max_per_day=max_per_day,
+                repo=repo,
+                type_=type_,
+                port=port,
+                user=user,
+                db_user=db_user,
+                metrics_dir=metrics_dir,
+            )
+        except (RunCalledProcessError, KeyError, ValueError):
+            if once:
+                raise
+            _LOGGER.exception("Failed to check %r; retrying in %.0fs", stanza, interval)
+        if once:
+            return
+        sleep(interval)
+
+
+def _check[T: str](
+    stanza: str,
+    /,
+    *,
+    threshold: int,
+    min_interval: float = 3600.0,
+    max_per_day: int | None = 24,
+    repo: RepoNumOrName[T] | None = None,
+    type_: BackupType = DEFAULT_BACKUP_TYPE,
+    port: int = PORT,
+    user: str | None = None,
+    db_user: str | None = "postgres",
+    metrics_dir: PathLike | None = None,
+) -> None:
+    info = get_info_json(stanza=stanza, repo=repo, user=user)
+    status = get_wal_status(info, stanza=stanza, now=time(), port=port, user=db_user)
+    if status is None:
+        _LOGGER.info("Not backing up %r: no WAL replayed yet", stanza)
+        return
+    run, reason = status.decide(
+        now=time(),
+        threshold=threshold,
+        min_interval=min_interval,
+        max_per_day=max_per_day,
+    )
+    if not run:
+        _LOGGER.debug("Not backing up %r: %s", stanza, reason)
+        return
+    _LOGGER.info("Backing up %r: %s", stanza, reason)
+    backup(
+        stanza,
+        repo=repo,
+        type_=type_,
+        user=user,
+        print=False,
+        metrics_dir=metrics_dir,
+        port=port,
+    )
+
+
+##
+
+
+def make_backup_watch_cmd[T: str](
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @stanza_argument
+    @option(
+        "--threshold",
+        type=Str(),
+        default="16GB",
+        help="WAL since the last backup which triggers the next one",
+    )
+    @option("--interval", type=float, default=60.0, help="Seconds between checks")
+    @option(
+        "--min-interval",
+        type=float,
+        default=3600.0,
+        help="Minimum seconds between backups",
+    )
+    @option(
+        "--max-per-day", type=int, default=24, help="Maximum backups in any 24 hours"
+    )
+    @flag("--once", default=False, help="Check once and exit, e.g. from a timer")
+    @repo_option
+    @type_default_option
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @user_option
+    @option(
+        "--db-user", type=Str(), default="postgres", help="User to query the cluster as"
+    )
+    @metrics_dir_option
+    def func(
+        *,
+        stanza: str,
+        threshold: str,
+        interval: float,
+        min_interval: float,
+        max_per_day: int,
+        once: bool,
+        repo: RepoNumOrName[T] | None,
+        type_: BackupType,
+        port: int,
+        user: str | None,
+        db_user: str | None,
+        metrics_dir: PathLike | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        backup_watch(
+            stanza,
+            threshold=parse_memory(threshold),
+            interval=interval,
+            min_interval=min_interval,
+            max_per_day=max_per_day,
+            once=once,
+            repo=repo,
+            type_=type_,
+            port=port,
+            user=user,
+            db_user=db_user,
+            metrics_dir=metrics_dir,
+        )
+
+    return cli(
+        name=name,
+        help="Back up whenever enough WAL has been generated",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["backup_watch", "make_backup_watch_cmd"]
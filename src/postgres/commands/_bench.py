@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import socket
+from datetime import UTC, datetime
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import command
+from utilities.click import CONTEXT_SETTINGS, Enum, Str, flag, option
+from utilities.constants import CPU_COUNT
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._bench import (
+    BenchResult,
+    append_bench_history,
+    parse_pgbench_output,
+    percentile,
+    read_pgbench_latencies,
+)
+from postgres._constants import PORT
+from postgres._enums import BenchWorkload
+from postgres._utilities import run_or_as_user, run_psql
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from click import Command
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+_DEFAULT_CLIENTS = (1, 8, 32)
+_DEFAULT_WORKLOADS = (BenchWorkload.select_only, BenchWorkload.tpcb_like)
+
+
+##
+
+
+def bench(
+    *,
+    dbname: str = "pgbench",
+    scale: int = 10,
+    init: bool = True,
+    clients: Iterable[int] = _DEFAULT_CLIENTS,
+    workloads: Iterable[BenchWorkload] = _DEFAULT_WORKLOADS,
+    scripts: Iterable[PathLike] = (),
+    duration: int = 60,
+    history: PathLike | None = None,
+    label: str | None = None,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> list[BenchResult]:
+    """Run 'pgbench' workloads at several client counts on a local cluster."""
+    if init:
+        _init(dbname=dbname, scale=scale, port=port, user=user)
+    server_version = run_psql("SHOW server_version", port=port, user=user)
+    host = socket.gethostname()
+    timestamp = datetime.now(tz=UTC).isoformat()
+    runs: list[tuple[str, list[str]]] = [
+        (w.value, [f"--builtin={w.value}"]) for w in workloads
+    ]
+    runs.extend((Path(s).stem, [f"--file={s}"]) for s in scripts)
+    results: list[BenchResult] = []
+    for workload, workload_args in runs:
+        for clients_i in clients:
+            jobs = min(clients_i, CPU_COUNT)
+            output, latencies = _run(
+                workload,
+                *workload_args,
+                dbname=dbname,
+                clients=clients_i,
+                jobs=jobs,
+                duration=duration,
+                port=port,
+                user=user,
+            )
+            tps, latency_avg_ms, transactions = parse_pgbench_output(output)
+            result = BenchResult(
+                timestamp=timestamp,
+                host=host,
+                label=label,
+                server_version=server_version,
+                scale=scale,
+                workload=workload,
+                clients=clients_i,
+                jobs=jobs,
+                duration=duration,
+                transactions=transactions,
+                tps=tps,
+                latency_avg_ms=latency_avg_ms,
+                latency_p50_ms=percentile(latencies, 50),
+                latency_p95_ms=percentile(latencies, 95),
+                latency_p99_ms=percentile(latencies, 99),
+            )
+            _LOGGER.info("%s", result.text)
+            results.append(result)
+    if history is not None:
+        append_bench_history(results, path=history)
+    return results
+
+
+def _init(
+    *,
+    dbname: str = "pgbench",
+    scale: int = 10,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> None:
+    _LOGGER.info("Initializing %r at scale %d...", dbname, scale)
+    dbnames = run_psql("SELECT datname FROM pg_database", port=port, user=user)
+    if dbname not in dbnames.splitlines():
+        run_or_as_user("createdb", f"--port={port}", dbname, user=user)
+    run_or_as_user(
+        "pgbench",
+        f"--port={port}",
+        "--initialize",
+        f"--scale={scale}",
+        "--quiet",
+        dbname,
+        user=user,
+    )
+
+
+def _run(
+    workload: str,
+    /,
+    *args: str,
+    dbname: str = "pgbench",
+    clients: int = 1,
+    jobs: int = 1,
+    duration: int = 60,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> tuple[str, list[float]]:
+    _LOGGER.info("Running %r with %d client(s) for %ds...", workload, clients, duration)
+    log_dir = Path(mkdtemp(prefix="pgbench-"))
+    log_dir.chmod(0o777)  # the per-transaction logs are written by 'user'
+    try:
+        output = run_or_as_user(
+            "pgbench",
+            f"--port={port}",
+            f"--client={clients}",
+            f"--jobs={jobs}",
+            f"--time={duration}",
+            "--no-vacuum",
+            "--log",
+            f"--log-prefix={log_dir / 'pgbench_log'}",
+            *args,
+            dbname,
+            user=user,
+            return_stdout=True,
+        )
+        latencies = read_pgbench_latencies(sorted(log_dir.iterdir()))
+    finally:
+        rmtree(log_dir, ignore_errors=True)
+    return output, latencies
+
+
+##
+
+
+def make_bench_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @option("--dbname", type=Str(), default="pgbench", help="Benchmark database")
+    @option("--scale", type=int, default=10, help="pgbench scale factor")
+    @flag("--init", default=True, help="Initialize the pgbench tables first")
+    @option(
+        "--clients",
+        type=int,
+        multiple=True,
+        default=_DEFAULT_CLIENTS,
+        help="Client count to run each workload at",
+    )
+    @option(
+        "--workload",
+        type=Enum(BenchWorkload),
+        multiple=True,
+        default=_DEFAULT_WORKLOADS,
+        help="Built-in workload",
+    )
+    @option(
+        "--script",
+        type=utilities.click.Path(exist="file if exists"),
+        multiple=True,
+        help="Custom pgbench script",
+    )
+    @option("--duration", type=int, default=60, help="Seconds per run")
+    @option(
+        "--history",
+        type=utilities.click.Path(),
+        default=None,
+        help="JSON lines file to append the results to",
+    )
+    @option(
+        "--label",
+        type=Str(),
+        default=None,
+        help="Label for the results, e.g. the config profile under test",
+    )
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    def func(
+        *,
+        dbname: str,
+        scale: int,
+        init: bool,
+        clients: tuple[int, ...],
+        workload: tuple[BenchWorkload, ...],
+        script: tuple[PathLike, ...],
+        duration: int,
+        history: PathLike | None,
+        label: str | None,
+        port: int,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = bench(
+            dbname=dbname,
+            scale=scale,
+            init=init,
+            clients=clients,
+            workloads=workload,
+            scripts=script,
+            duration=duration,
+            history=history,
+            label=label,
+            port=port,
+        )
+
+    return cli(
+        name=name, help="Benchmark a local cluster with 'pgbench'", **CONTEXT_SETTINGS
+    )(func)
+
+
+__all__ = ["bench", "make_bench_cmd"]
@@ -7,13 +7,15 @@ from utilities.click import CONTEXT_SETTINGS
 from utilities.core import is_pytest, set_up_logging, to_logger
 
 from postgres import __version__
-from postgres._click import print_option, stanza_option, user_option
+from postgres._click import metrics_dir_option, print_option, stanza_option, user_option
+from postgres._metrics import yield_metrics
 from postgres._utilities import run_or_as_user
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from click import Command
+    from utilities.types import PathLike
 
 
 _LOGGER = to_logger(__name__)
@@ -27,12 +29,15 @@ def check(
     stanza: str | None = None,
     user: str | None = None,
     print: bool = True,  # noqa: A002
+    metrics_dir: PathLike | None = None,
 ) -> None:
     _LOGGER.info("Checking configuration...")
     args: list[str] = ["pgbackrest"]
     if stanza is not None:
         args.append(f"--stanza={stanza}")
-    run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
+    args.append("check")
+    with yield_metrics("check", path=metrics_dir, stanza=stanza, user=user):
+        run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
     _LOGGER.info("Finished checking configuration")
 
 
@@ -45,16 +50,18 @@ def make_check_cmd(
     @stanza_option
     @user_option
     @print_option
+    @metrics_dir_option
     def func(
         *,
         stanza: str | None,
         user: str | None,
         print: bool,  # noqa: A002
+        metrics_dir: PathLike | None,
     ) -> None:
         if is_pytest():
             return
         set_up_logging(__name__, root=True, log_version=__version__)
-        check(stanza=stanza, user=user, print=print)
+        check(stanza=stanza, user=user, print=print, metrics_dir=metrics_dir)
 
     return cli(name=name, help="Check the configuration", **CONTEXT_SETTINGS)(func)
 
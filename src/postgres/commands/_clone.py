@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import command
+from installer import root_option, sudo_option
+from utilities.click import CONTEXT_SETTINGS, Str, argument, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+from utilities.subprocess import copy_text, run
+
+from postgres import __version__
+from postgres._click import (
+    print_option,
+    process_max_option,
+    repo_option,
+    stanza_argument,
+    version_option,
+)
+from postgres._clones import (
+    find_free_port,
+    get_cluster_ports,
+    prune_clones,
+    read_clones,
+    to_clone_spec,
+    write_clones,
+)
+from postgres._constants import CLONE_TTL, PATH_CONFIGS, PROCESS_MAX, VERSION
+from postgres._utilities import (
+    drop_cluster,
+    get_pg_data,
+    get_pg_root,
+    run_or_as_user,
+    to_repo_num,
+)
+from postgres.commands._restore import _start_cluster
+from postgres.commands._set_up import _create_cluster, _set_up_pg_hba
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+    from postgres._clones import CloneSpec
+    from postgres._types import RepoNameMapping, RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def clone[T: str](
+    stanza: str,
+    name: str,
+    /,
+    *,
+    version: int = VERSION,
+    port: int | None = None,
+    path: PathLike | None = None,
+    ttl: timedelta = CLONE_TTL,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    set_: str | None = None,
+    process_max: int = PROCESS_MAX,
+    root: PathLike | None = None,
+    sudo: bool = False,
+    print: bool = True,  # noqa: A002
+) -> CloneSpec:
+    """Restore a stanza into a throwaway cluster."""
+    _ = prune_clones(root=root, sudo=sudo)
+    if any(c.name == name for c in read_clones(root=root)):
+        msg = f"Clone {name!r} already exists"
+        raise ValueError(msg)
+    port_use = find_free_port(used=get_cluster_ports()) if port is None else port
+    datadir = (
+        get_pg_data(name, version=version, root=root)
+        if path is None
+        else Path(path, f"{version}-{name}")
+    )
+    _LOGGER.info("Cloning %r into %r on port %d...", stanza, name, port_use)
+    spec = to_clone_spec(
+        name, stanza, version=version, port=port_use, datadir=datadir, ttl=ttl
+    )
+    try:
+        _create_cluster(
+            name, version=version, port=port_use, datadir=datadir, sudo=sudo
+        )
+        _set_up_pg_hba(name, version=version, root=root, sudo=sudo)
+        copy_text(
+            PATH_CONFIGS / "clone.conf",
+            get_pg_root(root=root, version=version, name=name) / "conf.d/clone.conf",
+            sudo=sudo,
+            perms="u=rw,g=r,o=r",
+        )
+        run("find", str(datadir), "-mindepth", "1", "-delete")
+        _run_clone_restore(
+            stanza,
+            datadir=datadir,
+            repo=repo,
+            repo_mapping=repo_mapping,
+            set_=set_,
+            process_max=process_max,
+            print=print,
+        )
+        _start_cluster(name, version=version, port=port_use, sudo=sudo)
+    except BaseException:
+        _LOGGER.warning("Failed to clone %r into %r; dropping it...", stanza, name)
+        drop_cluster(name, version=version, sudo=sudo)
+        raise
+    write_clones([*read_clones(root=root), spec], root=root)
+    _LOGGER.info(
+        "Finished cloning %r into %r on port %d (expires %s)",
+        stanza,
+        name,
+        port_use,
+        spec.expires,
+    )
+    return spec
+
+
+def _run_clone_restore[T: str](
+    stanza: str,
+    /,
+    *,
+    datadir: PathLike,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    set_: str | None = None,
+    process_max: int = PROCESS_MAX,
+    print: bool = True,  # noqa: A002
+) -> None:
+    args: list[str] = ["pgbackrest"]
+    if repo is not None:
+        args.append(f"--repo={to_repo_num(repo=repo, mapping=repo_mapping)}")
+    if set_ is not None:
+        args.append(f"--set={set_}")
+    args.extend([
+        f"--stanza={stanza}",
+        f"--pg1-path={datadir}",
+        f"--process-max={process_max}",
+        "--archive-mode=off",
+        "--type=immediate",
+        "--target-action=promote",
+        "restore",
+    ])
+    run_or_as_user(*args, user="postgres", print=print, logger=_LOGGER)
+
+
+##
+
+
+def make_clone_cmd[T: str](
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @stanza_argument
+    @argument("name", type=Str())
+    @version_option
+    @option("--port", type=int, default=None, help="Clone port; defaults to a free one")
+    @option(
+        "--path",
+        type=utilities.click.Path(exist="dir if exists"),
+        default=None,
+        help="Parent directory for the clone's data, e.g. a tmpfs or reflink volume",
+    )
+    @option("--ttl", type=float, default=24.0, help="Hours until the clone is dropped")
+    @repo_option
+    @option(
+        "--set", "set_", type=Str(), default=None, help="Backup set; defaults to latest"
+    )
+    @process_max_option
+    @root_option
+    @sudo_option
+    @print_option
+    def func(
+        *,
+        stanza: str,
+        name: str,
+        version: int,
+        port: int | None,
+        path: PathLike | None,
+        ttl: float,
+        repo: RepoNumOrName[T] | None,
+        set_: str | None,
+        process_max: int,
+        root: PathLike | None,
+        sudo: bool,
+        print: bool,  # noqa: A002
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = clone(
+            stanza,
+            name,
+            version=version,
+            port=port,
+            path=path,
+            ttl=timedelta(hours=ttl),
+            repo=repo,
+            set_=set_,
+            process_max=process_max,
+            root=root,
+            sudo=sudo,
+            print=print,
+        )
+
+    return cli(
+        name=name, help="Restore a stanza into a throwaway cluster", **CONTEXT_SETTINGS
+    )(func)
+
+
+##
+
+
+def make_prune_clones_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @root_option
+    @sudo_option
+    def func(*, root: PathLike | None, sudo: bool) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = prune_clones(root=root, sudo=sudo)
+
+    return cli(name=name, help="Drop clones whose TTL has expired", **CONTEXT_SETTINGS)(
+        func
+    )
+
+
+__all__ = ["clone", "make_clone_cmd", "make_prune_clones_cmd"]
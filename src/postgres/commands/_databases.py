@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click import command
+from utilities.click import CONTEXT_SETTINGS, Str, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._click import (
+    db_exclude_option,
+    db_include_option,
+    repo_option,
+    stanza_argument,
+    user_option,
+)
+from postgres._databases import format_database_sizes, get_database_sizes
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import MaybeIterable
+
+    from postgres._databases import DatabaseSize
+    from postgres._types import RepoNameMapping, RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def databases[T: str](
+    stanza: str,
+    /,
+    *,
+    set_: str | None = None,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    db_include: MaybeIterable[str] | None = None,
+    db_exclude: MaybeIterable[str] | None = None,
+    user: str | None = None,
+) -> list[DatabaseSize]:
+    _LOGGER.info("Listing databases...")
+    sizes = get_database_sizes(
+        stanza, set_=set_, repo=repo, repo_mapping=repo_mapping, user=user
+    )
+    text = format_database_sizes(sizes, include=db_include, exclude=db_exclude)
+    for line in text.splitlines():
+        _LOGGER.info("%s", line)
+    _LOGGER.info("Finished listing databases")
+    return sizes
+
+
+##
+
+
+def make_databases_cmd[T: str](
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @stanza_argument
+    @option(
+        "--set", "set_", type=Str(), default=None, help="Backup set; defaults to latest"
+    )
+    @repo_option
+    @db_include_option
+    @db_exclude_option
+    @user_option
+    def func(
+        *,
+        stanza: str,
+        set_: str | None,
+        repo: RepoNumOrName[T] | None,
+        db_include: tuple[str, ...],
+        db_exclude: tuple[str, ...],
+        user: str | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = databases(
+            stanza,
+            set_=set_,
+            repo=repo,
+            db_include=db_include,
+            db_exclude=db_exclude,
+            user=user,
+        )
+
+    return cli(
+        name=name,
+        help="List the databases in a backup and their sizes",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["databases", "make_databases_cmd"]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import command
+from utilities.click import CONTEXT_SETTINGS, Enum, Str, argument, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._click import jobs_option, print_option, user_option
+from postgres._constants import JOBS, PORT
+from postgres._enums import DEFAULT_DUMP_FORMAT, DumpFormat
+from postgres._logical import run_with_table_timings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def dump(
+    dbname: str,
+    path: PathLike,
+    /,
+    *,
+    format: DumpFormat = DEFAULT_DUMP_FORMAT,  # noqa: A002
+    jobs: int = JOBS,
+    compress: str | None = None,
+    port: int = PORT,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+) -> dict[str, float]:
+    """Dump a database with 'pg_dump', in parallel for the directory format."""
+    path = Path(path).resolve()  # 'su -' changes directory
+    parallel = (format is DumpFormat.directory) and (jobs >= 2)
+    _LOGGER.info(
+        "Dumping %r to %r (%s format, %d job(s))...",
+        dbname,
+        str(path),
+        format.value,
+        jobs if parallel else 1,
+    )
+    args: list[str] = [
+        f"--port={port}",
+        f"--dbname={dbname}",
+        f"--format={format.flag}",
+        f"--file={path}",
+    ]
+    if parallel:
+        args.append(f"--jobs={jobs}")
+    if compress is not None:
+        args.append(f"--compress={compress}")
+    timings = run_with_table_timings(
+        "pg_dump", *args, parallel=parallel, user=user, print=print
+    )
+    _LOGGER.info("Finished dumping %r to %r", dbname, str(path))
+    return timings
+
+
+##
+
+
+def make_dump_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @argument("dbname", type=Str())
+    @argument("path", type=utilities.click.Path())
+    @option(
+        "--format",
+        type=Enum(DumpFormat),
+        default=DEFAULT_DUMP_FORMAT,
+        help="Directory (parallel) or custom (single compressed archive)",
+    )
+    @jobs_option
+    @option(
+        "--compress",
+        type=Str(),
+        default=None,
+        help="Compression method and/or level, e.g. 'zstd:3'",
+    )
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @user_option
+    @print_option
+    def func(
+        *,
+        dbname: str,
+        path: PathLike,
+        format: DumpFormat,  # noqa: A002
+        jobs: int,
+        compress: str | None,
+        port: int,
+        user: str | None,
+        print: bool,  # noqa: A002
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = dump(
+            dbname,
+            path,
+            format=format,
+            jobs=jobs,
+            compress=compress,
+            port=port,
+            user=user,
+            print=print,
+        )
+
+    return cli(name=name, help="Dump a database with 'pg_dump'", **CONTEXT_SETTINGS)(
+        func
+    )
+
+
+__all__ = ["dump", "make_dump_cmd"]
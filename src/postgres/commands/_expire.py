@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click import command
+from utilities.click import CONTEXT_SETTINGS
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._click import (
+    metrics_dir_option,
+    print_option,
+    repo_option,
+    stanza_argument,
+    user_option,
+)
+from postgres._metrics import yield_metrics
+from postgres._utilities import run_or_as_user, to_repo_num
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+    from postgres._types import RepoNameMapping, RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def expire[T: str](
+    stanza: str,
+    /,
+    *,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+    metrics_dir: PathLike | None = None,
+) -> None:
+    args: list[str] = ["pgbackrest"]
+    if repo is None:
+        _LOGGER.info("Expiring %r backups in all repos...", stanza)
+        repo_num = None
+    else:
+        _LOGGER.info("Expiring %r backups in repo %r...", stanza, repo)
+        repo_num = to_repo_num(repo=repo, mapping=repo_mapping)
+        args.append(f"--repo={repo_num}")
+    args.extend([f"--stanza={stanza}", "expire"])
+    with yield_metrics(
+        "expire", path=metrics_dir, stanza=stanza, repo=repo_num, user=user
+    ):
+        run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
+    _LOGGER.info("Finished expiring %r backups", stanza)
+
+
+##
+
+
+def make_expire_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @stanza_argument
+    @repo_option
+    @user_option
+    @print_option
+    @metrics_dir_option
+    def func[T: str](
+        *,
+        stanza: str,
+        repo: RepoNumOrName[T] | None,
+        user: str | None,
+        print: bool,  # noqa: A002
+        metrics_dir: PathLike | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        expire(stanza, repo=repo, user=user, print=print, metrics_dir=metrics_dir)
+
+    return cli(
+        name=name, help="Expire backups per the retention policy", **CONTEXT_SETTINGS
+    )(func)
+
+
+__all__ = ["expire", "make_expire_cmd"]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from json import dumps
+from pathlib import Path
+from typing import TYPE_CHECKING, assert_never
+
+import utilities.click
+from click import command
+from installer import root_option
+from utilities.click import CONTEXT_SETTINGS, Enum, argument, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._click import jobs_option, type_default_option, user_option
+from postgres._constants import JOBS
+from postgres._enums import DEFAULT_BACKUP_TYPE, FleetAction
+from postgres._fleet import (
+    format_fleet_results,
+    read_inventory,
+    run_fleet,
+    summarize_info,
+)
+from postgres._utilities import get_info_json
+from postgres.commands._backup import backup
+from postgres.commands._check import check
+from postgres.commands._start import start
+from postgres.commands._stop import stop
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+    from postgres._enums import BackupType
+    from postgres._fleet import FleetMember, FleetResult
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def fleet(
+    action: FleetAction,
+    /,
+    *,
+    inventory: PathLike | None = None,
+    root: PathLike | None = None,
+    jobs: int = JOBS,
+    type_: BackupType = DEFAULT_BACKUP_TYPE,
+    user: str | None = None,
+    json_path: PathLike | None = None,
+) -> list[FleetResult]:
+    """Run an action across every cluster and stanza in the inventory."""
+    members = read_inventory(inventory, root=root)
+    _LOGGER.info(
+        "Running %r across %d member(s) with %d job(s)...",
+        action.value,
+        len(members),
+        jobs,
+    )
+
+    def func(member: FleetMember, /) -> str:
+        match action:
+            case FleetAction.check:
+                check(stanza=member.stanza, user=user, print=False)
+            case FleetAction.info:
+                info = get_info_json(stanza=member.stanza, user=user)
+                return summarize_info(info, stanza=member.stanza)
+            case FleetAction.backup:
+                backup(
+                    member.stanza,
+                    repo=None if len(member.repos) == 0 else member.repos,
+                    type_=type_,
+                    user=user,
+                    print=False,
+                    version=member.version,
+                    port=member.port,
+                )
+            case FleetAction.start:
+                start(stanza=member.stanza, user=user, print=False)
+            case FleetAction.stop:
+                stop(stanza=member.stanza, user=user, print=False)
+            case never:
+                assert_never(never)
+        return ""
+
+    results = run_fleet(members, func, action=action, jobs=jobs)
+    for line in format_fleet_results(results).splitlines():
+        _LOGGER.info("%s", line)
+    if json_path is not None:
+        text = dumps([r.to_json() for r in results], indent=2)
+        _ = Path(json_path).write_text(f"{text}\n")
+        _LOGGER.info("Wrote results to %r", str(json_path))
+    return results
+
+
+##
+
+
+def make_fleet_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @argument("action", type=Enum(FleetAction))
+    @option(
+        "--inventory",
+        type=utilities.click.Path(exist="file if exists"),
+        default=None,
+        help="Inventory file; defaults to '/etc/pgbackrest/inventory.json'",
+    )
+    @root_option
+    @jobs_option
+    @type_default_option
+    @user_option
+    @option(
+        "--json",
+        "json_path",
+        type=utilities.click.Path(),
+        default=None,
+        help="File to write the results to as JSON",
+    )
+    def func(
+        *,
+        action: FleetAction,
+        inventory: PathLike | None,
+        root: PathLike | None,
+        jobs: int,
+        type_: BackupType,
+        user: str | None,
+        json_path: PathLike | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        results = fleet(
+            action,
+            inventory=inventory,
+            root=root,
+            jobs=jobs,
+            type_=type_,
+            user=user,
+            json_path=json_path,
+        )
+        failed = [r.member.name for r in results if not r.ok]
+        if len(failed) >= 1:
+            msg = f"{action.value!r} failed on {', '.join(failed)}"
+            raise RuntimeError(msg)
+
+    return cli(
+        name=name,
+        help="Run check/info/backup/start/stop across the inventory",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["fleet", "make_fleet_cmd"]
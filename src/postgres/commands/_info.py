@@ -49,6 +49,7 @@ def info[T: str](
         args.append(f"--stanza={stanza}")
     if type_ is not None:
         args.append(f"--type={type_.value}")
+    args.append("info")
     run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
     _LOGGER.info("Finished getting info")
 
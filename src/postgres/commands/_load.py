@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import command
+from utilities.click import CONTEXT_SETTINGS, Str, argument, flag, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._click import jobs_option, print_option, user_option
+from postgres._constants import JOBS, PORT
+from postgres._logical import run_with_table_timings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def load(
+    dbname: str,
+    path: PathLike,
+    /,
+    *,
+    jobs: int = JOBS,
+    create: bool = False,
+    clean: bool = False,
+    port: int = PORT,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+) -> dict[str, float]:
+    """Load a dump into a database with 'pg_restore', in parallel."""
+    path = Path(path).resolve()  # 'su -' changes directory
+    _LOGGER.info("Loading %r into %r (%d job(s))...", str(path), dbname, jobs)
+    args: list[str] = [f"--port={port}", f"--dbname={dbname}", f"--jobs={jobs}"]
+    if create:
+        args.append("--create")
+    if clean:
+        args.extend(["--clean", "--if-exists"])
+    args.append(str(path))
+    timings = run_with_table_timings(
+        "pg_restore", *args, parallel=jobs >= 2, user=user, print=print
+    )
+    _LOGGER.info("Finished loading %r into %r", str(path), dbname)
+    return timings
+
+
+##
+
+
+def make_load_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @argument("dbname", type=Str())
+    @argument("path", type=utilities.click.Path())
+    @jobs_option
+    @flag(
+        "--create",
+        default=False,
+        help="Create the dumped database, connecting to DBNAME first",
+    )
+    @flag("--clean", default=False, help="Drop objects before recreating them")
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @user_option
+    @print_option
+    def func(
+        *,
+        dbname: str,
+        path: PathLike,
+        jobs: int,
+        create: bool,
+        clean: bool,
+        port: int,
+        user: str | None,
+        print: bool,  # noqa: A002
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = load(
+            dbname,
+            path,
+            jobs=jobs,
+            create=create,
+            clean=clean,
+            port=port,
+            user=user,
+            print=print,
+        )
+
+    return cli(
+        name=name,
+        help="Load a dump into a database with 'pg_restore'",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["load", "make_load_cmd"]
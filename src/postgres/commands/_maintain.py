@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import command
+from utilities.click import CONTEXT_SETTINGS, Str, flag, option
+from utilities.core import always_iterable, is_pytest, set_up_logging, to_logger
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import __version__
+from postgres._click import jobs_option, user_option
+from postgres._constants import JOBS, PORT
+from postgres._maintain import (
+    get_bloat_estimates,
+    group_by_table,
+    maintain_relation,
+    read_maintain_state,
+    select_bloated,
+    write_maintain_state,
+)
+from postgres._progress import format_bytes
+from postgres._utilities import run_psql
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import MaybeIterable, PathLike
+
+    from postgres._maintain import BloatEstimate, MaintenanceResult
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def maintain(
+    *,
+    dbname: MaybeIterable[str] | None = None,
+    min_ratio: float = 0.2,
+    min_bloat: int = 10 * 1024**2,
+    limit: int | None = None,
+    jobs: int = JOBS,
+    parallel: int | None = None,
+    budget: float | None = 3600.0,
+    dry_run: bool = False,
+    state: PathLike | None = None,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> list[MaintenanceResult]:
+    """Vacuum bloated tables and rebuild bloated indexes, worst first.
+
+    Up to 'jobs' tables are maintained at once; no further relation is started
+    once 'budget' seconds have passed. Relations recorded in 'state' are not
+    picked again until their size or their table's modifications change.
+    """
+    if dbname is None:
+        dbnames = run_psql(
+            "SELECT datname FROM pg_database WHERE datallowconn AND NOT datistemplate",
+            port=port,
+            user=user,
+        ).splitlines()
+    else:
+        dbnames = list(always_iterable(dbname))
+    _LOGGER.info("Estimating bloat in %d database(s)...", len(dbnames))
+    estimates = [
+        e for d in dbnames for e in get_bloat_estimates(dbname=d, port=port, user=user)
+    ]
+    maintained = {} if state is None else read_maintain_state(state)
+    bloated = select_bloated(
+        estimates,
+        min_ratio=min_ratio,
+        min_bloat=min_bloat,
+        limit=limit,
+        maintained=maintained,
+    )
+    _LOGGER.info("Found %d bloated relation(s) out of %d", len(bloated), len(estimates))
+    for estimate in bloated:
+        _LOGGER.info("%s", estimate.text)
+    if dry_run or (len(bloated) == 0):
+        return []
+    start = monotonic()
+
+    def run_group(group: list[BloatEstimate], /) -> list[MaintenanceResult]:
+        results: list[MaintenanceResult] = []
+        for estimate in group:
+            if (budget is not None) and (monotonic() - start >= budget):
+                _LOGGER.warning("Time budget spent; skipping %s", estimate.text)
+                continue
+            try:
+                result = maintain_relation(
+                    estimate, parallel=parallel, port=port, user=user
+                )
+            except RunCalledProcessError:
+                _LOGGER.warning("Failed to maintain %s", estimate.text)
+            else:
+                results.append(result)
+        return results
+
+    groups = group_by_table(bloated)
+    with ThreadPoolExecutor(max_workers=max(min(jobs, len(groups)), 1)) as pool:
+        results = [r for rs in pool.map(run_group, groups) for r in rs]
+    reclaimed = sum(r.reclaimed for r in results)
+    _LOGGER.info(
+        "Maintained %d relation(s) in %.1fs, reclaiming %s",
+        len(results),
+        monotonic() - start,
+        format_bytes(reclaimed),
+    )
+    if state is not None:
+        for result in results:
+            maintained[result.estimate.key] = {
+                "size": result.size_after,
+                "changes": result.changes_after,
+            }
+        write_maintain_state(maintained, path=state)
+    return results
+
+
+##
+
+
+def make_maintain_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @option(
+        "--dbname",
+        type=Str(),
+        multiple=True,
+        help="Database to maintain; defaults to all of them",
+    )
+    @option(
+        "--min-ratio",
+        type=float,
+        default=0.2,
+        help="Minimum estimated fraction of a relation that is bloat",
+    )
+    @option(
+        "--min-bloat",
+        type=int,
+        default=10 * 1024**2,
+        help="Minimum estimated bloat in bytes",
+    )
+    @option("--limit", type=int, default=None, help="Max relations to maintain")
+    @jobs_option
+    @option(
+        "--parallel",
+        type=int,
+        default=None,
+        help="Parallel workers per 'VACUUM'; defaults to the server's choice",
+    )
+    @option(
+        "--budget",
+        type=float,
+        default=3600.0,
+        help="Seconds after which no further relation is started",
+    )
+    @flag("--dry-run", default=False, help="Only report the bloat estimates")
+    @option(
+        "--state",
+        type=utilities.click.Path(),
+        default=None,
+        help="JSON file recording the relations maintained and their stats",
+    )
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @user_option
+    def func(
+        *,
+        dbname: tuple[str, ...],
+        min_ratio: float,
+        min_bloat: int,
+        limit: int | None,
+        jobs: int,
+        parallel: int | None,
+        budget: float,
+        dry_run: bool,
+        state: PathLike | None,
+        port: int,
+        user: str | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = maintain(
+            dbname=None if len(dbname) == 0 else dbname,
+            min_ratio=min_ratio,
+            min_bloat=min_bloat,
+            limit=limit,
+            jobs=jobs,
+            parallel=parallel,
+            budget=budget,
+            dry_run=dry_run,
+            state=state,
+            port=port,
+            user=user,
+        )
+
+    return cli(
+        name=name,
+        help="Vacuum bloated tables and rebuild bloated indexes",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["maintain", "make_maintain_cmd"]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click import command
+from installer import sudo_option
+from utilities.click import CONTEXT_SETTINGS, Enum, argument, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+from utilities.subprocess import maybe_sudo_cmd, run
+
+from postgres import __version__
+from postgres._constants import POOLER_PORT
+from postgres._enums import PoolerAction
+from postgres._utilities import run_or_as_user
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def pooler(
+    action: PoolerAction, /, *, pooler_port: int = POOLER_PORT, sudo: bool = False
+) -> str | None:
+    """Start, stop, restart or reload PgBouncer, or get the status of its pools."""
+    if action is PoolerAction.status:
+        return run_or_as_user(
+            "psql",
+            f"--port={pooler_port}",
+            "--dbname=pgbouncer",
+            "--command=SHOW POOLS",
+            user="postgres",
+            return_stdout=True,
+        )
+    _LOGGER.info("Running 'pgbouncer' %s...", action.value)
+    run(*maybe_sudo_cmd("systemctl", action.value, "pgbouncer", sudo=sudo))
+    return None
+
+
+##
+
+
+def make_pooler_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @argument("action", type=Enum(PoolerAction))
+    @option("--pooler-port", type=int, default=POOLER_PORT, help="Pooler port")
+    @sudo_option
+    def func(*, action: PoolerAction, pooler_port: int, sudo: bool) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        output = pooler(action, pooler_port=pooler_port, sudo=sudo)
+        if output is not None:
+            for line in output.splitlines():
+                _LOGGER.info("%s", line)
+
+    return cli(
+        name=name,
+        help="Start, stop, restart or reload 'pgbouncer', or show its pools",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["make_pooler_cmd", "pooler"]
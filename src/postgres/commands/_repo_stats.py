@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click import command
+from utilities.click import CONTEXT_SETTINGS, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._click import repo_option, stanza_option, user_option
+from postgres._repo_stats import compute_repo_stats, format_repo_stats
+from postgres._utilities import get_info_json, to_repo_num
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+
+    from postgres._repo_stats import RepoStats
+    from postgres._types import RepoNameMapping, RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def repo_stats[T: str](
+    *,
+    stanza: str | None = None,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    retention_full: int | None = None,
+    retention_diff: int | None = None,
+    user: str | None = None,
+) -> list[RepoStats]:
+    """Report storage use per stanza and repo, and project it under retention."""
+    _LOGGER.info("Computing repo statistics...")
+    info = get_info_json(stanza=stanza, repo=repo, repo_mapping=repo_mapping, user=user)
+    repo_num = None if repo is None else to_repo_num(repo=repo, mapping=repo_mapping)
+    stats = compute_repo_stats(info, repo=repo_num)
+    for stats_i in stats:
+        text = format_repo_stats(
+            stats_i, retention_full=retention_full, retention_diff=retention_diff
+        )
+        for line in text.splitlines():
+            _LOGGER.info("%s", line)
+    _LOGGER.info("Finished computing repo statistics")
+    return stats
+
+
+##
+
+
+def make_repo_stats_cmd[T: str](
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @stanza_option
+    @repo_option
+    @option(
+        "--retention-full",
+        type=int,
+        default=None,
+        help="Full backups to project for; defaults to the number present",
+    )
+    @option(
+        "--retention-diff",
+        type=int,
+        default=None,
+        help="Differential backups to project for; defaults to the number present",
+    )
+    @user_option
+    def func(
+        *,
+        stanza: str | None,
+        repo: RepoNumOrName[T] | None,
+        retention_full: int | None,
+        retention_diff: int | None,
+        user: str | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = repo_stats(
+            stanza=stanza,
+            repo=repo,
+            retention_full=retention_full,
+            retention_diff=retention_diff,
+            user=user,
+        )
+
+    return cli(
+        name=name,
+        help="Report repo storage use and project its growth",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["make_repo_stats_cmd", "repo_stats"]
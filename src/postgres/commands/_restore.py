@@ -1,30 +1,65 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+import utilities.click
 from click import Command, command
-from installer import get_root
-from utilities.click import CONTEXT_SETTINGS, Str, argument, option
-from utilities.core import is_pytest, set_up_logging, to_logger
-from utilities.subprocess import run
-from utilities.types import PathLike
+from installer import sudo_option
+from utilities.click import CONTEXT_SETTINGS, Str, argument, flag, option
+from utilities.core import always_iterable, is_pytest, set_up_logging, to_logger
+from utilities.subprocess import RunCalledProcessError, maybe_sudo_cmd, run
 
 from postgres import __version__
+from postgres._basebackup import combine_backup
 from postgres._click import (
+    db_exclude_option,
+    db_include_option,
+    engine_option,
+    jobs_option,
+    metrics_dir_option,
     print_option,
+    process_max_option,
+    progress_option,
     repo_option,
     stanza_argument,
     user_option,
     version_option,
 )
-from postgres._constants import VERSION
-from postgres._utilities import run_or_as_user, to_repo_num
+from postgres._constants import JOBS, PORT, VERSION
+from postgres._databases import format_database_sizes, get_database_sizes
+from postgres._enums import DEFAULT_BACKUP_ENGINE, BackupEngine
+from postgres._metrics import yield_metrics
+from postgres._progress import log_progress, run_with_progress
+from postgres._recovery import get_archive_max_lsn, wait_until_ready
+from postgres._recovery_profile import (
+    RecoveryProfile,
+    apply_recovery_profile,
+    revert_recovery_profile,
+)
+from postgres._restore_estimate import (
+    estimate_restores,
+    format_restore_estimates,
+    read_run_history,
+    record_run,
+)
+from postgres._utilities import (
+    get_info_json,
+    get_pg_data,
+    get_restore_set,
+    run_or_as_user,
+    to_path_map,
+    to_repo_num,
+)
+from postgres._warm_up import save_hot_relations, warm_up
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Mapping
 
-    from utilities.types import PathLike
+    from utilities.types import MaybeIterable, PathLike
 
+    from postgres._progress import ProgressCallback
+    from postgres._restore_estimate import RestoreEstimate
     from postgres._types import RepoNameMapping, RepoNumOrName
 
 
@@ -45,33 +80,260 @@ def restore[T: str](
     target_timeline: int | None = None,
     user: str | None = None,
     print: bool = True,  # noqa: A002
+    metrics_dir: PathLike | None = None,
+    progress: ProgressCallback | None = None,
+    engine: BackupEngine = DEFAULT_BACKUP_ENGINE,
+    path: PathLike | None = None,
+    label: str | None = None,
+    port: int = PORT,
+    analyze: bool = False,
+    jobs: int = JOBS,
+    prewarm: PathLike | None = None,
+    recovery_profile: RecoveryProfile | None = None,
+    db_include: MaybeIterable[str] | None = None,
+    db_exclude: MaybeIterable[str] | None = None,
+    tablespace_map: Mapping[str, PathLike] | None = None,
+    link_map: Mapping[str, PathLike] | None = None,
+    link_all: bool = False,
+    estimate: bool = False,
+    history: PathLike | None = None,
+    sudo: bool = False,
 ) -> None:
+    if estimate:
+        if engine is not BackupEngine.pgbackrest:
+            msg = f"Expected the 'pgbackrest' engine to estimate; got {engine.value!r}"
+            raise ValueError(msg)
+        _ = estimate_restore(
+            stanza, repo=repo, repo_mapping=repo_mapping, history=history, user=user
+        )
+        return
     _LOGGER.info("Restoring Postgres...")
-    _stop_cluster(cluster, version=version)
-    _delete_data(cluster, version=version)
-    _run_restore(
-        stanza,
-        repo=repo,
-        repo_mapping=repo_mapping,
-        target_timeline=target_timeline,
+    if (engine is BackupEngine.pg_basebackup) and (path is None):
+        msg = f"Expected 'path' for the {engine.value!r} engine"
+        raise ValueError(msg)
+    if (db_include is not None) or (db_exclude is not None):
+        _log_selection(
+            stanza,
+            repo=repo,
+            repo_mapping=repo_mapping,
+            db_include=db_include,
+            db_exclude=db_exclude,
+            user=user,
+        )
+    if prewarm is not None:
+        save_hot_relations(prewarm, port=port)
+    target_lsn: int | None = None
+    plan: RestoreEstimate | None = None
+    if engine is BackupEngine.pgbackrest:
+        target_lsn = get_archive_max_lsn(
+            stanza, repo=repo, repo_mapping=repo_mapping, user=user
+        )
+        plan = _get_plan(stanza, repo=repo, repo_mapping=repo_mapping, user=user)
+    selective = (db_include is not None) or (db_exclude is not None)
+    with yield_metrics(
+        "restore",
+        path=metrics_dir,
+        stanza=stanza,
+        repo=None if repo is None else to_repo_num(repo=repo, mapping=repo_mapping),
         user=user,
-        print=print,
-    )
-    _start_cluster(cluster, version=version)
+        sizes=engine is BackupEngine.pgbackrest,
+    ):
+        _stop_cluster(cluster, version=version, sudo=sudo)
+        _delete_data(
+            cluster,
+            version=version,
+            sudo=sudo,
+            tablespaces=[] if tablespace_map is None else tablespace_map.values(),
+            links=[] if link_map is None else link_map.values(),
+        )
+        if recovery_profile is not None:
+            apply_recovery_profile(recovery_profile, cluster, version=version)
+        try:
+            if (engine is BackupEngine.pg_basebackup) and (path is not None):
+                combine_backup(
+                    stanza,
+                    path=path,
+                    output=get_pg_data(cluster, version=version),
+                    label=label,
+                    version=version,
+                    user=user,
+                    sudo=sudo,
+                    print=print,
+                )
+            else:
+                with record_run(
+                    "restore",
+                    stanza=stanza,
+                    estimate=None if selective else plan,
+                    path=history,
+                ):
+                    _run_restore(
+                        stanza,
+                        repo=repo,
+                        repo_mapping=repo_mapping,
+                        target_timeline=target_timeline,
+                        user=user,
+                        print=print,
+                        progress=progress,
+                        db_include=db_include,
+                        db_exclude=db_exclude,
+                        tablespace_map=tablespace_map,
+                        link_map=link_map,
+                        link_all=link_all,
+                        recovery_options=None
+                        if recovery_profile is None
+                        else {
+                            "restore_command": recovery_profile.restore_command(stanza)
+                        },
+                    )
+            with record_run("replay", stanza=stanza, estimate=plan, path=history):
+                _start_cluster(
+                    cluster,
+                    version=version,
+                    port=port,
+                    target_lsn=target_lsn,
+                    sudo=sudo,
+                )
+        finally:
+            if recovery_profile is not None:
+                revert_recovery_profile(
+                    cluster, stanza=stanza, version=version, port=port
+                )
+    if analyze or (prewarm is not None):
+        _ = warm_up(
+            port=port,
+            analyze=analyze,
+            jobs=jobs,
+            prewarm=prewarm,
+            db_include=db_include,
+            db_exclude=db_exclude,
+            print=print,
+        )
     _LOGGER.info("Finished restoring Postgres")
 
 
-def _stop_cluster(cluster: str, /, *, version: int = VERSION) -> None:
+def estimate_restore[T: str](
+    stanza: str,
+    /,
+    *,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    history: PathLike | None = None,
+    user: str | None = None,
+) -> list[RestoreEstimate]:
+    """Predict how long restoring from each repo would take, fastest first."""
+    _LOGGER.info("Estimating restore of %r...", stanza)
+    info = get_info_json(stanza=stanza, repo=repo, repo_mapping=repo_mapping, user=user)
+    estimates = estimate_restores(
+        info,
+        read_run_history(history),
+        stanza=stanza,
+        repo=None if repo is None else to_repo_num(repo=repo, mapping=repo_mapping),
+    )
+    for line in format_restore_estimates(estimates).splitlines():
+        _LOGGER.info("%s", line)
+    return estimates
+
+
+def _get_plan[T: str](
+    stanza: str,
+    /,
+    *,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    user: str | None = None,
+) -> RestoreEstimate | None:
+    try:
+        info = get_info_json(
+            stanza=stanza, repo=repo, repo_mapping=repo_mapping, user=user
+        )
+    except RunCalledProcessError:
+        _LOGGER.warning("Failed to get info for %r; not recording timings", stanza)
+        return None
+    repo_num = None if repo is None else to_repo_num(repo=repo, mapping=repo_mapping)
+    restore_set = get_restore_set(info, stanza=stanza, repo=repo_num)
+    if restore_set is None:
+        return None
+    estimates = estimate_restores(
+        info, [], stanza=stanza, repo=int(restore_set["database"]["repo-key"])
+    )
+    return estimates[0] if len(estimates) >= 1 else None
+
+
+def _log_selection[T: str](
+    stanza: str,
+    /,
+    *,
+    repo: RepoNumOrName[T] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    db_include: MaybeIterable[str] | None = None,
+    db_exclude: MaybeIterable[str] | None = None,
+    user: str | None = None,
+) -> None:
+    try:
+        sizes = get_database_sizes(
+            stanza, repo=repo, repo_mapping=repo_mapping, user=user
+        )
+    except (RunCalledProcessError, ValueError):
+        _LOGGER.warning("Failed to get database sizes of %r", stanza)
+        return
+    text = format_database_sizes(sizes, include=db_include, exclude=db_exclude)
+    for line in text.splitlines():
+        _LOGGER.info("%s", line)
+
+
+def _stop_cluster(
+    cluster: str, /, *, version: int = VERSION, sudo: bool = False
+) -> None:
     _LOGGER.info("Stopping cluster '%d-%s'...", version, cluster)
-    run("pg_ctlcluster", str(version), cluster, "stop", suppress=True)
+    args: list[str] = ["pg_ctlcluster", str(version), cluster, "stop"]
+    run(*maybe_sudo_cmd(*args, sudo=sudo), suppress=True)
 
 
 def _delete_data(
-    name: str, /, *, version: int = VERSION, root: PathLike | None = None
+    name: str,
+    /,
+    *,
+    version: int = VERSION,
+    root: PathLike | None = None,
+    tablespaces: Iterable[PathLike] = (),
+    links: Iterable[PathLike] = (),
+    sudo: bool = False,
 ) -> None:
     _LOGGER.info("Deleting cluster '%d-%s' data...", version, name)
-    path = get_root(root=root) / f"var/lib/postgresql/{version}/{name}"
-    run("find", str(path), "-mindepth", "1", "-delete")
+    path = get_pg_data(name, version=version, root=root)
+    existing = get_data_links(path)
+    # tablespace locations are shared between versions, so only this version's
+    # 'PG_<version>_<catalog>' subdirectory is ours to clear
+    all_tablespaces = dict.fromkeys([
+        *(p.resolve() for p in existing if p.parent.name == "pg_tblspc"),
+        *(Path(p).resolve() for p in tablespaces),
+    ])
+    waldir = path / "pg_wal"
+    own_wal = waldir.resolve() if waldir.is_symlink() else None
+    for link in dict.fromkeys(Path(p).resolve() for p in links):
+        if (link != own_wal) and link.is_dir() and any(link.iterdir()):
+            msg = f"Expected linked directory {str(link)!r} to be empty"
+            raise ValueError(msg)
+    run(*maybe_sudo_cmd("find", str(path), "-mindepth", "1", "-delete", sudo=sudo))
+    if (own_wal is not None) and own_wal.is_dir():
+        _LOGGER.info("Deleting WAL in %r...", str(own_wal))
+        run(
+            *maybe_sudo_cmd(
+                "find", str(own_wal), "-mindepth", "1", "-delete", sudo=sudo
+            )
+        )
+    for tablespace in all_tablespaces:
+        for sub in sorted(tablespace.glob(f"PG_{version}_*")):
+            _LOGGER.info("Deleting tablespace data in %r...", str(sub))
+            run(*maybe_sudo_cmd("find", str(sub), "-delete", sudo=sudo))
+
+
+def get_data_links(path: PathLike, /) -> list[Path]:
+    """Get the links out of a data directory: top-level ones and tablespaces."""
+    path = Path(path)
+    candidates = [*path.glob("*"), *path.glob("pg_tblspc/*")]
+    return sorted(p for p in candidates if p.is_symlink())
 
 
 def _run_restore[T: str](
@@ -83,6 +345,13 @@ def _run_restore[T: str](
     target_timeline: int | None = None,
     user: str | None = None,
     print: bool = True,  # noqa: A002
+    progress: ProgressCallback | None = None,
+    db_include: MaybeIterable[str] | None = None,
+    db_exclude: MaybeIterable[str] | None = None,
+    tablespace_map: Mapping[str, PathLike] | None = None,
+    link_map: Mapping[str, PathLike] | None = None,
+    link_all: bool = False,
+    recovery_options: Mapping[str, str] | None = None,
 ) -> None:
     args: list[str] = ["pgbackrest"]
     if repo is None:
@@ -94,17 +363,42 @@ def _run_restore[T: str](
     args.append(f"--stanza={stanza}")
     if target_timeline is not None:
         args.append(f"--target-timeline={target_timeline}")
+    if db_include is not None:
+        args.extend(f"--db-include={db}" for db in always_iterable(db_include))
+    if db_exclude is not None:
+        args.extend(f"--db-exclude={db}" for db in always_iterable(db_exclude))
+    if tablespace_map is not None:
+        args.extend(f"--tablespace-map={k}={v}" for k, v in tablespace_map.items())
+    if link_map is not None:
+        args.extend(f"--link-map={k}={v}" for k, v in link_map.items())
+    if link_all:
+        args.append("--link-all")
+    if recovery_options is not None:
+        args.extend(f"--recovery-option={k}={v}" for k, v in recovery_options.items())
     args.append("restore")
-    run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
+    if progress is None:
+        run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
+    else:
+        run_with_progress(*args, callback=progress, user=user, print=print)
     if repo is None:
         _LOGGER.info("Finished restoring default repo to %r...", stanza)
     else:
         _LOGGER.info("Finished restoring repo %r to %r", repo, stanza)
 
 
-def _start_cluster(name: str, /, *, version: int = VERSION) -> None:
+def _start_cluster(
+    name: str,
+    /,
+    *,
+    version: int = VERSION,
+    port: int = PORT,
+    target_lsn: int | None = None,
+    sudo: bool = False,
+) -> None:
     _LOGGER.info("Starting cluster %r...", name)
-    run("pg_ctlcluster", str(version), name, "start")
+    args: list[str] = ["pg_ctlcluster", str(version), name, "start"]
+    run(*maybe_sudo_cmd(*args, sudo=sudo))
+    wait_until_ready(port=port, target_lsn=target_lsn, sudo=sudo)
 
 
 ##
@@ -122,6 +416,65 @@ def make_restore_cmd(
     )
     @user_option
     @print_option
+    @metrics_dir_option
+    @progress_option
+    @engine_option
+    @option(
+        "--path",
+        type=utilities.click.Path(exist="dir if exists"),
+        default=None,
+        help="Backup directory for the 'pg_basebackup' engine",
+    )
+    @option(
+        "--label",
+        type=Str(),
+        default=None,
+        help="Backup to restore for the 'pg_basebackup' engine; defaults to latest",
+    )
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @flag("--analyze", default=False, help="Analyze all databases after the restore")
+    @jobs_option
+    @option(
+        "--prewarm",
+        type=utilities.click.Path(exist="file if exists"),
+        default=None,
+        help="File of hot relations to save before, and prewarm after, the restore",
+    )
+    @flag(
+        "--fast-recovery",
+        default=False,
+        help="Apply a temporary profile to speed up WAL replay",
+    )
+    @process_max_option
+    @db_include_option
+    @db_exclude_option
+    @option(
+        "--tablespace-map",
+        type=Str(),
+        multiple=True,
+        help="Restore a tablespace to a path, as 'NAME=PATH'",
+    )
+    @option(
+        "--link-map",
+        type=Str(),
+        multiple=True,
+        help="Restore a link to a path, as 'LINK=PATH'; e.g. 'pg_wal=/wal'",
+    )
+    @flag(
+        "--link-all", default=False, help="Restore all links, e.g. a separate 'waldir'"
+    )
+    @flag(
+        "--estimate",
+        default=False,
+        help="Only predict the duration from each repo, and recommend the fastest",
+    )
+    @option(
+        "--history",
+        type=utilities.click.Path(),
+        default=None,
+        help="Restore history file; defaults to one under '/var/lib/postgresql'",
+    )
+    @sudo_option
     def func[T: str](
         *,
         cluster: str,
@@ -131,6 +484,25 @@ def make_restore_cmd(
         target_timeline: int | None,
         user: str | None,
         print: bool,  # noqa: A002
+        metrics_dir: PathLike | None,
+        progress: bool,
+        engine: BackupEngine,
+        path: PathLike | None,
+        label: str | None,
+        port: int,
+        analyze: bool,
+        jobs: int,
+        prewarm: PathLike | None,
+        fast_recovery: bool,
+        process_max: int,
+        db_include: tuple[str, ...],
+        db_exclude: tuple[str, ...],
+        tablespace_map: tuple[str, ...],
+        link_map: tuple[str, ...],
+        link_all: bool,
+        estimate: bool,
+        history: PathLike | None,
+        sudo: bool,
     ) -> None:
         if is_pytest():
             return
@@ -143,9 +515,29 @@ def make_restore_cmd(
             target_timeline=target_timeline,
             user=user,
             print=print,
+            metrics_dir=metrics_dir,
+            progress=log_progress(logger=_LOGGER) if progress else None,
+            engine=engine,
+            path=path,
+            label=label,
+            port=port,
+            analyze=analyze,
+            jobs=jobs,
+            prewarm=prewarm,
+            recovery_profile=RecoveryProfile(process_max=process_max)
+            if fast_recovery
+            else None,
+            db_include=None if len(db_include) == 0 else db_include,
+            db_exclude=None if len(db_exclude) == 0 else db_exclude,
+            tablespace_map=to_path_map(tablespace_map),
+            link_map=to_path_map(link_map),
+            link_all=link_all,
+            estimate=estimate,
+            history=history,
+            sudo=sudo,
         )
 
     return cli(name=name, help="Restore a database cluster", **CONTEXT_SETTINGS)(func)
 
 
-__all__ = ["make_restore_cmd", "restore"]
+__all__ = ["estimate_restore", "get_data_links", "make_restore_cmd", "restore"]
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Self, assert_never
+from typing import TYPE_CHECKING, Any, Self, assert_never
 
 import utilities.click
-from click import Command, command
+from click import Command, FloatRange, command
 from installer import (
     get_root,
     root_option,
@@ -18,6 +18,7 @@ from utilities.click import CONTEXT_SETTINGS, Enum, Str, argument, flag, option
 from utilities.constants import Sentinel, sentinel
 from utilities.core import (
     TemporaryFile,
+    always_iterable,
     get_local_ip,
     is_pytest,
     kebab_case,
@@ -32,18 +33,32 @@ from utilities.subprocess import chown, copy_text, maybe_sudo_cmd, rm, run
 
 from postgres import __version__
 from postgres._click import process_max_option
-from postgres._constants import PATH_CONFIGS, PORT, PROCESS_MAX, VERSION
+from postgres._constants import (
+    MAX_CLIENT_CONN,
+    MAX_CONNECTIONS,
+    PATH_CONFIGS,
+    POOLER_PORT,
+    PORT,
+    PROCESS_MAX,
+    SHARED_BUFFERS,
+    VERSION,
+)
 from postgres._enums import CipherType, RepoType
-from postgres._utilities import drop_cluster, get_pg_root, run_or_as_user
+from postgres._host import get_cluster_shared_buffers, get_host_tuning, set_up_host
+from postgres._pooler import get_pool_sizes, set_up_pooler
+from postgres._recovery import wait_until_ready
+from postgres._session import has_driver, set_role_password
+from postgres._utilities import drop_cluster, get_pg_root, run_or_as_user, run_psql
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     import pydantic
-    from utilities.types import PathLike, SecretLike
+    from utilities.types import MaybeIterable, PathLike, SecretLike
 
 
 _LOGGER = to_logger(__name__)
+_SUMMARIZE_WAL_VERSION = 17
 
 
 ##
@@ -61,16 +76,58 @@ def set_up(
     root: PathLike | None = None,
     process_max: int = PROCESS_MAX,
     password: SecretLike | None = None,
+    standby: MaybeIterable[PGHostSpec] | None = None,
+    backup_standby: bool = False,
+    summarize_wal: bool = False,
+    autoprewarm: bool = False,
+    waldir: PathLike | None = None,
+    max_connections: int = MAX_CONNECTIONS,
+    shared_buffers: str = SHARED_BUFFERS,
+    host_tuning: bool = False,
+    pooler: bool = False,
+    pooler_port: int = POOLER_PORT,
+    pooler_password: SecretLike | None = None,
+    max_client_conn: int = MAX_CLIENT_CONN,
+    stat_statements: bool = False,
+    auto_explain_sample_rate: float | None = None,
+    auto_explain_min_duration: str = "1s",
 ) -> None:
-    """Set up 'postgres' and 'pgbackrest'."""
+    """Set up 'postgres' and 'pgbackrest', optionally behind 'pgbouncer'."""
+    _check_summarize_wal(version=version, summarize_wal=summarize_wal)
     _LOGGER.info("Setting up 'postgres' & 'pgbackrest'...")
     set_up_postgres(sudo=sudo)
     set_up_pgbackrest(sudo=sudo)
     drop_cluster("main", version=version, sudo=sudo)
     drop_cluster(cluster, version=version, sudo=sudo)
-    _create_cluster(cluster, version=version, port=port, sudo=sudo)
+    _create_cluster(cluster, version=version, port=port, waldir=waldir, sudo=sudo)
     _set_up_pg_hba(cluster, version=version, root=root, sudo=sudo)
-    _set_up_postgresql_conf(cluster, version=version, root=root, sudo=sudo)
+    _set_up_postgresql_conf(
+        cluster,
+        version=version,
+        root=root,
+        sudo=sudo,
+        summarize_wal=summarize_wal,
+        autoprewarm=autoprewarm,
+        max_connections=max_connections,
+        shared_buffers=shared_buffers,
+        stat_statements=stat_statements,
+        auto_explain=auto_explain_sample_rate is not None,
+    )
+    _set_up_instrumentation(
+        cluster,
+        version=version,
+        root=root,
+        sudo=sudo,
+        stat_statements=stat_statements,
+        auto_explain_sample_rate=auto_explain_sample_rate,
+        auto_explain_min_duration=auto_explain_min_duration,
+    )
+    if host_tuning:
+        others = get_cluster_shared_buffers(root=root, exclude=(version, cluster))
+        tuning = get_host_tuning(
+            shared_buffers=shared_buffers, others=others, root=root
+        )
+        set_up_host(tuning, root=root, sudo=sudo)
     _remove_debian_pgbackrest_conf(root=root, sudo=sudo)
     _set_up_pgbackrest(
         cluster,
@@ -78,22 +135,56 @@ def set_up(
         repo,
         *repos,
         version=version,
+        port=port,
         root=root,
         sudo=sudo,
         process_max=process_max,
+        standby=standby,
+        backup_standby=backup_standby,
     )
     _change_ownership(root=root, sudo=sudo)
-    _restart_cluster(cluster, version=version, sudo=sudo)
+    _restart_cluster(cluster, version=version, port=port, sudo=sudo)
     if password is not None:
-        _set_postgres_password(password)
+        _set_postgres_password(password, port=port)
+    if stat_statements:
+        _create_stat_statements(port=port)
+    if pooler:
+        sizes = get_pool_sizes(
+            max_connections=max_connections, max_client_conn=max_client_conn
+        )
+        set_up_pooler(
+            cluster,
+            version=version,
+            port=port,
+            pooler_port=pooler_port,
+            password=pooler_password,
+            sizes=sizes,
+            root=root,
+            sudo=sudo,
+        )
     _LOGGER.info("Finished setting up 'postgres' & 'pgbackrest'")
 
 
 def _create_cluster(
-    name: str, /, *, version: int = VERSION, port: int = PORT, sudo: bool = False
+    name: str,
+    /,
+    *,
+    version: int = VERSION,
+    port: int = PORT,
+    datadir: PathLike | None = None,
+    waldir: PathLike | None = None,
+    sudo: bool = False,
 ) -> None:
     _LOGGER.info("Creating cluster '%d-%s'...", version, name)
-    args: list[str] = ["pg_createcluster", "--port", str(port), str(version), name]
+    args: list[str] = ["pg_createcluster", "--port", str(port)]
+    if datadir is not None:
+        args.append(f"--datadir={datadir}")
+    args.extend([str(version), name])
+    if waldir is not None:
+        _LOGGER.info("Creating WAL directory %r...", str(waldir))
+        install: list[str] = ["install", "-d", "-o", "postgres", "-g", "postgres"]
+        run(*maybe_sudo_cmd(*install, "-m", "700", str(waldir), sudo=sudo))
+        args.extend(["--", f"--waldir={waldir}"])
     run(*maybe_sudo_cmd(*args, sudo=sudo))
 
 
@@ -119,6 +210,12 @@ def _set_up_pg_hba(
         sudo=sudo,
         perms="u=rw,g=r,o=r",
     )
+    copy_text(
+        PATH_CONFIGS / "pg_ident.conf",
+        pg_root / "pg_ident.conf",
+        sudo=sudo,
+        perms="u=rw,g=r,o=r",
+    )
 
 
 def _set_up_postgresql_conf(
@@ -128,18 +225,91 @@ def _set_up_postgresql_conf(
     version: int = VERSION,
     root: PathLike | None = None,
     sudo: bool = False,
+    summarize_wal: bool = False,
+    autoprewarm: bool = False,
+    max_connections: int = MAX_CONNECTIONS,
+    shared_buffers: str = SHARED_BUFFERS,
+    stat_statements: bool = False,
+    auto_explain: bool = False,
 ) -> None:
+    _check_summarize_wal(version=version, summarize_wal=summarize_wal)
     _LOGGER.info("Setting up '%d-%s' 'postgresql.conf'...", version, name)
     pg_root = get_pg_root(root=root, version=version, name=name)
+    libraries: list[str] = []
+    for library, enabled in [
+        ("pg_prewarm", autoprewarm),
+        ("pg_stat_statements", stat_statements),
+        ("auto_explain", auto_explain),
+    ]:
+        if enabled:
+            libraries.append(library)
     copy_text(
         PATH_CONFIGS / "postgresql.conf",
         pg_root / "conf.d/custom.conf",
         sudo=sudo,
-        substitutions={"LISTEN_ADDRESSES": get_local_ip(), "CLUSTER": name},
+        substitutions={
+            "LISTEN_ADDRESSES": get_local_ip(),
+            "MAX_CONNECTIONS": max_connections,
+            "SHARED_BUFFERS": shared_buffers,
+            "CLUSTER": name,
+            # 'summarize_wal' only exists from 17; older servers reject it
+            "SUMMARIZE_WAL": ""
+            if version < _SUMMARIZE_WAL_VERSION
+            else f"summarize_wal = {'on' if summarize_wal else 'off'}",
+            "SHARED_PRELOAD_LIBRARIES": ",".join(libraries),
+            "AUTOPREWARM": "on" if autoprewarm else "off",
+        },
         perms="u=rw,g=r,o=r",
     )
 
 
+def _check_summarize_wal(
+    *, version: int = VERSION, summarize_wal: bool = False
+) -> None:
+    if summarize_wal and (version < _SUMMARIZE_WAL_VERSION):
+        msg = f"Expected version >= {_SUMMARIZE_WAL_VERSION} to summarize WAL; got {version}"
+        raise ValueError(msg)
+
+
+def _set_up_instrumentation(
+    name: str,
+    /,
+    *,
+    version: int = VERSION,
+    root: PathLike | None = None,
+    sudo: bool = False,
+    stat_statements: bool = False,
+    auto_explain_sample_rate: float | None = None,
+    auto_explain_min_duration: str = "1s",
+) -> None:
+    pg_root = get_pg_root(root=root, version=version, name=name)
+    if stat_statements:
+        _LOGGER.info("Enabling 'pg_stat_statements' on '%d-%s'...", version, name)
+        copy_text(
+            PATH_CONFIGS / "pg_stat_statements.conf",
+            pg_root / "conf.d/pg_stat_statements.conf",
+            sudo=sudo,
+            perms="u=rw,g=r,o=r",
+        )
+    if auto_explain_sample_rate is not None:
+        _LOGGER.info(
+            "Enabling 'auto_explain' on '%d-%s' at a %.0f%% sample rate...",
+            version,
+            name,
+            100 * auto_explain_sample_rate,
+        )
+        copy_text(
+            PATH_CONFIGS / "auto_explain.conf",
+            pg_root / "conf.d/auto_explain.conf",
+            sudo=sudo,
+            substitutions={
+                "LOG_MIN_DURATION": auto_explain_min_duration,
+                "SAMPLE_RATE": auto_explain_sample_rate,
+            },
+            perms="u=rw,g=r,o=r",
+        )
+
+
 def _remove_debian_pgbackrest_conf(
     *, root: PathLike | None = None, sudo: bool = False
 ) -> None:
@@ -155,14 +325,27 @@ def _set_up_pgbackrest(
     /,
     *repos: RepoSpec,
     version: int = VERSION,
+    port: int = PORT,
     root: PathLike | None = None,
     sudo: bool = False,
     process_max: int = PROCESS_MAX,
+    standby: MaybeIterable[PGHostSpec] | None = None,
+    backup_standby: bool = False,
 ) -> None:
     _LOGGER.info("Setting up '%d-%s-%s' 'pgbackrest.conf'...", version, cluster, stanza)
     dest = get_root(root=root) / "etc/pgbackrest/pgbackrest.conf"
     all_repos = [repo, *repos]
     all_repos = [r.replace(n=n) for n, r in enumerate(all_repos, start=1)]
+    primary = PGHostSpec(cluster, version=version, port=None if port == PORT else port)
+    standbys = [] if standby is None else list(always_iterable(standby))
+    all_hosts = [primary, *standbys]
+    all_hosts = [h.replace(n=n) for n, h in enumerate(all_hosts, start=1)]
+    hosts = "\n".join(h.text.rstrip("\n") for h in all_hosts)
+    if backup_standby:
+        if len(standbys) == 0:
+            msg = "Expected at least 1 standby if 'backup_standby' is set"
+            raise ValueError(msg)
+        hosts = f"{hosts}\nbackup-standby = y"
     copy_text(
         PATH_CONFIGS / "pgbackrest.conf",
         dest,
@@ -171,8 +354,7 @@ def _set_up_pgbackrest(
             "PROCESS_MAX": process_max,
             "REPOS": "\n".join(r.text for r in all_repos).rstrip("\n"),
             "STANZA": stanza,
-            "VERSION": version,
-            "CLUSTER": cluster,
+            "HOSTS": hosts,
         },
         perms="u=rw,g=r,o=r",
     )
@@ -185,18 +367,35 @@ def _change_ownership(*, root: PathLike | None = None, sudo: bool = False) -> No
 
 
 def _restart_cluster(
-    name: str, /, *, version: int = VERSION, sudo: bool = False
+    name: str,
+    /,
+    *,
+    version: int = VERSION,
+    port: int = PORT,
+    standby: bool = False,
+    sudo: bool = False,
 ) -> None:
     _LOGGER.info("Restarting cluster '%d-%s'...", version, name)
     args: list[str] = ["pg_ctlcluster", str(version), name, "restart"]
     run(*maybe_sudo_cmd(*args, sudo=sudo))
+    wait_until_ready(port=port, standby=standby, sudo=sudo)
 
 
-def _set_postgres_password(password: SecretLike, /) -> None:
+def _create_stat_statements(*, port: int = PORT) -> None:
+    _LOGGER.info("Creating extension 'pg_stat_statements'...")
+    _ = run_psql("CREATE EXTENSION IF NOT EXISTS pg_stat_statements", port=port)
+
+
+def _set_postgres_password(password: SecretLike, /, *, port: int = PORT) -> None:
     _LOGGER.info("Setting 'postgres' role password...")
+    if has_driver(user="postgres"):
+        set_role_password(
+            "postgres", extract_secret(password), port=port, user="postgres"
+        )
+        return
     cmd = f"ALTER ROLE postgres WITH PASSWORD '{extract_secret(password)}';"
     with TemporaryFile(text=cmd, perms="u=rw,g=r,o=r") as temp:
-        run_or_as_user("psql", "-f", str(temp), user="postgres")
+        run_or_as_user("psql", f"--port={port}", "-f", str(temp), user="postgres")
 
 
 ##
@@ -277,6 +476,146 @@ class RepoSpec:
         return normalize_str("\n".join(lines))
 
 
+@dataclass(order=True, unsafe_hash=True, slots=True)
+class PGHostSpec:
+    cluster: str = field()
+    n: int = field(default=1, kw_only=True)
+    version: int = field(default=VERSION, kw_only=True)
+    port: int | None = field(default=None, kw_only=True)
+    host: str | None = field(default=None, kw_only=True)
+    host_user: str | None = field(default=None, kw_only=True)
+
+    def replace(
+        self,
+        *,
+        cluster: str | Sentinel = sentinel,
+        n: int | Sentinel = sentinel,
+        version: int | Sentinel = sentinel,
+        port: int | None | Sentinel = sentinel,
+        host: str | None | Sentinel = sentinel,
+        host_user: str | None | Sentinel = sentinel,
+    ) -> Self:
+        return replace_non_sentinel(
+            self,
+            cluster=cluster,
+            n=n,
+            version=version,
+            port=port,
+            host=host,
+            host_user=host_user,
+        )
+
+    @property
+    def path(self) -> Path:
+        return Path(f"/var/lib/postgresql/{self.version}/{self.cluster}")
+
+    @property
+    def text(self) -> str:
+        lines: list[str] = [f"pg{self.n}-path = {self.path}"]
+        for name, value in [
+            ("port", self.port),
+            ("host", self.host),
+            ("host-user", self.host_user),
+        ]:
+            if value is not None:
+                lines.append(f"pg{self.n}-{name} = {value}")
+        return normalize_str("\n".join(lines))
+
+
+##
+
+
+def repo_spec_options[F: Callable[..., Any]](func: F, /) -> F:
+    """Add the 'RepoSpec' options to a command."""
+    decorators: list[Callable[[F], F]] = [
+        argument("path", type=utilities.click.Path(exist="dir if exists")),
+        flag("--bundle", default=None, help="Bundle files in repository"),
+        option(
+            "--cipher-pass",
+            type=utilities.click.SecretStr(),
+            default=None,
+            help="Repository cipher passphrase",
+        ),
+        option(
+            "--cipher-type",
+            type=Enum(CipherType),
+            default=None,
+            help="Cipher used to encrypt the repository",
+        ),
+        option(
+            "--retention-diff",
+            type=int,
+            default=None,
+            help="Number of differential backups to retain",
+        ),
+        option(
+            "--retention-full",
+            type=int,
+            default=None,
+            help="Full backup retention count/time",
+        ),
+        option(
+            "--type",
+            type=Enum(RepoType),
+            default=None,
+            help="Type of storage used for the repository",
+        ),
+        option("--s3-bucket", type=Str(), default=None, help="S3 repository bucket"),
+        option(
+            "--s3-endpoint", type=Str(), default=None, help="S3 repository endpoint"
+        ),
+        option(
+            "--s3-key",
+            type=utilities.click.SecretStr(),
+            default=None,
+            help="S3 repository access key",
+        ),
+        option(
+            "--s3-key-secret",
+            type=utilities.click.SecretStr(),
+            default=None,
+            help="S3 repository secret access key",
+        ),
+        option("--s3-region", type=Str(), default=None, help="S3 repository region"),
+    ]
+    for decorator in reversed(decorators):
+        func = decorator(func)
+    return func
+
+
+def to_repo_spec(
+    path: PathLike,
+    /,
+    *,
+    bundle: bool | None = None,
+    cipher_pass: SecretLike | None = None,
+    cipher_type: CipherType | None = None,
+    retention_diff: int | None = None,
+    retention_full: int | None = None,
+    type: RepoType | None = None,  # noqa: A002
+    s3_bucket: str | None = None,
+    s3_endpoint: str | None = None,
+    s3_key: SecretLike | None = None,
+    s3_key_secret: SecretLike | None = None,
+    s3_region: str | None = None,
+) -> RepoSpec:
+    """Convert the 'RepoSpec' options to a 'RepoSpec'."""
+    return RepoSpec(
+        Path(path),
+        bundle=bundle,
+        cipher_pass=None if cipher_pass is None else ensure_secret(cipher_pass),
+        cipher_type=cipher_type,
+        retention_diff=retention_diff,
+        retention_full=retention_full,
+        type=type,
+        s3_bucket=s3_bucket,
+        s3_endpoint=s3_endpoint,
+        s3_key=None if s3_key is None else ensure_secret(s3_key),
+        s3_key_secret=None if s3_key_secret is None else ensure_secret(s3_key_secret),
+        s3_region=s3_region,
+    )
+
+
 ##
 
 
@@ -285,62 +624,84 @@ def make_set_up_cmd(
 ) -> Command:
     @argument("cluster", type=Str())
     @argument("stanza", type=Str())
-    @argument("path", type=utilities.click.Path(exist="dir if exists"))
-    @flag("--bundle", default=None, help="Bundle files in repository")
+    @repo_spec_options
+    @sudo_option
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @root_option
+    @process_max_option
     @option(
-        "--cipher-pass",
+        "--password",
         type=utilities.click.SecretStr(),
         default=None,
-        help="Repository cipher passphrase",
+        help="'postgres' user password",
     )
-    @option(
-        "--cipher-type",
-        type=Enum(CipherType),
-        default=None,
-        help="Cipher used to encrypt the repository",
+    @option("--standby-cluster", type=Str(), default=None, help="Standby cluster")
+    @option("--standby-port", type=int, default=None, help="Standby port")
+    @option("--standby-host", type=Str(), default=None, help="Standby host")
+    @flag("--backup-standby", default=False, help="Backup from the standby")
+    @flag(
+        "--summarize-wal",
+        default=False,
+        help="Summarize WAL for 'pg_basebackup --incremental'",
+    )
+    @flag(
+        "--autoprewarm",
+        default=False,
+        help="Reload the buffer cache on startup with 'pg_prewarm'",
     )
     @option(
-        "--retention-diff",
-        type=int,
+        "--waldir",
+        type=utilities.click.Path(exist="dir if exists"),
         default=None,
-        help="Number of differential backups to retain",
+        help="Separate directory for the write-ahead log",
     )
     @option(
-        "--retention-full",
+        "--max-connections",
         type=int,
-        default=None,
-        help="Full backup retention count/time",
+        default=MAX_CONNECTIONS,
+        help="Cluster 'max_connections'",
     )
     @option(
-        "--type",
-        type=Enum(RepoType),
-        default=None,
-        help="Type of storage used for the repository",
+        "--shared-buffers",
+        type=Str(),
+        default=SHARED_BUFFERS,
+        help="Cluster 'shared_buffers'",
     )
-    @option("--s3-bucket", type=Str(), default=None, help="S3 repository bucket")
-    @option("--s3-endpoint", type=Str(), default=None, help="S3 repository endpoint")
+    @flag(
+        "--host-tuning",
+        default=False,
+        help="Tune huge pages, writeback, swappiness and THP for the cluster",
+    )
+    @flag("--pooler", default=False, help="Put 'pgbouncer' in front of the cluster")
+    @option("--pooler-port", type=int, default=POOLER_PORT, help="Pooler port")
     @option(
-        "--s3-key",
+        "--pooler-password",
         type=utilities.click.SecretStr(),
         default=None,
-        help="S3 repository access key",
+        help="Pooler auth user password; defaults to a random one",
     )
     @option(
-        "--s3-key-secret",
-        type=utilities.click.SecretStr(),
-        default=None,
-        help="S3 repository secret access key",
+        "--max-client-conn",
+        type=int,
+        default=MAX_CLIENT_CONN,
+        help="Max client connections to the pooler",
+    )
+    @flag(
+        "--stat-statements",
+        default=False,
+        help="Track query statistics with 'pg_stat_statements'",
     )
-    @option("--s3-region", type=Str(), default=None, help="S3 repository region")
-    @sudo_option
-    @option("--port", type=int, default=PORT, help="Cluster port")
-    @root_option
-    @process_max_option
     @option(
-        "--password",
-        type=utilities.click.SecretStr(),
+        "--auto-explain-sample-rate",
+        type=FloatRange(min=0.0, max=1.0),
         default=None,
-        help="'postgres' user password",
+        help="Log plans of slow statements with 'auto_explain' at this sample rate",
+    )
+    @option(
+        "--auto-explain-min-duration",
+        type=Str(),
+        default="1s",
+        help="Log plans of statements slower than this",
     )
     def func(
         *,
@@ -364,24 +725,39 @@ def make_set_up_cmd(
         root: PathLike | None,
         process_max: int,
         password: SecretLike | None,
+        standby_cluster: str | None,
+        standby_port: int | None,
+        standby_host: str | None,
+        backup_standby: bool,
+        summarize_wal: bool,
+        autoprewarm: bool,
+        waldir: PathLike | None,
+        max_connections: int,
+        shared_buffers: str,
+        host_tuning: bool,
+        pooler: bool,
+        pooler_port: int,
+        pooler_password: SecretLike | None,
+        max_client_conn: int,
+        stat_statements: bool,
+        auto_explain_sample_rate: float | None,
+        auto_explain_min_duration: str,
     ) -> None:
         if is_pytest():
             return
         set_up_logging(__name__, root=True, log_version=__version__)
-        repo = RepoSpec(
-            Path(path),
+        repo = to_repo_spec(
+            path,
             bundle=bundle,
-            cipher_pass=None if cipher_pass is None else ensure_secret(cipher_pass),
+            cipher_pass=cipher_pass,
             cipher_type=cipher_type,
             retention_diff=retention_diff,
             retention_full=retention_full,
             type=type,
             s3_bucket=s3_bucket,
             s3_endpoint=s3_endpoint,
-            s3_key=None if s3_key is None else ensure_secret(s3_key),
-            s3_key_secret=None
-            if s3_key_secret is None
-            else ensure_secret(s3_key_secret),
+            s3_key=s3_key,
+            s3_key_secret=s3_key_secret,
             s3_region=s3_region,
         )
         set_up(
@@ -394,6 +770,25 @@ def make_set_up_cmd(
             root=root,
             process_max=process_max,
             password=password,
+            standby=None
+            if standby_cluster is None
+            else PGHostSpec(
+                standby_cluster, version=version, port=standby_port, host=standby_host
+            ),
+            backup_standby=backup_standby,
+            summarize_wal=summarize_wal,
+            autoprewarm=autoprewarm,
+            waldir=waldir,
+            max_connections=max_connections,
+            shared_buffers=shared_buffers,
+            host_tuning=host_tuning,
+            pooler=pooler,
+            pooler_port=pooler_port,
+            pooler_password=pooler_password,
+            max_client_conn=max_client_conn,
+            stat_statements=stat_statements,
+            auto_explain_sample_rate=auto_explain_sample_rate,
+            auto_explain_min_duration=auto_explain_min_duration,
         )
 
     return cli(
@@ -401,4 +796,11 @@ def make_set_up_cmd(
     )(func)
 
 
-__all__ = ["RepoSpec", "make_set_up_cmd", "set_up"]
+__all__ = [
+    "PGHostSpec",
+    "RepoSpec",
+    "make_set_up_cmd",
+    "repo_spec_options",
+    "set_up",
+    "to_repo_spec",
+]
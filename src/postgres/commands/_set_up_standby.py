@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import Command, command
+from installer import (
+    get_root,
+    root_option,
+    set_up_pgbackrest,
+    set_up_postgres,
+    sudo_option,
+)
+from utilities.click import CONTEXT_SETTINGS, Str, argument, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+from utilities.pydantic import extract_secret
+from utilities.subprocess import cat, chmod, chown, tee
+
+from postgres import __version__
+from postgres._click import print_option, process_max_option, version_option
+from postgres._constants import PORT, PROCESS_MAX, VERSION
+from postgres._utilities import drop_cluster, run_or_as_user
+from postgres.commands._restore import _delete_data, _stop_cluster
+from postgres.commands._set_up import (
+    _change_ownership,
+    _create_cluster,
+    _remove_debian_pgbackrest_conf,
+    _restart_cluster,
+    _set_up_pg_hba,
+    _set_up_pgbackrest,
+    _set_up_postgresql_conf,
+    repo_spec_options,
+    to_repo_spec,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from utilities.types import PathLike, SecretLike
+
+    from postgres._enums import CipherType, RepoType
+    from postgres.commands._set_up import RepoSpec
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def set_up_standby(
+    cluster: str,
+    stanza: str,
+    repo: RepoSpec,
+    /,
+    *repos: RepoSpec,
+    primary_host: str,
+    primary_port: int = PORT,
+    primary_user: str = "postgres",
+    primary_password: SecretLike | None = None,
+    sudo: bool = False,
+    version: int = VERSION,
+    port: int = PORT,
+    root: PathLike | None = None,
+    process_max: int = PROCESS_MAX,
+    print: bool = True,  # noqa: A002
+) -> None:
+    """Set up a hot standby from the latest 'pgbackrest' backup."""
+    _LOGGER.info("Setting up standby %r of %r...", cluster, primary_host)
+    set_up_postgres(sudo=sudo)
+    set_up_pgbackrest(sudo=sudo)
+    drop_cluster(cluster, version=version, sudo=sudo)
+    _create_cluster(cluster, version=version, port=port, sudo=sudo)
+    _set_up_pg_hba(cluster, version=version, root=root, sudo=sudo)
+    _set_up_postgresql_conf(cluster, version=version, root=root, sudo=sudo)
+    _remove_debian_pgbackrest_conf(root=root, sudo=sudo)
+    _set_up_pgbackrest(
+        cluster,
+        stanza,
+        repo,
+        *repos,
+        version=version,
+        port=port,
+        root=root,
+        sudo=sudo,
+        process_max=process_max,
+    )
+    _change_ownership(root=root, sudo=sudo)
+    _stop_cluster(cluster, version=version, sudo=sudo)
+    _delete_data(cluster, version=version, root=root, sudo=sudo)
+    passfile = (
+        None
+        if primary_password is None
+        else _write_pgpass(
+            primary_host,
+            port=primary_port,
+            user=primary_user,
+            password=primary_password,
+            root=root,
+            sudo=sudo,
+        )
+    )
+    conninfo = to_primary_conninfo(
+        primary_host,
+        port=primary_port,
+        user=primary_user,
+        passfile=passfile,
+        application_name=cluster,
+    )
+    _run_standby_restore(stanza, primary_conninfo=conninfo, print=print)
+    _restart_cluster(cluster, version=version, port=port, standby=True, sudo=sudo)
+    _LOGGER.info("Finished setting up standby %r of %r", cluster, primary_host)
+
+
+def _run_standby_restore(
+    stanza: str,
+    /,
+    *,
+    primary_conninfo: str,
+    print: bool = True,  # noqa: A002
+) -> None:
+    _LOGGER.info("Restoring %r as a standby...", stanza)
+    run_or_as_user(
+        "pgbackrest",
+        f"--stanza={stanza}",
+        "--type=standby",
+        f"--recovery-option=primary_conninfo={primary_conninfo}",
+        "restore",
+        user="postgres",
+        print=print,
+        logger=_LOGGER,
+    )
+
+
+def _write_pgpass(
+    host: str,
+    /,
+    *,
+    port: int = PORT,
+    user: str = "postgres",
+    password: SecretLike,
+    root: PathLike | None = None,
+    sudo: bool = False,
+) -> Path:
+    """Write the replication password to the 'postgres' user's '.pgpass'.
+
+    This keeps it off the 'pgbackrest' command line and out of 'ps'.
+    """
+    path = get_root(root=root) / "var/lib/postgresql/.pgpass"
+    _LOGGER.info("Writing the password for %r to %r...", user, str(path))
+    prefix = ":".join(_escape_pgpass(v) for v in [host, str(port), "*", user])
+    existing = cat(path, sudo=sudo).splitlines() if path.exists() else []
+    lines = [line for line in existing if not line.startswith(f"{prefix}:")]
+    lines.append(f"{prefix}:{_escape_pgpass(extract_secret(password))}")
+    # create it empty and private first, so the password is never world-readable
+    tee(path, "", sudo=sudo)
+    chmod(path, "u=rw,g=,o=", sudo=sudo)
+    tee(path, "".join(f"{line}\n" for line in lines), sudo=sudo)
+    chown(path, sudo=sudo, owner="postgres", group="postgres")
+    return path
+
+
+def _escape_pgpass(value: str, /) -> str:
+    return value.replace("\\", "\\\\").replace(":", "\\:")
+
+
+def to_primary_conninfo(
+    host: str,
+    /,
+    *,
+    port: int = PORT,
+    user: str = "postgres",
+    password: SecretLike | None = None,
+    passfile: PathLike | None = None,
+    application_name: str | None = None,
+) -> str:
+    """Build the 'primary_conninfo' connection string."""
+    parts: list[tuple[str, str]] = [("host", host), ("port", str(port)), ("user", user)]
+    if password is not None:
+        parts.append(("password", extract_secret(password)))
+    if passfile is not None:
+        parts.append(("passfile", str(passfile)))
+    if application_name is not None:
+        parts.append(("application_name", application_name))
+    return " ".join(f"{k}={_quote_conninfo_value(v)}" for k, v in parts)
+
+
+def _quote_conninfo_value(value: str, /) -> str:
+    if (value != "") and all(c not in value for c in " '\\"):
+        return value
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+##
+
+
+def make_set_up_standby_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @argument("cluster", type=Str())
+    @argument("stanza", type=Str())
+    @repo_spec_options
+    @option("--primary-host", type=Str(), required=True, help="Primary host")
+    @option("--primary-port", type=int, default=PORT, help="Primary port")
+    @option("--primary-user", type=Str(), default="postgres", help="Replication user")
+    @option(
+        "--primary-password",
+        type=utilities.click.SecretStr(),
+        default=None,
+        help="Replication user password",
+    )
+    @sudo_option
+    @version_option
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @root_option
+    @process_max_option
+    @print_option
+    def func(
+        *,
+        cluster: str,
+        stanza: str,
+        path: PathLike,
+        bundle: bool | None,
+        cipher_pass: SecretLike | None,
+        cipher_type: CipherType | None,
+        retention_diff: int | None,
+        retention_full: int | None,
+        type: RepoType | None,  # noqa: A002
+        s3_bucket: str | None,
+        s3_endpoint: str | None,
+        s3_key: SecretLike | None,
+        s3_key_secret: SecretLike | None,
+        s3_region: str | None,
+        primary_host: str,
+        primary_port: int,
+        primary_user: str,
+        primary_password: SecretLike | None,
+        sudo: bool,
+        version: int,
+        port: int,
+        root: PathLike | None,
+        process_max: int,
+        print: bool,  # noqa: A002
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        repo = to_repo_spec(
+            path,
+            bundle=bundle,
+            cipher_pass=cipher_pass,
+            cipher_type=cipher_type,
+            retention_diff=retention_diff,
+            retention_full=retention_full,
+            type=type,
+            s3_bucket=s3_bucket,
+            s3_endpoint=s3_endpoint,
+            s3_key=s3_key,
+            s3_key_secret=s3_key_secret,
+            s3_region=s3_region,
+        )
+        set_up_standby(
+            cluster,
+            stanza,
+            repo,
+            primary_host=primary_host,
+            primary_port=primary_port,
+            primary_user=primary_user,
+            primary_password=primary_password,
+            sudo=sudo,
+            version=version,
+            port=port,
+            root=root,
+            process_max=process_max,
+            print=print,
+        )
+
+    return cli(
+        name=name,
+        help="Set up a hot standby from the latest backup",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["make_set_up_standby_cmd", "set_up_standby", "to_primary_conninfo"]
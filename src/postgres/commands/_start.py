@@ -30,7 +30,7 @@ def start(
 ) -> None:
     _LOGGER.info("Starting 'pgbackrest'...")
     args: list[str] = ["pgbackrest"]
-    if stanza is None:
+    if stanza is not None:
         args.append(f"--stanza={stanza}")
     args.append("start")
     run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
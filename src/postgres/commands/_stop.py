@@ -30,7 +30,7 @@ def stop(
 ) -> None:
     _LOGGER.info("Stopping 'pgbackrest'...")
     args: list[str] = ["pgbackrest"]
-    if stanza is None:
+    if stanza is not None:
         args.append(f"--stanza={stanza}")
     args.append("stop")
     run_or_as_user(*args, user=user, print=print, logger=_LOGGER)
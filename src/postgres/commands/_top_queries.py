@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from time import sleep
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import command
+from utilities.click import CONTEXT_SETTINGS, option
+from utilities.core import is_pytest, set_up_logging, to_logger
+
+from postgres import __version__
+from postgres._click import user_option
+from postgres._constants import PORT
+from postgres._top_queries import (
+    diff_query_stats,
+    format_top_queries,
+    get_query_stats,
+    read_query_stats,
+    write_query_stats,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+    from postgres._top_queries import QueryStats
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def top_queries(
+    *,
+    interval: float = 60.0,
+    baseline: PathLike | None = None,
+    save: PathLike | None = None,
+    limit: int = 10,
+    port: int = PORT,
+    user: str | None = "postgres",
+) -> list[QueryStats]:
+    """Report the queries with the most time, I/O and temp spill over an interval.
+
+    The interval starts at a saved baseline snapshot if given, and otherwise
+    at a snapshot taken 'interval' seconds before the report.
+    """
+    if baseline is None:
+        _LOGGER.info("Sampling 'pg_stat_statements' over %.0fs...", interval)
+        before = get_query_stats(port=port, user=user)
+        sleep(interval)
+    else:
+        _LOGGER.info("Comparing 'pg_stat_statements' to %r...", str(baseline))
+        before = read_query_stats(baseline)
+    after = get_query_stats(port=port, user=user)
+    if save is not None:
+        write_query_stats(after, path=save)
+    diffs = diff_query_stats(before, after)
+    for line in format_top_queries(diffs, limit=limit).splitlines():
+        _LOGGER.info("%s", line)
+    return diffs
+
+
+##
+
+
+def make_top_queries_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @option(
+        "--interval",
+        type=float,
+        default=60.0,
+        help="Seconds between the snapshots, if there is no baseline",
+    )
+    @option(
+        "--baseline",
+        type=utilities.click.Path(exist="file if exists"),
+        default=None,
+        help="Snapshot to compare against, instead of sampling",
+    )
+    @option(
+        "--save",
+        type=utilities.click.Path(),
+        default=None,
+        help="File to save the latest snapshot to, as a future baseline",
+    )
+    @option("--limit", type=int, default=10, help="Queries to report per ranking")
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @user_option
+    def func(
+        *,
+        interval: float,
+        baseline: PathLike | None,
+        save: PathLike | None,
+        limit: int,
+        port: int,
+        user: str | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = top_queries(
+            interval=interval,
+            baseline=baseline,
+            save=save,
+            limit=limit,
+            port=port,
+            user=user,
+        )
+
+    return cli(
+        name=name,
+        help="Report the top queries by time, I/O and temp spill",
+        **CONTEXT_SETTINGS,
+    )(func)
+
+
+__all__ = ["make_top_queries_cmd", "top_queries"]
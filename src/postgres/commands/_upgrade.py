@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, assert_never
+
+from click import command
+from installer import get_root, root_option, sudo_option
+from utilities.click import CONTEXT_SETTINGS, Enum, Str, argument, flag, option
+from utilities.core import TemporaryFile, is_pytest, set_up_logging, to_logger
+from utilities.subprocess import copy_text, maybe_sudo_cmd, run
+
+from postgres import __version__
+from postgres._click import jobs_option, print_option
+from postgres._clones import find_free_port, get_cluster_ports
+from postgres._constants import JOBS, MAX_CONNECTIONS, PORT, SHARED_BUFFERS, VERSION
+from postgres._enums import DEFAULT_UPGRADE_MODE, UpgradeMode
+from postgres._utilities import (
+    analyze_in_stages,
+    drop_cluster,
+    get_pg_bin,
+    get_pg_data,
+    get_pg_root,
+    read_postgresql_conf,
+    run_or_as_user,
+)
+from postgres.commands._restore import _stop_cluster
+from postgres.commands._set_up import (
+    PGHostSpec,
+    _change_ownership,
+    _check_summarize_wal,
+    _create_cluster,
+    _restart_cluster,
+    _set_up_pg_hba,
+    _set_up_postgresql_conf,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import PathLike
+
+
+_LOGGER = to_logger(__name__)
+_INSTRUMENTATION = ["pg_stat_statements.conf", "auto_explain.conf"]
+
+
+##
+
+
+def upgrade(
+    cluster: str,
+    stanza: str,
+    /,
+    *,
+    old_version: int,
+    new_version: int = VERSION,
+    port: int = PORT,
+    mode: UpgradeMode = DEFAULT_UPGRADE_MODE,
+    jobs: int = JOBS,
+    root: PathLike | None = None,
+    sudo: bool = False,
+    summarize_wal: bool = False,
+    print: bool = True,  # noqa: A002
+) -> None:
+    """Upgrade a cluster to a new major version with 'pg_upgrade'."""
+    if old_version >= new_version:
+        msg = f"Expected 'old_version' ({old_version}) < 'new_version' ({new_version})"
+        raise ValueError(msg)
+    _check_summarize_wal(version=new_version, summarize_wal=summarize_wal)
+    _LOGGER.info(
+        "Upgrading cluster %r from %d to %d...", cluster, old_version, new_version
+    )
+    new_root = get_pg_root(root=root, version=new_version, name=cluster)
+    new_data = get_pg_data(cluster, version=new_version, root=root)
+    if new_root.exists() or new_data.exists():
+        msg = f"Expected no cluster '{new_version}-{cluster}'; drop it first"
+        raise ValueError(msg)
+    temp_port = find_free_port(start=port + 1, used=get_cluster_ports())
+    _create_cluster(cluster, version=new_version, port=temp_port, sudo=sudo)
+    _set_up_pg_hba(cluster, version=new_version, root=root, sudo=sudo)
+    _carry_over_postgresql_conf(
+        cluster,
+        old_version=old_version,
+        new_version=new_version,
+        root=root,
+        sudo=sudo,
+        summarize_wal=summarize_wal,
+    )
+    _change_ownership(root=root, sudo=sudo)
+    _stop_cluster(cluster, version=new_version, sudo=sudo)
+    _run_pg_upgrade(
+        cluster,
+        old_version=old_version,
+        new_version=new_version,
+        port=port,
+        new_port=temp_port,
+        mode=mode,
+        jobs=jobs,
+        check=True,
+        root=root,
+        print=print,
+    )
+    _stop_cluster(cluster, version=old_version, sudo=sudo)
+    _run_pg_upgrade(
+        cluster,
+        old_version=old_version,
+        new_version=new_version,
+        port=port,
+        new_port=temp_port,
+        mode=mode,
+        jobs=jobs,
+        root=root,
+        print=print,
+    )
+    # the old cluster is kept (stopped, on the temporary port) until the new one
+    # is up and the stanza is upgraded, so a failure can still be rolled back
+    _set_port(cluster, version=old_version, port=temp_port, sudo=sudo)
+    _set_port(cluster, version=new_version, port=port, sudo=sudo)
+    _repoint_pgbackrest_conf(
+        cluster, old_version=old_version, new_version=new_version, root=root, sudo=sudo
+    )
+    _restart_cluster(cluster, version=new_version, port=port, sudo=sudo)
+    _stanza_upgrade(stanza, print=print)
+    drop_cluster(cluster, version=old_version, sudo=sudo)
+    analyze_in_stages(port=port, jobs=jobs, print=print)
+    _LOGGER.info(
+        "Finished upgrading cluster %r from %d to %d", cluster, old_version, new_version
+    )
+
+
+def _run_pg_upgrade(
+    cluster: str,
+    /,
+    *,
+    old_version: int,
+    new_version: int = VERSION,
+    port: int = PORT,
+    new_port: int | None = None,
+    mode: UpgradeMode = DEFAULT_UPGRADE_MODE,
+    jobs: int = JOBS,
+    check: bool = False,
+    root: PathLike | None = None,
+    print: bool = True,  # noqa: A002
+) -> None:
+    _LOGGER.info(
+        "%s 'pg_upgrade' of %r in %r mode with %d job(s)...",
+        "Checking" if check else "Running",
+        cluster,
+        mode.value,
+        jobs,
+    )
+    args = to_pg_upgrade_args(
+        cluster,
+        old_version=old_version,
+        new_version=new_version,
+        port=port,
+        new_port=new_port,
+        mode=mode,
+        jobs=jobs,
+        check=check,
+        root=root,
+    )
+    run_or_as_user(*args, user="postgres", print=print, logger=_LOGGER)
+
+
+def _carry_over_postgresql_conf(
+    cluster: str,
+    /,
+    *,
+    old_version: int,
+    new_version: int = VERSION,
+    root: PathLike | None = None,
+    sudo: bool = False,
+    summarize_wal: bool = False,
+) -> None:
+    old_conf_d = get_pg_root(root=root, version=old_version, name=cluster) / "conf.d"
+    new_conf_d = get_pg_root(root=root, version=new_version, name=cluster) / "conf.d"
+    settings = read_postgresql_conf(old_conf_d / "custom.conf")
+    libraries = [
+        lib.strip() for lib in settings.get("shared_preload_libraries", "").split(",")
+    ]
+    _set_up_postgresql_conf(
+        cluster,
+        version=new_version,
+        root=root,
+        sudo=sudo,
+        summarize_wal=summarize_wal,
+        autoprewarm="pg_prewarm" in libraries,
+        max_connections=int(settings.get("max_connections", MAX_CONNECTIONS)),
+        shared_buffers=settings.get("shared_buffers", SHARED_BUFFERS),
+        stat_statements="pg_stat_statements" in libraries,
+        auto_explain="auto_explain" in libraries,
+    )
+    for name in _INSTRUMENTATION:
+        if (old_conf_d / name).is_file():
+            _LOGGER.info("Carrying over %r to '%d-%s'...", name, new_version, cluster)
+            copy_text(
+                old_conf_d / name, new_conf_d / name, sudo=sudo, perms="u=rw,g=r,o=r"
+            )
+
+
+def _set_port(
+    name: str, /, *, version: int = VERSION, port: int = PORT, sudo: bool = False
+) -> None:
+    _LOGGER.info("Setting cluster '%d-%s' port to %d...", version, name, port)
+    args: list[str] = ["pg_conftool", str(version), name, "set", "port", str(port)]
+    run(*maybe_sudo_cmd(*args, sudo=sudo))
+
+
+def _repoint_pgbackrest_conf(
+    cluster: str,
+    /,
+    *,
+    old_version: int,
+    new_version: int = VERSION,
+    root: PathLike | None = None,
+    sudo: bool = False,
+) -> None:
+    _LOGGER.info(
+        "Re-pointing 'pgbackrest.conf' to cluster '%d-%s'...", new_version, cluster
+    )
+    path = get_root(root=root) / "etc/pgbackrest/pgbackrest.conf"
+    old = str(PGHostSpec(cluster, version=old_version).path)
+    new = str(PGHostSpec(cluster, version=new_version).path)
+    text = path.read_text().replace(f"= {old}\n", f"= {new}\n")
+    with TemporaryFile(text=text) as temp:
+        copy_text(temp, path, sudo=sudo, perms="u=rw,g=r,o=r")
+
+
+def _stanza_upgrade(stanza: str, /, *, print: bool = True) -> None:  # noqa: A002
+    _LOGGER.info("Upgrading stanza %r...", stanza)
+    run_or_as_user(
+        "pgbackrest",
+        f"--stanza={stanza}",
+        "stanza-upgrade",
+        user="postgres",
+        print=print,
+        logger=_LOGGER,
+    )
+
+
+##
+
+
+def to_pg_upgrade_args(
+    cluster: str,
+    /,
+    *,
+    old_version: int,
+    new_version: int = VERSION,
+    port: int = PORT,
+    new_port: int | None = None,
+    mode: UpgradeMode = DEFAULT_UPGRADE_MODE,
+    jobs: int = JOBS,
+    check: bool = False,
+    root: PathLike | None = None,
+) -> list[str]:
+    """Build the 'pg_upgrade' command line.
+
+    The new cluster runs on a free port until the upgrade is done.
+    """
+    if new_port is None:
+        new_port = find_free_port(start=port + 1, used=get_cluster_ports())
+    args: list[str] = [str(get_pg_bin("pg_upgrade", version=new_version))]
+    for prefix, version, port_i in [
+        ("old", old_version, port),
+        ("new", new_version, new_port),
+    ]:
+        conf = get_pg_root(root=root, version=version, name=cluster) / "postgresql.conf"
+        args.extend([
+            f"--{prefix}-bindir={get_pg_bin('pg_upgrade', version=version).parent}",
+            f"--{prefix}-datadir={get_pg_data(cluster, version=version, root=root)}",
+            f"--{prefix}-options=-c config_file={conf}",
+            f"--{prefix}-port={port_i}",
+        ])
+    match mode:
+        case UpgradeMode.link | UpgradeMode.clone:
+            args.append(f"--{mode.value}")
+        case UpgradeMode.copy:
+            ...
+        case never:
+            assert_never(never)
+    args.append(f"--jobs={jobs}")
+    if check:
+        args.append("--check")
+    return args
+
+
+##
+
+
+def make_upgrade_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @argument("cluster", type=Str())
+    @argument("stanza", type=Str())
+    @option(
+        "--old-version",
+        type=int,
+        required=True,
+        help="Postgres version to upgrade from",
+    )
+    @option(
+        "--new-version",
+        type=int,
+        default=VERSION,
+        help="Postgres version to upgrade to",
+    )
+    @option("--port", type=int, default=PORT, help="Cluster port")
+    @option(
+        "--mode",
+        type=Enum(UpgradeMode),
+        default=DEFAULT_UPGRADE_MODE,
+        help="How 'pg_upgrade' transfers the data files",
+    )
+    @jobs_option
+    @root_option
+    @sudo_option
+    @flag(
+        "--summarize-wal",
+        default=False,
+        help="Summarize WAL for 'pg_basebackup --incremental'",
+    )
+    @print_option
+    def func(
+        *,
+        cluster: str,
+        stanza: str,
+        old_version: int,
+        new_version: int,
+        port: int,
+        mode: UpgradeMode,
+        jobs: int,
+        root: PathLike | None,
+        sudo: bool,
+        summarize_wal: bool,
+        print: bool,  # noqa: A002
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        upgrade(
+            cluster,
+            stanza,
+            old_version=old_version,
+            new_version=new_version,
+            port=port,
+            mode=mode,
+            jobs=jobs,
+            root=root,
+            sudo=sudo,
+            summarize_wal=summarize_wal,
+            print=print,
+        )
+
+    return cli(
+        name=name, help="Upgrade a cluster to a new major version", **CONTEXT_SETTINGS
+    )(func)
+
+
+__all__ = ["make_upgrade_cmd", "to_pg_upgrade_args", "upgrade"]
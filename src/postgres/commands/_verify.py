@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from sys import stdout
+from time import monotonic
+from typing import TYPE_CHECKING
+
+import utilities.click
+from click import command
+from utilities.click import CONTEXT_SETTINGS, flag, option
+from utilities.core import always_iterable, is_pytest, set_up_logging, to_logger
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import __version__
+from postgres._click import (
+    metrics_dir_option,
+    print_option,
+    process_max_option,
+    repo_option,
+    stanza_argument,
+    user_option,
+)
+from postgres._constants import PROCESS_MAX
+from postgres._metrics import yield_metrics
+from postgres._utilities import get_info_json, stream_or_as_user, to_repo_num
+from postgres._verify import (
+    VerifyParser,
+    VerifyResult,
+    read_verify_state,
+    select_backup_sets,
+    write_verify_state,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from click import Command
+    from utilities.types import MaybeIterable, PathLike
+
+    from postgres._types import RepoNameMapping, RepoNumOrName
+
+
+_LOGGER = to_logger(__name__)
+
+
+##
+
+
+def verify[T: str](
+    stanza: str,
+    /,
+    *,
+    repo: MaybeIterable[RepoNumOrName[T]] | None = None,
+    repo_mapping: RepoNameMapping[T] | None = None,
+    sample: int | None = None,
+    state: PathLike | None = None,
+    process_max: int = PROCESS_MAX,
+    idle: bool = False,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+    metrics_dir: PathLike | None = None,
+) -> list[VerifyResult]:
+    """Verify a stanza's backups and WAL, optionally only a sample of backup sets."""
+    repos: list[RepoNumOrName[T] | None] = (
+        [None] if repo is None else list(always_iterable(repo))
+    )
+    states = {} if state is None else read_verify_state(state)
+    results: list[VerifyResult] = []
+    for repo_i in repos:
+        repo_num = (
+            None if repo_i is None else to_repo_num(repo=repo_i, mapping=repo_mapping)
+        )
+        key = f"{stanza}/{'default' if repo_num is None else repo_num}"
+        sizes = _get_set_sizes(stanza, repo=repo_num, user=user)
+        sets: list[str | None] = (
+            [None]
+            if sample is None
+            else [*select_backup_sets(sizes, sample=sample, verified=states.get(key))]
+        )
+        for set_ in sets:
+            result = _verify_core(
+                stanza,
+                repo=repo_num,
+                set_=set_,
+                size=sum(sizes.values()) if set_ is None else sizes[set_],
+                process_max=process_max,
+                idle=idle,
+                user=user,
+                print=print,
+                metrics_dir=metrics_dir,
+            )
+            _LOGGER.info("Verified %s", result.text)
+            results.append(result)
+            if result.ok and (set_ is not None):
+                now = datetime.now(tz=UTC).isoformat(timespec="seconds")
+                states.setdefault(key, {})[set_] = now
+    if state is not None:
+        write_verify_state(states, path=state)
+    bad = [r for r in results if not r.ok]
+    if len(bad) >= 1:
+        for result in bad:
+            for path in result.bad_files:
+                _LOGGER.error("Bad file in %r: %s", result.stanza, path)
+        msg = f"Verification of {stanza!r} failed for {len(bad)} run(s)"
+        raise RuntimeError(msg)
+    return results
+
+
+def _get_set_sizes(
+    stanza: str, /, *, repo: int | None = None, user: str | None = None
+) -> dict[str, int]:
+    info = get_info_json(stanza=stanza, repo=repo, user=user)
+    return {
+        b["label"]: int(b["info"]["repository"]["size"])
+        for s in info
+        if s["name"] == stanza
+        for b in s.get("backup", [])
+    }
+
+
+def _verify_core(
+    stanza: str,
+    /,
+    *,
+    repo: int | None = None,
+    set_: str | None = None,
+    size: int = 0,
+    process_max: int = PROCESS_MAX,
+    idle: bool = False,
+    user: str | None = None,
+    print: bool = True,  # noqa: A002
+    metrics_dir: PathLike | None = None,
+) -> VerifyResult:
+    target = "all sets" if set_ is None else repr(set_)
+    _LOGGER.info("Verifying %r %s with %d process(es)...", stanza, target, process_max)
+    args: list[str] = ["pgbackrest"]
+    if repo is not None:
+        args.append(f"--repo={repo}")
+    args.extend([f"--stanza={stanza}", f"--process-max={process_max}"])
+    if set_ is not None:
+        args.append(f"--set={set_}")
+    args.extend(["--verbose", "verify"])
+    if idle:
+        args = ["ionice", "--class=3", "nice", "--adjustment=19", *args]
+    parser = VerifyParser()
+
+    def on_line(line: str, /) -> None:
+        parser.feed(line)
+        if print:
+            _ = stdout.write(f"{line}\n")
+
+    start = monotonic()
+    failed = False
+    try:
+        with yield_metrics(
+            "verify", path=metrics_dir, stanza=stanza, repo=repo, user=user
+        ):
+            stream_or_as_user(*args, user=user, on_line=on_line)
+    except RunCalledProcessError:
+        failed = True
+    bad_files = list(parser.bad_files)
+    if failed and (len(bad_files) == 0):
+        bad_files.append("<pgbackrest verify failed>")
+    return VerifyResult(
+        stanza=stanza,
+        repo=repo,
+        set_=set_,
+        duration=monotonic() - start,
+        size=size,
+        files_checked=parser.files_checked,
+        files_valid=parser.files_valid,
+        bad_files=tuple(bad_files),
+    )
+
+
+##
+
+
+def make_verify_cmd(
+    *, cli: Callable[..., Command] = command, name: str | None = None
+) -> Command:
+    @stanza_argument
+    @repo_option
+    @option(
+        "--sample",
+        type=int,
+        default=None,
+        help="Verify only this many backup sets, least recently verified first",
+    )
+    @option(
+        "--state",
+        type=utilities.click.Path(),
+        default=None,
+        help="JSON file recording when each backup set was last verified",
+    )
+    @process_max_option
+    @flag("--idle", default=False, help="Run at idle I/O and lowest CPU priority")
+    @user_option
+    @print_option
+    @metrics_dir_option
+    def func[T: str](
+        *,
+        stanza: str,
+        repo: RepoNumOrName[T] | None,
+        sample: int | None,
+        state: PathLike | None,
+        process_max: int,
+        idle: bool,
+        user: str | None,
+        print: bool,  # noqa: A002
+        metrics_dir: PathLike | None,
+    ) -> None:
+        if is_pytest():
+            return
+        set_up_logging(__name__, root=True, log_version=__version__)
+        _ = verify(
+            stanza,
+            repo=repo,
+            sample=sample,
+            state=state,
+            process_max=process_max,
+            idle=idle,
+            user=user,
+            print=print,
+            metrics_dir=metrics_dir,
+        )
+
+    return cli(
+        name=name, help="Verify the integrity of a repository", **CONTEXT_SETTINGS
+    )(func)
+
+
+__all__ = ["make_verify_cmd", "verify"]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from logging import ERROR
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from pytest import raises
+from utilities.subprocess import RunCalledProcessError
+
+from postgres.commands import backup_watch
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture, MonkeyPatch
+
+
+class _StopError(Exception): ...
+
+
+def _check(*_: Any, **__: Any) -> NoReturn:
+    raise RunCalledProcessError(cmd="pgbackrest", return_code=1, stdout="", stderr="")
+
+
+def _sleep(*_: Any, **__: Any) -> NoReturn:
+    raise _StopError
+
+
+class TestBackupWatch:
+    def test_retry(
+        self, *, monkeypatch: MonkeyPatch, caplog: LogCaptureFixture
+    ) -> None:
+        monkeypatch.setattr("postgres.commands._backup_watch._check", _check)
+        monkeypatch.setattr("postgres.commands._backup_watch.sleep", _sleep)
+        with caplog.at_level(ERROR), raises(_StopError):
+            backup_watch("main")
+        assert "Failed to check 'main'" in caplog.text
+
+    def test_once(self, *, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr("postgres.commands._backup_watch._check", _check)
+        with raises(RunCalledProcessError):
+            backup_watch("main", once=True)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from pytest import raises
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import read_clones
+from postgres.commands import clone
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+def _noop(*_: Any, **__: Any) -> None: ...
+
+
+def _run_clone_restore(*_: Any, **__: Any) -> NoReturn:
+    raise RunCalledProcessError(cmd="pgbackrest", return_code=1, stdout="", stderr="")
+
+
+class TestClone:
+    def test_failure(self, *, monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+        dropped: list[str] = []
+
+        def drop_cluster(name: str, /, **_: Any) -> None:
+            dropped.append(name)
+
+        for name in ["_create_cluster", "_set_up_pg_hba", "copy_text", "run"]:
+            monkeypatch.setattr(f"postgres.commands._clone.{name}", _noop)
+        monkeypatch.setattr(
+            "postgres.commands._clone._run_clone_restore", _run_clone_restore
+        )
+        monkeypatch.setattr("postgres.commands._clone.drop_cluster", drop_cluster)
+        with raises(RunCalledProcessError):
+            _ = clone("main", "scratch", port=50000, root=tmp_path, print=False)
+        assert dropped == ["scratch"]
+        assert read_clones(root=tmp_path) == []
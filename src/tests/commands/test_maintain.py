@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from logging import WARNING
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import BloatEstimate
+from postgres.commands import maintain
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture, MonkeyPatch
+
+
+def _get_bloat_estimates(**_: Any) -> list[BloatEstimate]:
+    return [
+        BloatEstimate(
+            dbname="db",
+            kind="table",
+            relation="public.t",
+            table="public.t",
+            size=100 * 1024**2,
+            expected_size=10 * 1024**2,
+        )
+    ]
+
+
+def _maintain_relation(*_: Any, **__: Any) -> NoReturn:
+    raise RunCalledProcessError(cmd="psql", return_code=1, stdout="", stderr="")
+
+
+class TestMaintain:
+    def test_failure(
+        self, *, monkeypatch: MonkeyPatch, caplog: LogCaptureFixture
+    ) -> None:
+        monkeypatch.setattr(
+            "postgres.commands._maintain.get_bloat_estimates", _get_bloat_estimates
+        )
+        monkeypatch.setattr(
+            "postgres.commands._maintain.maintain_relation", _maintain_relation
+        )
+        with caplog.at_level(WARNING):
+            results = maintain(dbname="db")
+        assert results == []
+        assert "Failed to maintain table db.public.t" in caplog.text
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from pytest import mark, param, raises
+from utilities.subprocess import RunCalledProcessError
+
+from postgres.commands import get_data_links
+from postgres.commands._restore import _delete_data, _get_plan
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+def _backup(label: str, /, *, repo: int, stop: int) -> dict[str, Any]:
+    return {
+        "label": label,
+        "database": {"id": 1, "repo-key": repo},
+        "timestamp": {"start": stop - 100, "stop": stop},
+        "info": {"repository": {"size": 1024, "delta": 1024}},
+        "lsn": {"start": "0/0", "stop": "0/0"},
+    }
+
+
+class TestDeleteData:
+    def test_main(self, *, tmp_path: Path) -> None:
+        data = tmp_path / "var/lib/postgresql/17/main"
+        wal, tablespace = tmp_path / "wal", tmp_path / "ts"
+        for path in [
+            data / "base",
+            data / "pg_tblspc",
+            wal / "0000",
+            tablespace / "PG_17_202406281",
+            tablespace / "PG_16_202307071",
+        ]:
+            path.mkdir(parents=True)
+        (data / "pg_wal").symlink_to(wal)
+        (data / "pg_tblspc/16384").symlink_to(tablespace)
+        _delete_data("main", version=17, root=tmp_path)
+        assert list(data.iterdir()) == []
+        assert list(wal.iterdir()) == []
+        assert list(tablespace.iterdir()) == [tablespace / "PG_16_202307071"]
+
+    def test_mapped_tablespace(self, *, tmp_path: Path) -> None:
+        (tmp_path / "var/lib/postgresql/17/main").mkdir(parents=True)
+        tablespace = tmp_path / "ts"
+        for name in ["PG_17_202406281", "PG_16_202307071", "other"]:
+            (tablespace / name).mkdir(parents=True)
+        _delete_data("main", version=17, root=tmp_path, tablespaces=[tablespace])
+        assert sorted(tablespace.iterdir()) == [
+            tablespace / "PG_16_202307071",
+            tablespace / "other",
+        ]
+
+    def test_non_empty_link(self, *, tmp_path: Path) -> None:
+        data = tmp_path / "var/lib/postgresql/17/main"
+        (data / "base").mkdir(parents=True)
+        link = tmp_path / "link"
+        (link / "sibling").mkdir(parents=True)
+        with raises(ValueError, match="to be empty"):
+            _delete_data("main", version=17, root=tmp_path, links=[link])
+        assert (data / "base").is_dir()
+        assert (link / "sibling").is_dir()
+
+
+class TestGetDataLinks:
+    def test_main(self, *, tmp_path: Path) -> None:
+        data, wal, tablespace = tmp_path / "data", tmp_path / "wal", tmp_path / "ts"
+        for path in [data / "base", data / "pg_tblspc", wal, tablespace]:
+            path.mkdir(parents=True)
+        (data / "pg_wal").symlink_to(wal)
+        (data / "pg_tblspc/16384").symlink_to(tablespace)
+        result = get_data_links(data)
+        assert result == [data / "pg_tblspc/16384", data / "pg_wal"]
+        assert [p.resolve() for p in result] == [tablespace, wal]
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert get_data_links(tmp_path / "missing") == []
+
+
+class TestGetPlan:
+    @mark.parametrize(
+        ("repo", "expected"),
+        [
+            param(None, ("f2", 2), id="latest"),
+            param(1, ("f1", 1), id="explicit"),
+            param(3, ("f3", 3), id="tie"),
+        ],
+    )
+    def test_main(
+        self, *, monkeypatch: MonkeyPatch, repo: int | None, expected: tuple[str, int]
+    ) -> None:
+        info = [
+            {
+                "name": "main",
+                "backup": [
+                    _backup("f1", repo=1, stop=1000),
+                    _backup("f3", repo=3, stop=2000),
+                    _backup("f2", repo=2, stop=2000),
+                ],
+            }
+        ]
+
+        def get_info_json(**_: Any) -> list[dict[str, Any]]:
+            return info
+
+        monkeypatch.setattr("postgres.commands._restore.get_info_json", get_info_json)
+        plan = _get_plan("main", repo=repo)
+        assert plan is not None
+        assert (plan.label, plan.repo) == expected
+
+    def test_no_backups(self, *, monkeypatch: MonkeyPatch) -> None:
+        def get_info_json(**_: Any) -> list[dict[str, Any]]:
+            return [{"name": "main"}]
+
+        monkeypatch.setattr("postgres.commands._restore.get_info_json", get_info_json)
+        assert _get_plan("main") is None
+
+    def test_info_failure(self, *, monkeypatch: MonkeyPatch) -> None:
+        def get_info_json(**_: Any) -> NoReturn:
+            raise RunCalledProcessError(
+                cmd="pgbackrest", return_code=1, stdout="", stderr=""
+            )
+
+        monkeypatch.setattr("postgres.commands._restore.get_info_json", get_info_json)
+        assert _get_plan("main") is None
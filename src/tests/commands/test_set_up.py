@@ -3,10 +3,11 @@ from __future__ import annotations
 from pathlib import Path
 
 from pydantic import SecretStr
+from pytest import raises
 from utilities.core import normalize_multi_line_str
 
 from postgres import CipherType, RepoType
-from postgres.commands import RepoSpec
+from postgres.commands import PGHostSpec, RepoSpec
 from postgres.commands._set_up import (
     _set_up_pg_hba,
     _set_up_pgbackrest,
@@ -126,11 +127,34 @@ class TestRepoSpec:
         assert text == expected
 
 
+class TestPGHostSpec:
+    def test_main(self) -> None:
+        text = PGHostSpec("cluster").text
+        expected = normalize_multi_line_str("""
+            pg1-path = /var/lib/postgresql/17/cluster
+        """)
+        assert text == expected
+
+    def test_all(self) -> None:
+        text = PGHostSpec(
+            "cluster", n=2, version=16, port=5433, host="host", host_user="postgres"
+        ).text
+        expected = normalize_multi_line_str("""
+            pg2-path = /var/lib/postgresql/16/cluster
+            pg2-port = 5433
+            pg2-host = host
+            pg2-host-user = postgres
+        """)
+        assert text == expected
+
+
 class TestSetUpPGHBA:
     def test_main(self, *, tmp_path: Path) -> None:
         _set_up_pg_hba("name", root=tmp_path)
         assert (tmp_path / "etc/postgresql/17/name/pg_hba.conf").is_file()
         assert (tmp_path / "etc/postgresql/17/name/pg_hba.conf.d/custom.conf").is_file()
+        ident = (tmp_path / "etc/postgresql/17/name/pg_ident.conf").read_text()
+        assert "superuser       root                    postgres" in ident
 
 
 class TestSetUpPGBackrest:
@@ -185,8 +209,73 @@ class TestSetUpPGBackrest:
         """)
         assert result == expected
 
+    def test_backup_standby(self, *, tmp_path: Path) -> None:
+        repo = RepoSpec(Path("path"))
+        standby = PGHostSpec("standby", port=5433)
+        _set_up_pgbackrest(
+            "cluster",
+            "stanza",
+            repo,
+            root=tmp_path,
+            process_max=1,
+            standby=standby,
+            backup_standby=True,
+        )
+        result = (tmp_path / "etc/pgbackrest/pgbackrest.conf").read_text()
+        expected = normalize_multi_line_str("""
+            [global]
+            archive-async = y
+            archive-check = y
+            process-max = 1
+            log-level-console = info
+            start-fast = y
+
+            repo1-path = /path
+
+            [global:archive-push]
+            compress-level = 3
+
+            [stanza]
+            pg1-path = /var/lib/postgresql/17/cluster
+            pg2-path = /var/lib/postgresql/17/standby
+            pg2-port = 5433
+            backup-standby = y
+        """)
+        assert result == expected
+
+    def test_port(self, *, tmp_path: Path) -> None:
+        repo = RepoSpec(Path("path"))
+        _set_up_pgbackrest(
+            "cluster", "stanza", repo, root=tmp_path, process_max=1, port=5433
+        )
+        result = (tmp_path / "etc/pgbackrest/pgbackrest.conf").read_text()
+        assert result.endswith("pg1-port = 5433\n")
+
+    def test_backup_standby_without_standby(self, *, tmp_path: Path) -> None:
+        repo = RepoSpec(Path("path"))
+        with raises(ValueError, match="Expected at least 1 standby"):
+            _set_up_pgbackrest(
+                "cluster", "stanza", repo, root=tmp_path, backup_standby=True
+            )
+
 
 class TestSetUpPostgresqlConf:
     def test_main(self, *, tmp_path: Path) -> None:
         _set_up_postgresql_conf("name", root=tmp_path)
         assert (tmp_path / "etc/postgresql/17/name/conf.d/custom.conf").is_file()
+
+    def test_summarize_wal(self, *, tmp_path: Path) -> None:
+        _set_up_postgresql_conf("name", root=tmp_path, summarize_wal=True)
+        path = tmp_path / "etc/postgresql/17/name/conf.d/custom.conf"
+        assert "summarize_wal = on" in path.read_text().splitlines()
+
+    def test_summarize_wal_before_17(self, *, tmp_path: Path) -> None:
+        _set_up_postgresql_conf("name", version=16, root=tmp_path)
+        path = tmp_path / "etc/postgresql/16/name/conf.d/custom.conf"
+        assert "summarize_wal" not in path.read_text()
+
+    def test_summarize_wal_error(self, *, tmp_path: Path) -> None:
+        with raises(ValueError, match=r"Expected version >= 17 to summarize WAL"):
+            _set_up_postgresql_conf(
+                "name", version=16, root=tmp_path, summarize_wal=True
+            )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from pydantic import SecretStr
+
+from postgres.commands import to_primary_conninfo
+from postgres.commands._set_up_standby import _run_standby_restore, _write_pgpass
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+    from tests.conftest import FakeBin
+
+
+def _chown(*_: Any, **__: Any) -> None: ...
+
+
+class TestRunStandbyRestore:
+    def test_main(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("su", run_stdin=True)
+        _ = fake_bin.add("pgbackrest")
+        conninfo = to_primary_conninfo(
+            "host", user="replicator", passfile="/var/lib/postgresql/.pgpass"
+        )
+        _run_standby_restore("main", primary_conninfo=conninfo, print=False)
+        assert fake_bin.calls("pgbackrest") == [
+            [
+                "--stanza=main",
+                "--type=standby",
+                "--recovery-option=primary_conninfo=host=host port=5432 user=replicator passfile=/var/lib/postgresql/.pgpass",
+                "restore",
+            ]
+        ]
+        assert fake_bin.calls("su") == [["-", "postgres"]]
+
+
+class TestWritePgpass:
+    def test_main(self, *, monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.setattr("postgres.commands._set_up_standby.chown", _chown)
+        path = tmp_path / "var/lib/postgresql/.pgpass"
+        path.parent.mkdir(parents=True)
+        _ = path.write_text("other:5432:*:postgres:keep\nhost:5432:*:replicator:old\n")
+        result = _write_pgpass(
+            "host", user="replicator", password=SecretStr("a:b\\c"), root=tmp_path
+        )
+        assert result == path
+        assert path.read_text() == (
+            "other:5432:*:postgres:keep\nhost:5432:*:replicator:a\\:b\\\\c\n"
+        )
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_new(self, *, monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.setattr("postgres.commands._set_up_standby.chown", _chown)
+        path = _write_pgpass("host", password=SecretStr("secret"), root=tmp_path)
+        assert path.read_text() == "host:5432:*:postgres:secret\n"
+
+
+class TestToPrimaryConninfo:
+    def test_main(self) -> None:
+        result = to_primary_conninfo("host")
+        assert result == "host=host port=5432 user=postgres"
+
+    def test_password(self) -> None:
+        result = to_primary_conninfo("host", password=SecretStr("secret"))
+        assert result == "host=host port=5432 user=postgres password=secret"
+
+    def test_application_name(self) -> None:
+        result = to_primary_conninfo("host", port=5433, application_name="standby")
+        assert result == "host=host port=5433 user=postgres application_name=standby"
+
+    def test_passfile(self) -> None:
+        result = to_primary_conninfo("host", passfile="/var/lib/postgresql/.pgpass")
+        assert (
+            result
+            == "host=host port=5432 user=postgres passfile=/var/lib/postgresql/.pgpass"
+        )
+
+    def test_quoted(self) -> None:
+        result = to_primary_conninfo("host", password=SecretStr("it's a secret"))
+        assert result == r"host=host port=5432 user=postgres password='it\'s a secret'"
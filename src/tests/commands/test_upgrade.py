@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest import mark, param, raises
+
+from postgres import UpgradeMode
+from postgres.commands import to_pg_upgrade_args, upgrade
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+class TestUpgrade:
+    def test_existing_new_cluster(self, *, tmp_path: Path) -> None:
+        (tmp_path / "etc/postgresql/17/main").mkdir(parents=True)
+        with raises(ValueError, match="drop it first"):
+            upgrade("main", "main", old_version=16, new_version=17, root=tmp_path)
+
+
+class TestToPgUpgradeArgs:
+    def test_main(self) -> None:
+        result = to_pg_upgrade_args(
+            "cluster", old_version=16, new_version=17, new_port=5433, jobs=4
+        )
+        expected = [
+            "/usr/lib/postgresql/17/bin/pg_upgrade",
+            "--old-bindir=/usr/lib/postgresql/16/bin",
+            "--old-datadir=/var/lib/postgresql/16/cluster",
+            "--old-options=-c config_file=/etc/postgresql/16/cluster/postgresql.conf",
+            "--old-port=5432",
+            "--new-bindir=/usr/lib/postgresql/17/bin",
+            "--new-datadir=/var/lib/postgresql/17/cluster",
+            "--new-options=-c config_file=/etc/postgresql/17/cluster/postgresql.conf",
+            "--new-port=5433",
+            "--link",
+            "--jobs=4",
+        ]
+        assert result == expected
+
+    @mark.parametrize(
+        ("mode", "expected"),
+        [
+            param(UpgradeMode.link, ["--link"]),
+            param(UpgradeMode.clone, ["--clone"]),
+            param(UpgradeMode.copy, []),
+        ],
+    )
+    def test_mode(self, *, mode: UpgradeMode, expected: list[str]) -> None:
+        result = to_pg_upgrade_args(
+            "cluster", old_version=16, new_port=5433, mode=mode, jobs=1
+        )
+        assert result[9:-1] == expected
+
+    def test_port(self) -> None:
+        result = to_pg_upgrade_args("cluster", old_version=16, port=6000, new_port=6005)
+        assert "--old-port=6000" in result
+        assert "--new-port=6005" in result
+
+    def test_free_port(self, *, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            "postgres.commands._upgrade.get_cluster_ports", lambda: [6001, 6002]
+        )
+        result = to_pg_upgrade_args("cluster", old_version=16, port=6000)
+        new_port = next(a for a in result if a.startswith("--new-port="))
+        assert int(new_port.removeprefix("--new-port=")) not in {6000, 6001, 6002}
+
+    def test_check(self) -> None:
+        result = to_pg_upgrade_args(
+            "cluster", old_version=16, new_port=5433, check=True
+        )
+        assert result[-1] == "--check"
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from os import pathsep
+from shlex import quote
+from typing import TYPE_CHECKING
+
+from pytest import fixture
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+@dataclass(kw_only=True, slots=True)
+class FakeBin:
+    """A directory of fake executables, prepended to 'PATH'."""
+
+    path: Path = field()
+
+    def add(
+        self,
+        name: str,
+        /,
+        *,
+        stdout: str = "",
+        lines: int = 0,
+        latency: float = 0.0,
+        exit_code: int = 0,
+        run_stdin: bool = False,
+    ) -> Path:
+        """Add a fake executable which records its arguments, sleeps, writes
+        some output and exits.
+
+        With 'run_stdin', it then runs its stdin as a script, like 'su -'.
+        """
+        calls = quote(str(self._calls(name)))
+        script = [
+            "#!/bin/sh",
+            f'[ "$#" -gt 0 ] && printf \'%s\\037\' "$@" >> {calls}',
+            f"printf '\\036' >> {calls}",
+        ]
+        if latency > 0:
+            script.append(f"sleep {latency}")
+        if stdout != "":
+            script.append(f"printf %s {quote(stdout)}")
+        if lines > 0:
+            script.append(f"yes 'fake {name} output' | head -n {lines}")
+        if run_stdin:
+            script.append("sh || exit")
+        script.append(f"exit {exit_code}")
+        path = self.path / name
+        _ = path.write_text("\n".join(script) + "\n")
+        path.chmod(0o755)
+        return path
+
+    def calls(self, name: str, /) -> list[list[str]]:
+        """Get the arguments of each call to a fake executable."""
+        try:
+            text = self._calls(name).read_text()
+        except FileNotFoundError:
+            return []
+        # unit separator after each argument, record separator after each call
+        return [call.split("\x1f")[:-1] for call in text.split("\x1e")[:-1]]
+
+    def _calls(self, name: str, /) -> Path:
+        return self.path / f".{name}.calls"
+
+
+@fixture
+def fake_bin(*, tmp_path: Path, monkeypatch: MonkeyPatch) -> FakeBin:
+    path = tmp_path / "bin"
+    path.mkdir()
+    monkeypatch.setenv("PATH", str(path), prepend=pathsep)
+    return FakeBin(path=path)
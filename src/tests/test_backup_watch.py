@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from postgres import WalStatus, get_wal_status, to_wal_status
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest import MonkeyPatch
+
+_DAY = 24 * 60 * 60
+_GIB = 1024**3
+
+
+def _backup(stop: int, lsn: str, /) -> dict[str, Any]:
+    return {"timestamp": {"start": stop - 60, "stop": stop}, "lsn": {"stop": lsn}}
+
+
+def _run_psql(lsn: str, /) -> Callable[..., str]:
+    def func(*_: Any, **__: Any) -> str:
+        return lsn
+
+    return func
+
+
+class TestGetWalStatus:
+    def test_main(self, *, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr("postgres._backup_watch.run_psql", _run_psql("1/0"))
+        status = get_wal_status([{"name": "main"}], stanza="main", now=0.0)
+        assert status == WalStatus(lsn=1 << 32)
+
+    def test_nothing_replayed(self, *, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr("postgres._backup_watch.run_psql", _run_psql(""))
+        assert get_wal_status([{"name": "main"}], stanza="main", now=0.0) is None
+
+
+class TestToWalStatus:
+    def test_main(self) -> None:
+        info = [
+            {
+                "name": "main",
+                "backup": [_backup(_DAY, "0/1000000"), _backup(2 * _DAY, "1/0")],
+            }
+        ]
+        status = to_wal_status(info, stanza="main", lsn=(2 << 32), now=2.5 * _DAY)
+        assert status.last_backup_lsn == (1 << 32)
+        assert status.last_backup_time == 2 * _DAY
+        assert status.recent_backups == 1
+        assert status.wal_since_backup == 4 * _GIB
+
+    def test_no_backups(self) -> None:
+        status = to_wal_status([{"name": "main"}], stanza="main", lsn=1, now=0.0)
+        assert status.wal_since_backup is None
+
+
+class TestWalStatusDecide:
+    def test_below_threshold(self) -> None:
+        status = WalStatus(lsn=_GIB, last_backup_lsn=0, last_backup_time=0.0)
+        run, reason = status.decide(now=_DAY, threshold=2 * _GIB)
+        assert not run
+        assert "below 2.0GiB" in reason
+
+    def test_threshold_crossed(self) -> None:
+        status = WalStatus(lsn=3 * _GIB, last_backup_lsn=0, last_backup_time=0.0)
+        run, _ = status.decide(now=_DAY, threshold=2 * _GIB)
+        assert run
+
+    def test_min_interval(self) -> None:
+        status = WalStatus(lsn=3 * _GIB, last_backup_lsn=0, last_backup_time=0.0)
+        run, reason = status.decide(now=60.0, threshold=2 * _GIB, min_interval=3600.0)
+        assert not run
+        assert "minimum interval" in reason
+
+    def test_max_per_day(self) -> None:
+        status = WalStatus(
+            lsn=3 * _GIB, last_backup_lsn=0, last_backup_time=0.0, recent_backups=4
+        )
+        run, reason = status.decide(now=_DAY, threshold=2 * _GIB, max_per_day=4)
+        assert not run
+        assert "4 backup(s)" in reason
+
+    def test_no_backup_yet(self) -> None:
+        run, reason = WalStatus(lsn=0).decide(now=0.0, threshold=_GIB)
+        assert run
+        assert reason == "no backup yet"
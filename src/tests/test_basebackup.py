@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from pytest import mark, param, raises
+
+from postgres import (
+    BackupType,
+    get_backup_chain,
+    get_incremental_base,
+    list_backup_labels,
+    to_backup_label,
+    to_backup_type,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+_LABELS = [
+    "20250101-000000F",
+    "20250102-000000I",
+    "20250103-000000D",
+    "20250104-000000I",
+]
+
+
+class TestGetBackupChain:
+    @mark.parametrize(
+        ("label", "expected"),
+        [
+            param("20250101-000000F", ["20250101-000000F"]),
+            param("20250102-000000I", ["20250101-000000F", "20250102-000000I"]),
+            param("20250103-000000D", ["20250101-000000F", "20250103-000000D"]),
+            param(None, ["20250101-000000F", "20250103-000000D", "20250104-000000I"]),
+        ],
+    )
+    def test_main(self, *, label: str | None, expected: list[str]) -> None:
+        assert get_backup_chain(_LABELS, label=label) == expected
+
+    def test_error_empty(self) -> None:
+        with raises(ValueError, match=r"Expected at least 1 backup"):
+            _ = get_backup_chain([])
+
+    def test_error_not_found(self) -> None:
+        with raises(ValueError, match=r"Backup '.*' not found"):
+            _ = get_backup_chain(_LABELS, label="20250105-000000F")
+
+    def test_error_no_parent(self) -> None:
+        with raises(ValueError, match=r"Backup '.*' has no parent"):
+            _ = get_backup_chain(["20250102-000000I"])
+
+
+class TestGetIncrementalBase:
+    @mark.parametrize(
+        ("type_", "expected"),
+        [
+            param(BackupType.full, None),
+            param(BackupType.diff, "20250101-000000F"),
+            param(BackupType.incr, "20250104-000000I"),
+        ],
+    )
+    def test_main(self, *, type_: BackupType, expected: str | None) -> None:
+        assert get_incremental_base(_LABELS, type_=type_) == expected
+
+    @mark.parametrize("type_", [param(BackupType.diff), param(BackupType.incr)])
+    def test_empty(self, *, type_: BackupType) -> None:
+        assert get_incremental_base([], type_=type_) is None
+
+
+class TestListBackupLabels:
+    def test_main(self, *, tmp_path: Path) -> None:
+        for label in ["20250102-000000I", "20250101-000000F"]:
+            (tmp_path / label).mkdir()
+            (tmp_path / label / "backup_manifest").touch()
+        (tmp_path / "20250103-000000D").mkdir()
+        (tmp_path / "other").mkdir()
+        assert list_backup_labels(tmp_path) == ["20250101-000000F", "20250102-000000I"]
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert list_backup_labels(tmp_path / "missing") == []
+
+
+class TestToBackupLabel:
+    def test_main(self) -> None:
+        now = datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+        assert to_backup_label(BackupType.diff, now=now) == "20250102-030405D"
+
+
+class TestToBackupType:
+    @mark.parametrize("type_", [param(t) for t in BackupType])
+    def test_round_trip(self, *, type_: BackupType) -> None:
+        assert to_backup_type(to_backup_label(type_)) is type_
+
+    def test_error(self) -> None:
+        with raises(ValueError, match=r"Invalid backup label 'invalid'"):
+            _ = to_backup_type("invalid")
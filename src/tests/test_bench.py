@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from postgres import (
+    BenchResult,
+    append_bench_history,
+    parse_pgbench_output,
+    percentile,
+    read_bench_history,
+    read_pgbench_latencies,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+_OUTPUT = """\
+transaction type: <builtin: select only>
+scaling factor: 10
+query mode: simple
+number of clients: 8
+number of threads: 8
+duration: 60 s
+number of transactions actually processed: 1234567
+number of failed transactions: 0 (0.000%)
+latency average = 0.389 ms
+initial connection time = 12.345 ms
+tps = 20576.116667 (without initial connection time)
+"""
+
+
+class TestParsePgbenchOutput:
+    def test_main(self) -> None:
+        assert parse_pgbench_output(_OUTPUT) == (20576.116667, 0.389, 1234567)
+
+    def test_empty(self) -> None:
+        assert parse_pgbench_output("") == (0.0, None, 0)
+
+
+class TestPercentile:
+    def test_main(self) -> None:
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+
+    def test_unsorted(self) -> None:
+        assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+
+    def test_empty(self) -> None:
+        assert percentile([], 50) is None
+
+
+class TestReadPgbenchLatencies:
+    def test_main(self, *, tmp_path: Path) -> None:
+        path1 = tmp_path / "pgbench_log.1"
+        _ = path1.write_text("0 1 1500 0 1700000000 123\n1 1 250 0 1700000000 456\n")
+        path2 = tmp_path / "pgbench_log.1.1"
+        _ = path2.write_text("2 1 3000 0 1700000000 789\n")
+        assert read_pgbench_latencies([path1, path2]) == [1.5, 0.25, 3.0]
+
+
+class TestReadAndAppendBenchHistory:
+    def test_main(self, *, tmp_path: Path) -> None:
+        result = BenchResult(
+            timestamp="2024-01-01T00:00:00+00:00",
+            host="host",
+            label="default",
+            server_version="17.2",
+            scale=10,
+            workload="select-only",
+            clients=8,
+            jobs=8,
+            duration=60,
+            transactions=1234567,
+            tps=20576.1,
+            latency_avg_ms=0.389,
+            latency_p50_ms=0.35,
+            latency_p95_ms=0.6,
+            latency_p99_ms=0.9,
+        )
+        path = tmp_path / "dir" / "history.jsonl"
+        append_bench_history([result], path=path)
+        append_bench_history([result], path=path)
+        assert read_bench_history(path) == [result, result]
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert read_bench_history(tmp_path / "history.jsonl") == []
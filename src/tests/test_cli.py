@@ -10,14 +10,30 @@ from utilities.subprocess import run
 
 from postgres._cli import (
     backup_cli,
+    backup_watch_cli,
+    bench_cli,
     check_cli,
+    clone_cli,
+    databases_cli,
+    dump_cli,
+    expire_cli,
+    fleet_cli,
     group_cli,
     info_cli,
+    load_cli,
+    maintain_cli,
+    pooler_cli,
+    prune_clones_cli,
+    repo_stats_cli,
     restore_cli,
     set_up_cli,
+    set_up_standby_cli,
     stanza_create_cli,
     start_cli,
     stop_cli,
+    top_queries_cli,
+    upgrade_cli,
+    verify_cli,
 )
 
 if TYPE_CHECKING:
@@ -31,18 +47,70 @@ class TestCLI:
             # backup
             param(backup_cli, ["stanza"]),
             param(group_cli, ["backup", "stanza"]),
+            # backup-watch
+            param(backup_watch_cli, ["stanza"]),
+            param(group_cli, ["backup-watch", "stanza"]),
+            # bench
+            param(bench_cli, []),
+            param(group_cli, ["bench"]),
             # check
             param(check_cli, []),
             param(group_cli, ["check"]),
+            # clone
+            param(clone_cli, ["stanza", "name"]),
+            param(group_cli, ["clone", "stanza", "name"]),
+            # databases
+            param(databases_cli, ["stanza"]),
+            param(group_cli, ["databases", "stanza"]),
+            # dump
+            param(dump_cli, ["dbname", "path"]),
+            param(group_cli, ["dump", "dbname", "path"]),
+            # expire
+            param(expire_cli, ["stanza"]),
+            param(group_cli, ["expire", "stanza"]),
+            # fleet
+            param(fleet_cli, ["check"]),
+            param(group_cli, ["fleet", "check"]),
             # info
             param(info_cli, []),
             param(group_cli, ["info"]),
+            # load
+            param(load_cli, ["dbname", "path"]),
+            param(group_cli, ["load", "dbname", "path"]),
+            # maintain
+            param(maintain_cli, ["--dry-run"]),
+            param(group_cli, ["maintain", "--dry-run"]),
+            # pooler
+            param(pooler_cli, ["status"]),
+            param(group_cli, ["pooler", "status"]),
+            # prune-clones
+            param(prune_clones_cli, []),
+            param(group_cli, ["prune-clones"]),
+            # repo-stats
+            param(repo_stats_cli, []),
+            param(group_cli, ["repo-stats"]),
             # restore
             param(restore_cli, ["cluster", "stanza"]),
             param(group_cli, ["restore", "cluster", "stanza"]),
             # set-up
             param(set_up_cli, ["cluster", "stanza", "path"]),
             param(group_cli, ["set-up", "cluster", "stanza", "path"]),
+            # set-up-standby
+            param(
+                set_up_standby_cli,
+                ["cluster", "stanza", "path", "--primary-host", "host"],
+            ),
+            param(
+                group_cli,
+                [
+                    "set-up-standby",
+                    "cluster",
+                    "stanza",
+                    "path",
+                    "--primary-host",
+                    "host",
+                ],
+            ),
             # stanza-create
             param(stanza_create_cli, ["stanza"]),
             param(group_cli, ["stanza-create", "stanza"]),
@@ -52,6 +120,15 @@ class TestCLI:
             # stop
             param(stop_cli, []),
             param(group_cli, ["stop"]),
+            # top-queries
+            param(top_queries_cli, []),
+            param(group_cli, ["top-queries"]),
+            # upgrade
+            param(upgrade_cli, ["cluster", "stanza", "--old-version", "16"]),
+            param(group_cli, ["upgrade", "cluster", "stanza", "--old-version", "16"]),
+            # verify
+            param(verify_cli, ["stanza"]),
+            param(group_cli, ["verify", "stanza"]),
             # version
             param(group_cli, ["--version"]),
         ],
@@ -67,14 +144,30 @@ class TestCLI:
         "arg",
         [
             param("backup"),
+            param("backup-watch"),
+            param("bench"),
             param("check"),
             param("cli"),
+            param("clone"),
+            param("databases"),
+            param("dump"),
+            param("expire"),
+            param("fleet"),
             param("info"),
+            param("load"),
+            param("maintain"),
+            param("pooler"),
+            param("prune-clones"),
+            param("repo-stats"),
             param("restore"),
             param("stanza-create"),
             param("set-up"),
+            param("set-up-standby"),
             param("start"),
             param("stop"),
+            param("top-queries"),
+            param("upgrade"),
+            param("verify"),
         ],
     )
     @throttle_test(duration=MINUTE)
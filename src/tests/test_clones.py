@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from postgres import (
+    CloneSpec,
+    find_free_port,
+    get_clones_path,
+    get_cluster_ports,
+    read_clones,
+    to_clone_spec,
+    write_clones,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+    from tests.conftest import FakeBin
+
+
+_NOW = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+class TestCloneSpec:
+    def test_json(self, *, tmp_path: Path) -> None:
+        spec = to_clone_spec("name", "stanza", port=5433, datadir=tmp_path, now=_NOW)
+        assert CloneSpec.from_json(spec.to_json()) == spec
+
+    def test_is_expired(self, *, tmp_path: Path) -> None:
+        spec = to_clone_spec(
+            "name",
+            "stanza",
+            port=5433,
+            datadir=tmp_path,
+            ttl=timedelta(hours=1),
+            now=_NOW,
+        )
+        assert not spec.is_expired(now=_NOW + timedelta(minutes=59))
+        assert spec.is_expired(now=_NOW + timedelta(hours=1))
+
+
+class TestFindFreePort:
+    def test_main(self) -> None:
+        port = find_free_port(start=50000)
+        assert port >= 50000
+
+    def test_used(self) -> None:
+        port = find_free_port(start=50000, used=range(50000, 50010))
+        assert port >= 50010
+
+
+class TestGetClusterPorts:
+    def test_main(self, *, fake_bin: FakeBin) -> None:
+        stdout = "17 main  5432 online postgres /d/main /l/main\n17 clone 5433 down postgres /d/clone /l/clone\n"
+        _ = fake_bin.add("pg_lsclusters", stdout=stdout)
+        assert get_cluster_ports() == [5432, 5433]
+
+    def test_failure(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pg_lsclusters", exit_code=1)
+        assert get_cluster_ports() == []
+
+    def test_missing(self, *, monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.setenv("PATH", str(tmp_path))
+        assert get_cluster_ports() == []
+
+
+class TestReadAndWriteClones:
+    def test_main(self, *, tmp_path: Path) -> None:
+        clones = [
+            to_clone_spec(n, "stanza", port=p, datadir=tmp_path, now=_NOW)
+            for n, p in [("b", 5434), ("a", 5433)]
+        ]
+        write_clones(clones, root=tmp_path)
+        assert get_clones_path(root=tmp_path).is_file()
+        assert read_clones(root=tmp_path) == sorted(clones)
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert read_clones(root=tmp_path) == []
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from json import dumps
+from typing import TYPE_CHECKING, Any
+
+from pytest import mark, param, raises
+
+from postgres import (
+    DatabaseSize,
+    format_database_sizes,
+    get_database_sizes,
+    is_database_restored,
+    parse_manifest_sizes,
+)
+
+if TYPE_CHECKING:
+    from pytest import MonkeyPatch
+
+
+_MANIFEST = """\
+[backup]
+backup-label="20250101-000000F"
+
+[target:file]
+pg_data/PG_VERSION={"size":3,"timestamp":1}
+pg_data/base/1/1255={"checksum":"abc","size":100,"timestamp":1}
+pg_data/base/16384/16385={"size":1000,"timestamp":1}
+pg_data/base/16384/16386={"size":24,"timestamp":1}
+pg_data/global/1260={"size":8,"timestamp":1}
+pg_tblspc/16390/PG_17_202406281/16384/16391={"size":2000,"timestamp":1}
+
+[target:path]
+pg_data/base/16384={}
+"""
+
+
+def _backup(label: str, /, *, repo: int, stop: int) -> dict[str, Any]:
+    return {
+        "label": label,
+        "database": {"id": 1, "repo-key": repo},
+        "timestamp": {"start": stop - 100, "stop": stop},
+        "database-list": [
+            {"name": "big", "oid": 16384},
+            {"name": "postgres", "oid": 1},
+        ],
+    }
+
+
+class TestGetDatabaseSizes:
+    def _patch(self, monkeypatch: MonkeyPatch, /) -> list[list[str]]:
+        info = [
+            {
+                "name": "main",
+                "backup": [
+                    _backup("f2", repo=2, stop=2000),
+                    _backup("f1", repo=1, stop=1000),
+                ],
+            }
+        ]
+        calls: list[list[str]] = []
+
+        def get_info_json(**_: Any) -> list[dict[str, Any]]:
+            return info
+
+        def run_or_as_user(*args: str, **_: Any) -> str:
+            calls.append(list(args))
+            return _MANIFEST if "repo-get" in args else dumps(info)
+
+        monkeypatch.setattr("postgres._databases.get_info_json", get_info_json)
+        monkeypatch.setattr("postgres._databases.run_or_as_user", run_or_as_user)
+        return calls
+
+    def test_main(self, *, monkeypatch: MonkeyPatch) -> None:
+        calls = self._patch(monkeypatch)
+        result = get_database_sizes("main")
+        assert result == [
+            DatabaseSize(name="big", oid=16384, size=3024),
+            DatabaseSize(name="postgres", oid=1, size=100),
+        ]
+        assert calls[0] == [
+            "pgbackrest",
+            "--repo=2",
+            "--stanza=main",
+            "repo-get",
+            "backup/main/f2/backup.manifest",
+        ]
+        assert calls[1][1:4] == ["--repo=2", "--stanza=main", "--set=f2"]
+
+    def test_set(self, *, monkeypatch: MonkeyPatch) -> None:
+        calls = self._patch(monkeypatch)
+        _ = get_database_sizes("main", set_="f1")
+        assert calls[0][1:2] == ["--repo=1"]
+        assert calls[0][-1] == "backup/main/f1/backup.manifest"
+
+    def test_missing_set(self, *, monkeypatch: MonkeyPatch) -> None:
+        _ = self._patch(monkeypatch)
+        with raises(ValueError, match="no backup set 'f3'"):
+            _ = get_database_sizes("main", set_="f3")
+
+
+class TestFormatDatabaseSizes:
+    def test_main(self) -> None:
+        sizes = [
+            DatabaseSize(name="big", oid=16384, size=3 * 1024**2),
+            DatabaseSize(name="postgres", oid=5, size=1024**2),
+        ]
+        result = format_database_sizes(sizes, exclude="big")
+        expected = (
+            "big           3.0MiB (skipped)\n"
+            "postgres      1.0MiB\n"
+            "Restoring 1.0MiB of 4.0MiB (saving 3.0MiB)"
+        )
+        assert result == expected
+
+
+class TestIsDatabaseRestored:
+    @mark.parametrize(
+        ("name", "include", "exclude", "expected"),
+        [
+            param("db", None, None, True),
+            param("db", ["db"], None, True),
+            param("db", ["other"], None, False),
+            param("db", None, ["db"], False),
+            param("db", None, "other", True),
+            param("postgres", ["db"], None, True),
+            param("template1", None, ["template1"], True),
+        ],
+    )
+    def test_main(
+        self,
+        *,
+        name: str,
+        include: list[str] | None,
+        exclude: list[str] | str | None,
+        expected: bool,
+    ) -> None:
+        result = is_database_restored(name, include=include, exclude=exclude)
+        assert result is expected
+
+
+class TestParseManifestSizes:
+    def test_main(self) -> None:
+        assert parse_manifest_sizes(_MANIFEST) == {1: 100, 16384: 3024}
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import (
+    FleetAction,
+    FleetMember,
+    format_fleet_results,
+    read_inventory,
+    run_fleet,
+    summarize_info,
+    write_inventory,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestReadWriteInventory:
+    def test_main(self, *, tmp_path: Path) -> None:
+        members = [
+            FleetMember(cluster="main", stanza="main", repos=(1, 2)),
+            FleetMember(cluster="other", version=16, port=5433, stanza="other"),
+        ]
+        path = tmp_path.joinpath("inventory.json")
+        write_inventory(members, path=path)
+        assert read_inventory(path) == members
+
+    def test_defaults(self, *, tmp_path: Path) -> None:
+        path = tmp_path.joinpath("inventory.json")
+        _ = path.write_text('[{"cluster": "main", "stanza": "main"}]')
+        (member,) = read_inventory(path)
+        assert member.repos == ()
+
+
+class TestRunFleet:
+    def test_main(self) -> None:
+        members = [
+            FleetMember(cluster="a", stanza="a"),
+            FleetMember(cluster="b", stanza="b"),
+        ]
+
+        def func(member: FleetMember, /) -> str:
+            if member.cluster == "b":
+                raise RunCalledProcessError(
+                    cmd="pgbackrest",
+                    return_code=56,
+                    stdout="",
+                    stderr="WARN: retrying\nERROR: [056]\n",
+                )
+            return "fine"
+
+        results = run_fleet(members, func, action=FleetAction.check, jobs=2)
+        assert [(r.member.cluster, r.ok, r.detail) for r in results] == [
+            ("a", True, "fine"),
+            ("b", False, "ERROR: [056]"),
+        ]
+        text = format_fleet_results(results)
+        assert "FAILED" in text
+        assert text.endswith("1 ok, 1 failed")
+
+    def test_no_stderr(self) -> None:
+        def func(_: FleetMember, /) -> str:
+            raise RunCalledProcessError(
+                cmd="pgbackrest", return_code=1, stdout="", stderr=""
+            )
+
+        results = run_fleet(
+            [FleetMember(cluster="a", stanza="a")], func, action=FleetAction.check
+        )
+        assert [r.detail for r in results] == ["exit code 1"]
+
+    def test_other_error(self) -> None:
+        members = [
+            FleetMember(cluster="a", stanza="a"),
+            FleetMember(cluster="b", stanza="b"),
+        ]
+
+        def func(member: FleetMember, /) -> str:
+            if member.cluster == "b":
+                key = "backup"
+                raise KeyError(key)
+            return "fine"
+
+        results = run_fleet(members, func, action=FleetAction.info, jobs=2)
+        assert [(r.member.cluster, r.ok, r.detail) for r in results] == [
+            ("a", True, "fine"),
+            ("b", False, "KeyError('backup')"),
+        ]
+
+
+class TestSummarizeInfo:
+    def test_main(self) -> None:
+        info = [
+            {
+                "name": "main",
+                "status": {"message": "ok"},
+                "backup": [{"label": "20240101-000000F"}],
+            }
+        ]
+        assert (
+            summarize_info(info, stanza="main")
+            == "ok; 1 backup(s), last 20240101-000000F"
+        )
+
+    def test_no_backups(self) -> None:
+        info = [{"name": "main", "status": {"message": "no valid backups"}}]
+        assert summarize_info(info, stanza="main") == "no valid backups; no backups"
+
+    def test_missing(self) -> None:
+        assert summarize_info([], stanza="main") == "missing"
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from json import dumps
+from subprocess import run as subprocess_run
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from pytest import raises
+from utilities.pytest import skipif_ci
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import (
+    BackupEngine,
+    FleetAction,
+    FleetMember,
+    run_or_as_user,
+    stream_or_as_user,
+    write_inventory,
+)
+from postgres.commands import (
+    backup,
+    check,
+    dump,
+    expire,
+    fleet,
+    info,
+    load,
+    stanza_create,
+    start,
+    stop,
+    verify,
+)
+from postgres.commands._set_up import _restart_cluster
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+    from tests.conftest import FakeBin
+
+
+def _no_driver(**_: Any) -> bool:
+    return False
+
+
+class TestFakeBin:
+    def test_calls(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        run_or_as_user("pgbackrest", "--stanza=main", "info", "with space")
+        run_or_as_user("pgbackrest")
+        assert fake_bin.calls("pgbackrest") == [
+            ["--stanza=main", "info", "with space"],
+            [],
+        ]
+
+    def test_no_calls(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        assert fake_bin.calls("pgbackrest") == []
+
+    def test_output(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest", stdout="header\n", lines=3)
+        output = run_or_as_user("pgbackrest", return_stdout=True)
+        assert output.splitlines() == ["header", *(3 * ["fake pgbackrest output"])]
+
+    def test_failure(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest", exit_code=56)
+        with raises(RunCalledProcessError) as exc_info:
+            run_or_as_user("pgbackrest", "check")
+        assert exc_info.value.return_code == 56
+
+    def test_shell(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("su", run_stdin=True)
+        _ = fake_bin.add("pgbackrest", stdout="ok")
+        output = run_or_as_user(
+            "pgbackrest", "info", user="postgres", return_stdout=True
+        )
+        assert output == "ok"
+        assert fake_bin.calls("su") == [["-", "postgres"]]
+        assert fake_bin.calls("pgbackrest") == [["info"]]
+
+
+class TestCommands:
+    def test_backup_fan_out(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        backup("main", repo=[1, 2], print=False)
+        assert fake_bin.calls("pgbackrest") == [
+            ["--repo=1", "--stanza=main", "--type=incr", "backup"],
+            ["--repo=2", "--stanza=main", "--type=incr", "backup"],
+        ]
+
+    def test_backup_failure(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest", exit_code=1)
+        with raises(RunCalledProcessError):
+            backup("main", repo=[1, 2], print=False)
+        assert len(fake_bin.calls("pgbackrest")) == 1
+
+    def test_basebackup_metrics(
+        self, *, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        def basebackup(*_: Any, **__: Any) -> Path:
+            return tmp_path
+
+        monkeypatch.setattr("postgres.commands._backup.basebackup", basebackup)
+        backup(
+            "main",
+            engine=BackupEngine.pg_basebackup,
+            path=tmp_path,
+            metrics_dir=tmp_path,
+            print=False,
+        )
+        text = (tmp_path / "pgbackrest_backup_main_incr.prom").read_text()
+        assert 'pgbackrest_backup_exit_status{stanza="main",type="incr"} 0' in text
+
+    def test_basebackup_repo(self, *, tmp_path: Path) -> None:
+        with raises(ValueError, match="Expected no 'repo'"):
+            backup("main", repo=1, engine=BackupEngine.pg_basebackup, path=tmp_path)
+
+    def test_dump_relative_path(
+        self, *, fake_bin: FakeBin, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        _ = fake_bin.add("pg_dump")
+        monkeypatch.chdir(tmp_path)
+        _ = dump("db", "db.dump", print=False)
+        assert f"--file={tmp_path / 'db.dump'}" in fake_bin.calls("pg_dump")[0]
+
+    def test_load_relative_path(
+        self, *, fake_bin: FakeBin, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        _ = fake_bin.add("pg_restore")
+        monkeypatch.chdir(tmp_path)
+        _ = load("db", "db.dump", jobs=1, print=False)
+        assert str(tmp_path / "db.dump") in fake_bin.calls("pg_restore")[0]
+
+    def test_restart_cluster(
+        self, *, fake_bin: FakeBin, monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("postgres._recovery.has_driver", _no_driver)
+        monkeypatch.setattr("postgres._utilities.has_driver", _no_driver)
+        _ = fake_bin.add("su", run_stdin=True)
+        _ = fake_bin.add("pg_ctlcluster")
+        _ = fake_bin.add("pg_isready")
+        _ = fake_bin.add("psql", stdout="f||")
+        _restart_cluster("main", version=17, port=5433)
+        assert fake_bin.calls("pg_ctlcluster") == [["17", "main", "restart"]]
+        assert fake_bin.calls("pg_isready") == [["--port=5433", "--quiet"]]
+        assert len(fake_bin.calls("psql")) == 1
+        assert fake_bin.calls("su") == 2 * [["-", "postgres"]]
+
+    def test_check(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        check(stanza="main", print=False)
+        assert fake_bin.calls("pgbackrest") == [["--stanza=main", "check"]]
+
+    def test_expire(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        expire("main", repo=2, print=False)
+        assert fake_bin.calls("pgbackrest") == [["--repo=2", "--stanza=main", "expire"]]
+
+    def test_info(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        info(stanza="main", print=False)
+        assert fake_bin.calls("pgbackrest") == [["--stanza=main", "info"]]
+
+    def test_stanza_create(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        stanza_create("main", print=False)
+        assert fake_bin.calls("pgbackrest") == [["--stanza=main", "stanza-create"]]
+
+    def test_start(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        start(stanza="main", print=False)
+        start(print=False)
+        assert fake_bin.calls("pgbackrest") == [["--stanza=main", "start"], ["start"]]
+
+    def test_stop(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest")
+        stop(stanza="main", print=False)
+        assert fake_bin.calls("pgbackrest") == [["--stanza=main", "stop"]]
+
+    def test_fleet(self, *, fake_bin: FakeBin, tmp_path: Path) -> None:
+        _ = fake_bin.add("pgbackrest")
+        members = [
+            FleetMember(cluster="a", stanza="a", port=5432),
+            FleetMember(cluster="b", stanza="b", port=5433, repos=(1, 2)),
+        ]
+        inventory = tmp_path.joinpath("inventory.json")
+        write_inventory(members, path=inventory)
+        json_path = tmp_path.joinpath("results.json")
+        results = fleet(
+            FleetAction.backup, inventory=inventory, jobs=2, json_path=json_path
+        )
+        assert all(r.ok for r in results)
+        assert sorted(fake_bin.calls("pgbackrest")) == [
+            ["--repo=1", "--stanza=b", "--type=incr", "backup"],
+            ["--repo=2", "--stanza=b", "--type=incr", "backup"],
+            ["--stanza=a", "--type=incr", "backup"],
+        ]
+        assert json_path.exists()
+
+    def test_verify_sample(self, *, fake_bin: FakeBin, tmp_path: Path) -> None:
+        backups = [
+            {"label": label, "info": {"repository": {"size": 1024}}}
+            for label in ["20240101-000000F", "20240102-000000F"]
+        ]
+        _ = fake_bin.add(
+            "pgbackrest", stdout=dumps([{"name": "main", "backup": backups}])
+        )
+        state = tmp_path / "verify.json"
+        for _ in range(2):
+            _ = verify("main", sample=1, state=state, process_max=2, print=False)
+        sets = [c[-3] for c in fake_bin.calls("pgbackrest") if c[-1] == "verify"]
+        assert sets == ["--set=20240101-000000F", "--set=20240102-000000F"]
+
+
+@skipif_ci
+class TestOverhead:
+    def test_run_or_as_user(self, *, fake_bin: FakeBin) -> None:
+        path = fake_bin.add("pgbackrest")
+        n = 20
+        start = perf_counter()
+        for _ in range(n):
+            _ = subprocess_run([path], check=True)
+        baseline = (perf_counter() - start) / n
+        start = perf_counter()
+        for _ in range(n):
+            run_or_as_user("pgbackrest", "info")
+        wrapped = (perf_counter() - start) / n
+        assert wrapped - baseline <= 0.05
+
+    def test_su_hop(self, *, fake_bin: FakeBin) -> None:
+        # the wrapper's cost of a hop; the user's login profile comes on top
+        _ = fake_bin.add("su", run_stdin=True)
+        _ = fake_bin.add("pgbackrest")
+        n = 20
+        start = perf_counter()
+        for _ in range(n):
+            run_or_as_user("pgbackrest", "info")
+        direct = (perf_counter() - start) / n
+        start = perf_counter()
+        for _ in range(n):
+            run_or_as_user("pgbackrest", "info", user="postgres")
+        hop = (perf_counter() - start) / n
+        assert hop - direct <= 0.05
+
+    def test_latency(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest", latency=0.2)
+        start = perf_counter()
+        run_or_as_user("pgbackrest", "info")
+        assert 0.2 <= perf_counter() - start <= 0.5
+
+    def test_output_volume(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest", lines=100_000)
+        start = perf_counter()
+        output = run_or_as_user("pgbackrest", "info", return_stdout=True)
+        assert len(output.splitlines()) == 100_000
+        assert perf_counter() - start <= 5.0
+
+    def test_stream_output_volume(self, *, fake_bin: FakeBin) -> None:
+        _ = fake_bin.add("pgbackrest", lines=100_000)
+        lines: list[str] = []
+        start = perf_counter()
+        stream_or_as_user("pgbackrest", "backup", on_line=lines.append)
+        assert len(lines) == 100_000
+        assert perf_counter() - start <= 5.0
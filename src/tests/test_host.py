@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest import mark, param, raises
+
+from postgres import (
+    HostTuning,
+    get_cluster_shared_buffers,
+    get_host_tuning,
+    get_hugepage_size,
+    get_nr_hugepages,
+    parse_memory,
+    write_host_tuning,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestParseMemory:
+    @mark.parametrize(
+        ("text", "expected"),
+        [
+            param("128MB", 128 * 1024**2),
+            param("8GB", 8 * 1024**3),
+            param("512kB", 512 * 1024),
+            param("16384", 16384 * 8192),
+        ],
+    )
+    def test_main(self, *, text: str, expected: int) -> None:
+        assert parse_memory(text) == expected
+
+    def test_error(self) -> None:
+        with raises(ValueError, match="Invalid memory setting '8 gigs'"):
+            _ = parse_memory("8 gigs")
+
+
+class TestGetNrHugepages:
+    def test_large(self) -> None:
+        # 8GiB plus 5% in 2MiB pages
+        assert get_nr_hugepages(8 * 1024**3) == 4301
+
+    def test_small(self) -> None:
+        # 128MiB plus the 64MiB floor
+        assert get_nr_hugepages(128 * 1024**2) == 96
+
+
+class TestGetHugepageSize:
+    def test_main(self, *, tmp_path: Path) -> None:
+        path = tmp_path.joinpath("proc/meminfo")
+        path.parent.mkdir()
+        _ = path.write_text("MemTotal: 1 kB\nHugepagesize:    1048576 kB\n")
+        assert get_hugepage_size(root=tmp_path) == 1024**3
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert get_hugepage_size(root=tmp_path) == 2 * 1024**2
+
+
+class TestHostTuning:
+    def test_get(self, *, tmp_path: Path) -> None:
+        tuning = get_host_tuning(shared_buffers="8GB", root=tmp_path)
+        assert tuning == HostTuning(nr_hugepages=4301)
+
+    def test_others(self, *, tmp_path: Path) -> None:
+        tuning = get_host_tuning(shared_buffers="8GB", others=["8GB"], root=tmp_path)
+        assert tuning == HostTuning(nr_hugepages=2 * 4301)
+
+    def test_cluster_shared_buffers(self, *, tmp_path: Path) -> None:
+        for version, name, conf in [
+            (17, "main", "shared_buffers = 8GB"),
+            (17, "other", "shared_buffers = 2GB"),
+            (16, "old", ""),
+        ]:
+            pg_root = tmp_path / f"etc/postgresql/{version}/{name}"
+            (pg_root / "conf.d").mkdir(parents=True)
+            _ = (pg_root / "postgresql.conf").write_text("shared_buffers = 128MB\n")
+            _ = (pg_root / "conf.d/custom.conf").write_text(f"{conf}\n")
+        result = get_cluster_shared_buffers(root=tmp_path, exclude=(17, "main"))
+        assert result == ["128MB", "2GB"]
+
+    def test_write(self, *, tmp_path: Path) -> None:
+        tuning = HostTuning(nr_hugepages=100, swappiness=10)
+        sysctl, tmpfiles = write_host_tuning(tuning, root=tmp_path)
+        assert sysctl == tmp_path / "etc/sysctl.d/60-postgres.conf"
+        lines = sysctl.read_text().splitlines()
+        assert "vm.nr_hugepages = 100" in lines
+        assert "vm.dirty_background_ratio = 3" in lines
+        assert "vm.dirty_ratio = 10" in lines
+        assert "vm.swappiness = 10" in lines
+        settings = [line for line in lines if not line.startswith("#") and line != ""]
+        assert all("#" not in line for line in settings)
+        assert "/sys/kernel/mm/transparent_hugepage/enabled" in tmpfiles.read_text()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from utilities.core import normalize_multi_line_str
+
+from postgres import TableTimer
+
+# excerpts of real '--verbose' output; one clock tick per line
+_PG_DUMP_SERIAL = normalize_multi_line_str("""
+    pg_dump: saving database definition
+    pg_dump: dumping contents of table "public.Mixed Case"
+    pg_dump: dumping contents of table "public.a"
+    pg_dump: dumping contents of table "s.b"
+""")
+_PG_DUMP_PARALLEL = normalize_multi_line_str("""
+    pg_dump: saving database definition
+    pg_dump: executing SELECT pg_catalog.set_config('search_path', '', false);
+    pg_dump: executing SELECT pg_catalog.set_config('search_path', '', false);
+    pg_dump: dumping contents of table "public.a"
+    pg_dump: dumping contents of table "s.b"
+    pg_dump: finished item 2574 TABLE DATA b
+    pg_dump: dumping contents of table "public.Mixed Case"
+    pg_dump: finished item 2575 TABLE DATA Mixed Case
+    pg_dump: finished item 2573 TABLE DATA a
+""")
+_PG_RESTORE_SERIAL = normalize_multi_line_str("""
+    pg_restore: creating TABLE "public.Mixed Case"
+    pg_restore: creating TABLE "public.a"
+    pg_restore: creating TABLE "s.b"
+    pg_restore: processing data for table "public.Mixed Case"
+    pg_restore: processing data for table "public.a"
+    pg_restore: processing data for table "s.b"
+    pg_restore: creating INDEX "public.a_g_idx"
+""")
+_PG_RESTORE_PARALLEL = normalize_multi_line_str("""
+    pg_restore: entering main parallel loop
+    pg_restore: launching item 2573 TABLE DATA a
+    pg_restore: launching item 2574 TABLE DATA b
+    pg_restore: executing SELECT pg_catalog.set_config('search_path', '', false);
+    pg_restore: executing SELECT pg_catalog.set_config('search_path', '', false);
+    pg_restore: processing data for table "s.b"
+    pg_restore: processing data for table "public.a"
+    pg_restore: finished item 2574 TABLE DATA b
+    pg_restore: launching item 2575 TABLE DATA Mixed Case
+    pg_restore: processing data for table "public.Mixed Case"
+    pg_restore: finished item 2575 TABLE DATA Mixed Case
+    pg_restore: finished item 2573 TABLE DATA a
+    pg_restore: launching item 2425 INDEX a_g_idx
+    pg_restore: creating INDEX "public.a_g_idx"
+    pg_restore: finished item 2425 INDEX a_g_idx
+    pg_restore: finished main parallel loop
+""")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        super().__init__()
+        self.now = -1.0
+
+    def __call__(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+def _feed(text: str, /, *, parallel: bool = False) -> TableTimer:
+    timer = TableTimer(clock=_Clock(), parallel=parallel)
+    for line in text.splitlines():
+        timer.feed(line)
+    timer.close()
+    return timer
+
+
+class TestTableTimer:
+    def test_pg_dump_serial(self) -> None:
+        timer = _feed(_PG_DUMP_SERIAL)
+        assert timer.timings == {"public.Mixed Case": 1.0, "public.a": 1.0, "s.b": 1.0}
+
+    def test_pg_dump_parallel(self) -> None:
+        timer = _feed(_PG_DUMP_PARALLEL, parallel=True)
+        assert timer.timings == {"public.a": 5.0, "s.b": 1.0, "public.Mixed Case": 1.0}
+        assert timer.slowest(1) == [("public.a", 5.0)]
+
+    def test_pg_restore_serial(self) -> None:
+        timer = _feed(_PG_RESTORE_SERIAL)
+        assert timer.timings == {"public.Mixed Case": 1.0, "public.a": 1.0, "s.b": 1.0}
+
+    def test_pg_restore_parallel(self) -> None:
+        timer = _feed(_PG_RESTORE_PARALLEL, parallel=True)
+        assert timer.timings == {"s.b": 2.0, "public.a": 5.0, "public.Mixed Case": 1.0}
+
+    def test_ignores_other_lines(self) -> None:
+        timer = _feed("pg_dump: reading extensions\n")
+        assert timer.timings == {}
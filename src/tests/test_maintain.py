@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from postgres import (
+    BloatEstimate,
+    MaintenanceResult,
+    estimate_expected_size,
+    estimate_freed,
+    group_by_table,
+    read_maintain_state,
+    select_bloated,
+    write_maintain_state,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _estimate(
+    relation: str,
+    /,
+    *,
+    size: int,
+    expected_size: int,
+    table: str | None = None,
+    changes: int = 0,
+) -> BloatEstimate:
+    return BloatEstimate(
+        dbname="db",
+        kind="table" if table is None else "index",
+        relation=relation,
+        table=relation if table is None else table,
+        size=size,
+        expected_size=expected_size,
+        changes=changes,
+    )
+
+
+class TestEstimateExpectedSize:
+    def test_table(self) -> None:
+        # 24 + 8 + 4 = 36 bytes per tuple, 8168 // 36 = 226 tuples per page
+        size = estimate_expected_size(
+            kind="table", tuples=1000, width=8, fillfactor=100
+        )
+        assert size == 5 * 8192
+
+    def test_index(self) -> None:
+        # 8 + 8 + 4 = 20 bytes per tuple, int(8152 * 0.9) // 20 = 366 per page
+        size = estimate_expected_size(kind="index", tuples=1000, width=4, fillfactor=90)
+        assert size == (3 + 1) * 8192
+
+    def test_empty(self) -> None:
+        assert (
+            estimate_expected_size(kind="table", tuples=0, width=8, fillfactor=100) == 0
+        )
+
+
+class TestSelectBloated:
+    def test_main(self) -> None:
+        estimates = [
+            _estimate("a", size=100, expected_size=90),
+            _estimate("b", size=1000, expected_size=100),
+            _estimate("c", size=500, expected_size=100),
+        ]
+        result = select_bloated(estimates, min_ratio=0.2, min_bloat=100)
+        assert [e.relation for e in result] == ["b", "c"]
+
+    def test_limit(self) -> None:
+        estimates = [
+            _estimate("a", size=1000, expected_size=0),
+            _estimate("b", size=2000, expected_size=0),
+        ]
+        result = select_bloated(estimates, min_bloat=0, limit=1)
+        assert [e.relation for e in result] == ["b"]
+
+    def test_maintained(self) -> None:
+        estimates = [
+            _estimate("a", size=1000, expected_size=0, changes=5),
+            _estimate("b", size=2000, expected_size=0, changes=5),
+        ]
+        maintained = {
+            "db/a": {"size": 1000, "changes": 5},
+            "db/b": {"size": 2000, "changes": 4},
+        }
+        result = select_bloated(estimates, min_bloat=0, maintained=maintained)
+        assert [e.relation for e in result] == ["b"]
+
+
+class TestGroupByTable:
+    def test_main(self) -> None:
+        table = _estimate("t", size=2, expected_size=0)
+        index = _estimate("t_pkey", size=3, expected_size=0, table="t")
+        other = _estimate("u", size=1, expected_size=0)
+        assert group_by_table([index, other, table]) == [[index, table], [other]]
+
+
+class TestMaintenanceResult:
+    def test_text(self) -> None:
+        estimate = _estimate("t_pkey", size=3 * 1024**2, expected_size=0, table="t")
+        result = MaintenanceResult(estimate=estimate, size_after=1024**2, elapsed=1.25)
+        assert result.reclaimed == 2 * 1024**2
+        assert result.text.startswith("Reindexed db.t_pkey")
+        assert result.text.endswith("in 1.2s")
+
+    def test_vacuum_frees_without_shrinking(self) -> None:
+        estimate = _estimate("t", size=3 * 1024**2, expected_size=0)
+        result = MaintenanceResult(
+            estimate=estimate, size_after=3 * 1024**2, elapsed=1.0, freed=1024**2
+        )
+        assert result.reclaimed == 1024**2
+        assert result.text.startswith("Vacuumed db.t")
+
+
+class TestEstimateFreed:
+    def test_main(self) -> None:
+        freed = estimate_freed(size=3000, live=200, dead_before=100, dead_after=0)
+        assert freed == 1000
+
+    def test_not_vacuumed(self) -> None:
+        freed = estimate_freed(size=3000, live=200, dead_before=100, dead_after=150)
+        assert freed == 0
+
+    def test_empty(self) -> None:
+        assert estimate_freed(size=0, live=0, dead_before=0, dead_after=0) == 0
+
+
+class TestReadAndWriteMaintainState:
+    def test_main(self, *, tmp_path: Path) -> None:
+        state = {"db/public.t": {"size": 8192, "changes": 10}}
+        path = tmp_path / "dir" / "maintain.json"
+        write_maintain_state(state, path=path)
+        assert read_maintain_state(path) == state
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert read_maintain_state(tmp_path / "maintain.json") == {}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from pytest import raises
+from utilities.core import normalize_multi_line_str
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import BackupType, CommandMetrics, write_metrics, yield_metrics
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+
+class TestCommandMetrics:
+    def test_file_name(self) -> None:
+        metrics = CommandMetrics(
+            command="backup", stanza="stanza", repo=1, type_=BackupType.full
+        )
+        assert metrics.file_name == "pgbackrest_backup_stanza_repo1_full.prom"
+
+    def test_labels(self) -> None:
+        metrics = CommandMetrics(command="backup", stanza="stanza", repo=1)
+        assert metrics.labels == '{stanza="stanza",repo="1"}'
+
+    def test_labels_empty(self) -> None:
+        assert CommandMetrics(command="check").labels == ""
+
+    def test_text(self) -> None:
+        metrics = CommandMetrics(
+            command="backup",
+            stanza="stanza",
+            repo=1,
+            type_=BackupType.incr,
+            duration=1.5,
+            bytes=100,
+            repo_size=1000,
+            last_success=1234.5,
+        )
+        expected = normalize_multi_line_str("""
+            # HELP pgbackrest_backup_duration_seconds Duration of the last run of 'backup'
+            # TYPE pgbackrest_backup_duration_seconds gauge
+            pgbackrest_backup_duration_seconds{stanza="stanza",repo="1",type="incr"} 1.5
+            # HELP pgbackrest_backup_exit_status Exit status of the last run of 'backup'
+            # TYPE pgbackrest_backup_exit_status gauge
+            pgbackrest_backup_exit_status{stanza="stanza",repo="1",type="incr"} 0
+            # HELP pgbackrest_backup_last_success_timestamp_seconds Timestamp of the last successful run of 'backup'
+            # TYPE pgbackrest_backup_last_success_timestamp_seconds gauge
+            pgbackrest_backup_last_success_timestamp_seconds{stanza="stanza",repo="1",type="incr"} 1234.5
+            # HELP pgbackrest_backup_bytes Bytes transferred by the last successful run of 'backup'
+            # TYPE pgbackrest_backup_bytes gauge
+            pgbackrest_backup_bytes{stanza="stanza",repo="1",type="incr"} 100
+            # HELP pgbackrest_backup_repo_size_bytes Repository size after the last run of 'backup'
+            # TYPE pgbackrest_backup_repo_size_bytes gauge
+            pgbackrest_backup_repo_size_bytes{stanza="stanza",repo="1",type="incr"} 1000
+        """)
+        assert metrics.text == expected
+
+
+class TestWriteMetrics:
+    def test_main(self, *, tmp_path: Path) -> None:
+        metrics = CommandMetrics(command="check", duration=1.0)
+        path = write_metrics(metrics, path=tmp_path)
+        assert path == tmp_path / "pgbackrest_check.prom"
+        assert path.read_text() == metrics.text
+        assert [p.name for p in tmp_path.iterdir()] == ["pgbackrest_check.prom"]
+
+
+class TestYieldMetrics:
+    def test_success(self, *, tmp_path: Path) -> None:
+        with yield_metrics("check", path=tmp_path):
+            ...
+        text = (tmp_path / "pgbackrest_check.prom").read_text()
+        assert "pgbackrest_check_exit_status 0" in text
+        assert "pgbackrest_check_last_success_timestamp_seconds" in text
+
+    def test_failure_keeps_last_success(self, *, tmp_path: Path) -> None:
+        metrics = CommandMetrics(command="check", last_success=1234.5)
+        _ = write_metrics(metrics, path=tmp_path)
+        with raises(RunCalledProcessError), yield_metrics("check", path=tmp_path):
+            raise RunCalledProcessError(
+                cmd="pgbackrest", return_code=2, stdout="", stderr=""
+            )
+        text = (tmp_path / "pgbackrest_check.prom").read_text()
+        assert "pgbackrest_check_exit_status 2" in text
+        assert "pgbackrest_check_last_success_timestamp_seconds 1234.5" in text
+
+    def test_info_failure(self, *, monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+        def get_info_json(**_: Any) -> NoReturn:
+            raise RunCalledProcessError(
+                cmd="pgbackrest", return_code=1, stdout="", stderr=""
+            )
+
+        monkeypatch.setattr("postgres._metrics.get_info_json", get_info_json)
+        with yield_metrics("backup", path=tmp_path, stanza="stanza"):
+            ...
+        text = (tmp_path / "pgbackrest_backup_stanza.prom").read_text()
+        assert 'pgbackrest_backup_exit_status{stanza="stanza"} 0' in text
+        assert "bytes" not in text
+
+    def test_no_path(self) -> None:
+        with yield_metrics("check"):
+            ...
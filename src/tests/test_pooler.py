@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from postgres import get_pool_sizes
+
+
+class TestGetPoolSizes:
+    def test_main(self) -> None:
+        sizes = get_pool_sizes(cpu_count=8, max_connections=100, max_client_conn=5000)
+        assert sizes.default_pool_size == 17
+        assert sizes.min_pool_size == 4
+        assert sizes.reserve_pool_size == 4
+        assert sizes.max_db_connections == 87
+        assert sizes.max_client_conn == 5000
+
+    def test_capped_by_max_connections(self) -> None:
+        sizes = get_pool_sizes(cpu_count=64, max_connections=50)
+        assert sizes.max_db_connections == 42
+        assert sizes.default_pool_size == 42
+        assert sizes.reserve_pool_size == 0
+
+    def test_tiny(self) -> None:
+        sizes = get_pool_sizes(cpu_count=1, max_connections=5)
+        assert sizes.max_db_connections == 1
+        assert sizes.default_pool_size == 1
+        assert sizes.min_pool_size == 1
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pytest import approx, mark, param
+
+from postgres import ProgressEvent, ProgressTracker, format_bytes
+
+
+class TestFormatBytes:
+    @mark.parametrize(
+        ("n", "expected"),
+        [
+            param(0, "0.0B"),
+            param(1023, "1023.0B"),
+            param(1024, "1.0KiB"),
+            param(1536 * 1024, "1.5MiB"),
+            param(1024**3, "1.0GiB"),
+        ],
+    )
+    def test_main(self, *, n: int, expected: str) -> None:
+        assert format_bytes(n) == expected
+
+
+class TestProgressEvent:
+    def test_rate_and_eta(self) -> None:
+        event = ProgressEvent(files=1, bytes=1000, percent=25.0, elapsed=10.0)
+        assert event.rate == approx(100.0)
+        assert event.eta == approx(30.0)
+
+    def test_eta_unknown(self) -> None:
+        event = ProgressEvent(files=0, bytes=0, percent=0.0, elapsed=0.0)
+        assert event.eta is None
+        assert event.rate == approx(0.0)
+
+    def test_text(self) -> None:
+        event = ProgressEvent(files=2, bytes=2048, percent=50.0, elapsed=2.0)
+        assert event.text == "50.00% (2 files, 2.0KiB, 1.0KiB/s, ETA 0:00:02)"
+
+
+class TestProgressTracker:
+    def test_backup(self) -> None:
+        tracker = ProgressTracker()
+        line = "P01 DETAIL: backup file /var/lib/postgresql/17/main/base/1/1249 (456KB, 1.23%) checksum abc"
+        event = tracker.feed(line)
+        assert event is not None
+        assert event.files == 1
+        assert event.bytes == 456 * 1024
+        assert event.percent == approx(1.23)
+
+    def test_restore_bundle(self) -> None:
+        tracker = ProgressTracker()
+        line = "P02 DETAIL: restore file /var/lib/postgresql/17/main/PG_VERSION (bundle 1/0, 3B, 0.01%) checksum abc"
+        event = tracker.feed(line)
+        assert event is not None
+        assert event.bytes == 3
+
+    def test_accumulates(self) -> None:
+        tracker = ProgressTracker()
+        for _ in range(3):
+            _ = tracker.feed("P01 DETAIL: backup file /a (1MB, 10.00%) checksum abc")
+        assert tracker.files == 3
+        assert tracker.bytes == 3 * 1024**2
+
+    def test_other_line(self) -> None:
+        tracker = ProgressTracker()
+        assert tracker.feed("P00   INFO: backup command begin 2.54.0") is None
+        assert tracker.files == 0
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from pytest import mark, param, raises
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import (
+    ReplayStatus,
+    format_lsn,
+    parse_lsn,
+    parse_recovery_state,
+    wait_until_ready,
+    wal_segment_to_lsn,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pytest import MonkeyPatch
+
+
+def _error(cmd: str, /, *, return_code: int) -> RunCalledProcessError:
+    return RunCalledProcessError(cmd=cmd, return_code=return_code, stdout="", stderr="")
+
+
+class TestFormatAndParseLSN:
+    @mark.parametrize(
+        ("text", "expected"),
+        [
+            param("0/0", 0),
+            param("0/3000060", 0x3000060),
+            param("1/0", 1 << 32),
+            param("16/B374D848", (0x16 << 32) + 0xB374D848),
+        ],
+    )
+    def test_main(self, *, text: str, expected: int) -> None:
+        assert parse_lsn(text) == expected
+        assert format_lsn(expected) == text
+
+    def test_error(self) -> None:
+        with raises(ValueError, match=r"Invalid LSN 'invalid'"):
+            _ = parse_lsn("invalid")
+
+
+class TestParseRecoveryState:
+    @mark.parametrize(
+        ("text", "expected"),
+        [
+            param("f||", (False, None, False)),
+            param("t|0/3000060|not paused", (True, 0x3000060, False)),
+            param("t|0/3000060|pause requested", (True, 0x3000060, False)),
+            param("t|0/3000060|paused\n", (True, 0x3000060, True)),
+        ],
+    )
+    def test_main(self, *, text: str, expected: tuple[bool, int | None, bool]) -> None:
+        assert parse_recovery_state(text) == expected
+
+
+class TestReplayStatus:
+    def test_main(self) -> None:
+        mb = 1024**2
+        status = ReplayStatus(
+            start_lsn=0, lsn=100 * mb, elapsed=10.0, target_lsn=200 * mb
+        )
+        assert status.replayed == 100 * mb
+        assert status.rate == 10 * mb
+        assert status.eta == 10.0
+        assert status.text == "0/6400000 (100.0MiB replayed, 10.0 MB/s, ETA 0:00:10)"
+
+    def test_no_target(self) -> None:
+        status = ReplayStatus(start_lsn=0, lsn=1, elapsed=1.0)
+        assert status.eta is None
+
+    def test_no_elapsed(self) -> None:
+        status = ReplayStatus(start_lsn=0, lsn=1, elapsed=0.0, target_lsn=2)
+        assert status.rate == 0.0
+        assert status.eta is None
+
+
+class TestWALSegmentToLSN:
+    @mark.parametrize(
+        ("name", "expected"),
+        [
+            param("000000010000000000000000", "0/1000000"),
+            param("000000010000000000000003", "0/4000000"),
+            param("0000000200000001000000FF", "2/0"),
+        ],
+    )
+    def test_main(self, *, name: str, expected: str) -> None:
+        assert wal_segment_to_lsn(name) == parse_lsn(expected)
+
+    def test_error(self) -> None:
+        with raises(ValueError, match=r"Invalid WAL segment 'invalid'"):
+            _ = wal_segment_to_lsn("invalid")
+
+
+class TestWaitUntilReady:
+    def _patch(
+        self,
+        monkeypatch: MonkeyPatch,
+        /,
+        *,
+        isready: Iterator[RunCalledProcessError | None],
+        psql: Iterator[RunCalledProcessError | str],
+    ) -> None:
+        def run_or_as_user(*_: Any, **__: Any) -> None:
+            if (error := next(isready)) is not None:
+                raise error
+
+        def run_psql(*_: Any, **__: Any) -> str:
+            if isinstance(output := next(psql), RunCalledProcessError):
+                raise output
+            return output
+
+        def has_driver(**_: Any) -> bool:
+            return False
+
+        monkeypatch.setattr("postgres._recovery.has_driver", has_driver)
+        monkeypatch.setattr("postgres._recovery.run_or_as_user", run_or_as_user)
+        monkeypatch.setattr("postgres._recovery.run_psql", run_psql)
+
+    def test_polls_until_ready(self, *, monkeypatch: MonkeyPatch) -> None:
+        not_ready = _error("pg_isready", return_code=2)
+        self._patch(
+            monkeypatch,
+            isready=iter([not_ready, not_ready, None]),
+            psql=iter(["t|0/3000000|not paused", "f||"]),
+        )
+        wait_until_ready(interval=0.0)
+
+    def test_connection_lost(self, *, monkeypatch: MonkeyPatch) -> None:
+        self._patch(
+            monkeypatch,
+            isready=iter([None]),
+            psql=iter([_error("psql", return_code=2), "f||"]),
+        )
+        wait_until_ready(interval=0.0)
+
+    def test_sql_error(self, *, monkeypatch: MonkeyPatch) -> None:
+        self._patch(
+            monkeypatch,
+            isready=iter([None]),
+            psql=iter([_error("psql", return_code=1)]),
+        )
+        with raises(RunCalledProcessError):
+            wait_until_ready(interval=0.0)
+
+    def test_paused(self, *, monkeypatch: MonkeyPatch) -> None:
+        self._patch(
+            monkeypatch, isready=iter([None]), psql=iter(["t|0/3000000|paused"])
+        )
+        with raises(RuntimeError, match="paused at 0/3000000"):
+            wait_until_ready(interval=0.0)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from utilities.core import normalize_multi_line_str
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import RecoveryProfile, apply_recovery_profile, revert_recovery_profile
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import LogCaptureFixture, MonkeyPatch
+
+
+class TestRecoveryProfile:
+    def test_text(self) -> None:
+        profile = RecoveryProfile(maintenance_io_concurrency=100, max_wal_size="8GB")
+        expected = normalize_multi_line_str("""
+            # Temporary recovery profile; removed once recovery finishes
+            recovery_prefetch = on
+            maintenance_io_concurrency = 100
+            max_wal_size = '8GB'
+        """)
+        assert profile.text == expected
+
+    def test_restore_command(self) -> None:
+        profile = RecoveryProfile(archive_get_queue_max="1GiB", process_max=4)
+        expected = (
+            "pgbackrest --stanza=stanza --archive-async=y "
+            '--archive-get-queue-max=1GiB --process-max=4 archive-get %f "%p"'
+        )
+        assert profile.restore_command("stanza") == expected
+
+    def test_replace(self) -> None:
+        profile = RecoveryProfile().replace(process_max=8)
+        assert profile.process_max == 8
+
+
+class TestRevertRecoveryProfile:
+    def test_psql_failure(
+        self, *, caplog: LogCaptureFixture, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        def run_psql(*_: Any, **__: Any) -> NoReturn:
+            raise RunCalledProcessError(
+                cmd="su", return_code=2, stdout="", stderr="psql: error\n"
+            )
+
+        monkeypatch.setattr("postgres._recovery_profile.run_psql", run_psql)
+        apply_recovery_profile(RecoveryProfile(), "main", root=tmp_path)
+        path = tmp_path / "etc/postgresql/17/main/conf.d/recovery.conf"
+        assert path.is_file()
+        revert_recovery_profile("main", stanza="main", root=tmp_path)
+        assert not path.exists()
+        assert "Failed to reset 'restore_command'" in caplog.text
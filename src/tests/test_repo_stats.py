@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Any
+
+from postgres import compute_repo_stats, format_repo_stats
+
+_DAY = 24 * 60 * 60
+_GIB = 1024**3
+
+
+def _backup(
+    type_: str, day: int, /, *, size: int, delta: int, repo_delta: int, repo: int = 1
+) -> dict[str, Any]:
+    return {
+        "type": type_,
+        "timestamp": {"start": day * _DAY, "stop": day * _DAY + 60},
+        "database": {"id": 1, "repo-key": repo},
+        "info": {
+            "size": size,
+            "delta": delta,
+            "repository": {"size": repo_delta, "delta": repo_delta},
+        },
+    }
+
+
+_INFO: list[dict[str, Any]] = [
+    {
+        "name": "main",
+        "backup": [
+            _backup("full", 0, size=10 * _GIB, delta=10 * _GIB, repo_delta=2 * _GIB),
+            _backup("incr", 1, size=10 * _GIB, delta=_GIB, repo_delta=_GIB // 4),
+            _backup("full", 7, size=10 * _GIB, delta=10 * _GIB, repo_delta=2 * _GIB),
+            _backup("diff", 8, size=10 * _GIB, delta=2 * _GIB, repo_delta=_GIB // 2),
+            _backup("full", 14, size=10 * _GIB, delta=10 * _GIB, repo_delta=2 * _GIB),
+            _backup("full", 0, size=_GIB, delta=_GIB, repo_delta=_GIB, repo=2),
+        ],
+        "archive": [
+            {
+                "database": {"id": 1, "repo-key": 1},
+                "id": "17-1",
+                "min": "000000010000000000000001",
+                "max": "000000010000000000000380",
+            }
+        ],
+    }
+]
+
+
+class TestComputeRepoStats:
+    def test_main(self) -> None:
+        stats, _ = compute_repo_stats(_INFO)
+        assert (stats.stanza, stats.repo) == ("main", 1)
+        assert stats.full.count == 3
+        assert stats.full.compression_ratio == 5.0
+        assert stats.full.dedup == 0.0
+        assert stats.incr.dedup == 0.9
+        assert stats.diff.dedup == 0.8
+        assert stats.days_per_full == 7.0
+        assert stats.wal_per_day is not None
+        assert round(stats.wal_per_day / _GIB) == 1
+
+    def test_repo(self) -> None:
+        (stats,) = compute_repo_stats(_INFO, repo=2)
+        assert stats.repo == 2
+        assert stats.wal_per_day is None
+        assert stats.days_per_full is None
+
+    def test_no_backups(self) -> None:
+        assert compute_repo_stats([{"name": "main"}]) == []
+
+
+class TestRepoStatsProject:
+    def test_main(self) -> None:
+        stats, _ = compute_repo_stats(_INFO)
+        projected = stats.project(retention_full=2)
+        assert projected is not None
+        current = stats.project()
+        assert current is not None
+        assert projected < current
+
+    def test_more_retention(self) -> None:
+        stats, _ = compute_repo_stats(_INFO)
+        small, large = (stats.project(retention_full=n) for n in [2, 4])
+        assert small is not None
+        assert large is not None
+        assert large > small
+
+    def test_no_fulls(self) -> None:
+        (stats,) = compute_repo_stats([
+            {
+                "name": "main",
+                "backup": [_backup("incr", 0, size=1, delta=1, repo_delta=1)],
+            }
+        ])
+        assert stats.project() is None
+
+
+class TestFormatRepoStats:
+    def test_main(self) -> None:
+        stats, _ = compute_repo_stats(_INFO)
+        text = format_repo_stats(stats, retention_full=2)
+        assert text.splitlines()[0] == "Stanza 'main', repo 1:"
+        assert "Projected at retention full=2, diff=1" in text
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from postgres import (
+    RestoreEstimate,
+    RunRecord,
+    append_run_history,
+    estimate_restores,
+    format_restore_estimates,
+    read_run_history,
+    record_run,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from postgres import RunKind
+
+_GIB = 1024**3
+
+
+def _backup(
+    label: str, /, *, repo: int, stop: int, size: int, delta: int, lsn: str
+) -> dict[str, Any]:
+    return {
+        "label": label,
+        "database": {"id": 1, "repo-key": repo},
+        "timestamp": {"start": stop - 100, "stop": stop},
+        "info": {"repository": {"size": size, "delta": delta}},
+        "lsn": {"start": lsn, "stop": lsn},
+    }
+
+
+def _info() -> list[dict[str, Any]]:
+    return [
+        {
+            "name": "main",
+            "backup": [
+                _backup("f1", repo=1, stop=1000, size=10 * _GIB, delta=_GIB, lsn="0/0"),
+                _backup("f2", repo=2, stop=1000, size=10 * _GIB, delta=_GIB, lsn="0/0"),
+            ],
+            "archive": [
+                {
+                    "database": {"id": 1, "repo-key": 1},
+                    "max": "00000001000000000000003F",
+                },
+                {
+                    "database": {"id": 1, "repo-key": 2},
+                    "max": "00000001000000000000003F",
+                },
+            ],
+        }
+    ]
+
+
+def _record(kind: RunKind, repo: int, rate: float, /) -> RunRecord:
+    return RunRecord(
+        kind=kind,
+        stanza="main",
+        repo=repo,
+        bytes=round(100 * rate),
+        duration=100.0,
+        timestamp=0.0,
+    )
+
+
+class TestEstimateRestores:
+    def test_from_backups(self) -> None:
+        estimates = estimate_restores(_info(), [], stanza="main")
+        assert [e.repo for e in estimates] == [1, 2]
+        first = estimates[0]
+        assert first.copy_rate_source == "backups"
+        assert first.copy_rate == _GIB / 100
+        assert first.copy_seconds == 1000.0
+        assert first.wal_bytes == 64 * 16 * 1024**2
+        assert first.replay_seconds is None
+        assert first.seconds == 1000.0
+
+    def test_from_history(self) -> None:
+        history = [
+            _record("restore", 1, 0.1 * _GIB),
+            _record("restore", 2, 0.5 * _GIB),
+            _record("replay", 1, 16 * 1024**2),
+        ]
+        estimates = estimate_restores(_info(), history, stanza="main")
+        assert [e.repo for e in estimates] == [2, 1]
+        fastest = estimates[0]
+        assert fastest.copy_rate_source == "restores"
+        assert fastest.seconds == 20.0 + 64.0
+
+    def test_repo(self) -> None:
+        estimates = estimate_restores(_info(), [], stanza="main", repo=2)
+        assert [e.repo for e in estimates] == [2]
+
+
+class TestFormatRestoreEstimates:
+    def test_main(self) -> None:
+        estimates = estimate_restores(_info(), [], stanza="main")
+        text = format_restore_estimates(estimates)
+        assert text.endswith("Fastest to restore from: repo1")
+
+    def test_unknown(self) -> None:
+        estimate = RestoreEstimate(repo=1, label="f1", backup_bytes=_GIB)
+        text = format_restore_estimates([estimate])
+        assert "total ?" in text
+        assert text.endswith("cannot recommend a repo")
+
+
+class TestRunHistory:
+    def test_main(self, *, tmp_path: Path) -> None:
+        path = tmp_path.joinpath("history.jsonl")
+        records = [_record("restore", 1, 1.0), _record("replay", 1, 2.0)]
+        append_run_history(records, path=path)
+        assert read_run_history(path) == records
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert read_run_history(tmp_path.joinpath("history.jsonl")) == []
+
+    def test_record_run(self, *, tmp_path: Path) -> None:
+        path = tmp_path.joinpath("history.jsonl")
+        estimate = RestoreEstimate(repo=2, label="f1", backup_bytes=_GIB)
+        with record_run("restore", stanza="main", estimate=estimate, path=path):
+            pass
+        with record_run("replay", stanza="main", estimate=estimate, path=path):
+            pass
+        (record,) = read_run_history(path)
+        assert (record.kind, record.repo, record.bytes) == ("restore", 2, _GIB)
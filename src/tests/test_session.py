@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from pytest import importorskip, mark, param, raises
+from utilities.subprocess import RunCalledProcessError
+
+from postgres import execute, format_rows, has_driver, is_connection_error
+
+if TYPE_CHECKING:
+    from pytest import MonkeyPatch
+
+
+class TestExecute:
+    @mark.parametrize(
+        ("name", "expected"),
+        [param("UndefinedObject", 1), param("OperationalError", 2)],
+    )
+    def test_error(self, *, monkeypatch: MonkeyPatch, name: str, expected: int) -> None:
+        errors = importorskip("psycopg.errors")
+
+        class _Pool:
+            def connection(self) -> NoReturn:
+                msg = "failed"
+                raise getattr(errors, name)(msg)
+
+        def get_pool(**_: Any) -> _Pool:
+            return _Pool()
+
+        monkeypatch.setattr("postgres._session._get_pool", get_pool)
+        with raises(RunCalledProcessError) as exc_info:
+            _ = execute("ALTER ROLE r WITH PASSWORD 'secret'", port=5433)
+        error = exc_info.value
+        assert error.cmds_or_args[-1] == "--command=<redacted>"
+        assert "secret" not in str(error)
+        assert error.stderr == "failed\n"
+        assert error.return_code == expected
+        assert is_connection_error(error) is (expected == 2)
+
+
+class TestFormatRows:
+    def test_main(self) -> None:
+        rows = [(True, "0/3000060", 1), (False, None, Decimal("1.50"))]
+        assert format_rows(rows) == "t|0/3000060|1\nf||1.50"
+
+    def test_empty(self) -> None:
+        assert format_rows([]) == ""
+
+
+class TestHasDriver:
+    def test_other_user(self) -> None:
+        assert not has_driver(user="no-such-user")
+
+    @mark.parametrize(
+        ("current", "user", "expected"),
+        [
+            param("postgres", None, True),
+            param("postgres", "postgres", True),
+            param("root", "postgres", True),
+            param("root", "other", False),
+            param("other", "postgres", False),
+        ],
+    )
+    def test_peer(
+        self,
+        *,
+        monkeypatch: MonkeyPatch,
+        current: str,
+        user: str | None,
+        expected: bool,
+    ) -> None:
+        monkeypatch.setattr("postgres._session._HAS_DRIVER", True)
+        monkeypatch.setattr("postgres._session.getuser", lambda: current)
+        assert has_driver(user=user) is expected
+
+    def test_no_driver(self, *, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr("postgres._session._HAS_DRIVER", False)
+        assert not has_driver()
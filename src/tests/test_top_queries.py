@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from postgres import (
+    QueryStats,
+    diff_query_stats,
+    format_top_queries,
+    get_top_queries,
+    read_query_stats,
+    write_query_stats,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestDiffQueryStats:
+    def test_main(self) -> None:
+        before = {"1:2:3": QueryStats(key="1:2:3", calls=10, total_exec_time=100.0)}
+        after = {
+            "1:2:3": QueryStats(
+                key="1:2:3", calls=15, total_exec_time=160.0, temp_blks_written=4
+            )
+        }
+        (diff,) = diff_query_stats(before, after)
+        assert diff.calls == 5
+        assert diff.total_exec_time == 60.0
+        assert diff.temp_blks_written == 4
+
+    def test_new(self) -> None:
+        after = {"1:2:3": QueryStats(key="1:2:3", calls=2, total_exec_time=5.0)}
+        assert diff_query_stats({}, after) == list(after.values())
+
+    def test_reset(self) -> None:
+        before = {"1:2:3": QueryStats(key="1:2:3", calls=10, total_exec_time=100.0)}
+        after = {"1:2:3": QueryStats(key="1:2:3", calls=3, total_exec_time=30.0)}
+        assert diff_query_stats(before, after) == list(after.values())
+
+    def test_idle(self) -> None:
+        stats = {"1:2:3": QueryStats(key="1:2:3", calls=10, total_exec_time=100.0)}
+        assert diff_query_stats(stats, stats) == []
+
+
+class TestGetTopQueries:
+    def test_main(self) -> None:
+        stats = [
+            QueryStats(key="a", calls=1, total_exec_time=1.0, shared_blks_read=9),
+            QueryStats(key="b", calls=1, total_exec_time=3.0),
+            QueryStats(key="c", calls=1, total_exec_time=2.0, temp_blks_written=1),
+        ]
+        assert [s.key for s in get_top_queries(stats, limit=2)] == ["b", "c"]
+        assert [s.key for s in get_top_queries(stats, key="io")] == ["a"]
+        assert [s.key for s in get_top_queries(stats, key="temp")] == ["c"]
+
+
+class TestFormatTopQueries:
+    def test_main(self) -> None:
+        stats = [
+            QueryStats(
+                key="a", dbname="db", query="SELECT  1", calls=2, total_exec_time=3000.0
+            )
+        ]
+        text = format_top_queries(stats)
+        assert "1. 3.0s over 2 call(s) (1500.0ms mean)" in text
+        assert "[db] SELECT 1" in text
+        assert text.count("(none)") == 2
+
+
+class TestReadWriteQueryStats:
+    def test_main(self, *, tmp_path: Path) -> None:
+        stats = {"1:2:3": QueryStats(key="1:2:3", dbname="db", calls=1)}
+        path = tmp_path.joinpath("snapshot.json")
+        write_query_stats(stats, path=path)
+        assert read_query_stats(path) == stats
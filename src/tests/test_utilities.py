@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, ClassVar
+
+from pytest import raises
+from utilities.subprocess import RunCalledProcessError, RunFileNotFoundError
+
+from postgres import (
+    get_restore_set,
+    read_json_state,
+    read_postgresql_conf,
+    stream_or_as_user,
+    to_path_map,
+    write_json_state,
+)
+
+
+def _backup(label: str, /, *, repo: int, stop: int) -> dict[str, Any]:
+    return {"label": label, "database": {"repo-key": repo}, "timestamp": {"stop": stop}}
+
+
+class TestGetRestoreSet:
+    info: ClassVar[list[dict[str, Any]]] = [
+        {
+            "name": "stanza",
+            "backup": [
+                _backup("a", repo=1, stop=1),
+                _backup("b", repo=2, stop=3),
+                _backup("c", repo=1, stop=2),
+                _backup("d", repo=3, stop=3),
+            ],
+        }
+    ]
+
+    def test_main(self) -> None:
+        result = get_restore_set(self.info, stanza="stanza")
+        assert result is not None
+        assert result["label"] == "b"
+
+    def test_repo(self) -> None:
+        result = get_restore_set(self.info, stanza="stanza", repo=1)
+        assert result is not None
+        assert result["label"] == "c"
+
+    def test_none(self) -> None:
+        assert get_restore_set(self.info, stanza="other") is None
+
+
+class TestReadAndWriteJsonState:
+    def test_main(self, *, tmp_path: Path) -> None:
+        state = {"b": [1, 2], "a": {"c": "d"}}
+        path = tmp_path / "dir" / "state.json"
+        write_json_state(state, path=path)
+        assert read_json_state(path) == state
+        assert path.read_text().startswith('{\n  "a"')
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert read_json_state(tmp_path / "state.json") is None
+
+
+class TestReadPostgresqlConf:
+    def test_main(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "custom.conf"
+        lines = [
+            "max_connections = 200                   # (change requires restart)",
+            "#port = 5432",
+            "shared_buffers = 4GB                  # min 128kB",
+            "shared_preload_libraries = 'pg_prewarm,pg_stat_statements'",
+            "archive_command = 'it''s %p'",
+        ]
+        _ = path.write_text("\n".join(lines))
+        assert read_postgresql_conf(path) == {
+            "max_connections": "200",
+            "shared_buffers": "4GB",
+            "shared_preload_libraries": "pg_prewarm,pg_stat_statements",
+            "archive_command": "it's %p",
+        }
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert read_postgresql_conf(tmp_path / "missing.conf") == {}
+
+
+class TestStreamOrAsUser:
+    def test_main(self) -> None:
+        lines: list[str] = []
+        stream_or_as_user("printf", "a\\nb\\n", on_line=lines.append)
+        assert lines == ["a", "b"]
+
+    def test_error(self) -> None:
+        with raises(RunCalledProcessError) as exc_info:
+            stream_or_as_user("sh", "-c", "echo oops >&2; exit 3", on_line=print)
+        assert exc_info.value.return_code == 3
+        assert exc_info.value.stderr == "oops\n"
+
+    def test_missing(self) -> None:
+        with raises(RunFileNotFoundError):
+            stream_or_as_user("missing-command", on_line=print)
+
+
+class TestToPathMap:
+    def test_main(self) -> None:
+        result = to_path_map(["ts1=/mnt/a", "pg_wal=/mnt/b=c"])
+        assert result == {"ts1": Path("/mnt/a"), "pg_wal": Path("/mnt/b=c")}
+
+    def test_empty(self) -> None:
+        assert to_path_map([]) == {}
+
+    def test_error(self) -> None:
+        with raises(ValueError, match=r"Expected an item of the form 'KEY=PATH'"):
+            _ = to_path_map(["invalid"])
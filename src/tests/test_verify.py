@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from postgres import (
+    VerifyParser,
+    VerifyResult,
+    read_verify_state,
+    select_backup_sets,
+    write_verify_state,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestSelectBackupSets:
+    def test_never_verified_first(self) -> None:
+        labels = ["20240101-000000F", "20240102-000000F", "20240103-000000F"]
+        verified = {"20240101-000000F": "2024-02-01T00:00:00+00:00"}
+        result = select_backup_sets(labels, sample=2, verified=verified)
+        assert result == ["20240102-000000F", "20240103-000000F"]
+
+    def test_least_recently_verified(self) -> None:
+        labels = ["a", "b", "c"]
+        verified = {
+            "a": "2024-02-03T00:00:00+00:00",
+            "b": "2024-02-01T00:00:00+00:00",
+            "c": "2024-02-02T00:00:00+00:00",
+        }
+        assert select_backup_sets(labels, sample=2, verified=verified) == ["b", "c"]
+
+    def test_sample_exceeds(self) -> None:
+        assert select_backup_sets(["a"], sample=5) == ["a"]
+
+
+class TestVerifyParser:
+    def test_main(self) -> None:
+        parser = VerifyParser()
+        text = """\
+P00   INFO: verify command begin 2.54.0
+              backup: 20240101-000000F, status: invalid, total files checked: 100, total valid files: 99
+P01   WARN: invalid checksum '20240101-000000F/pg_data/base/1/1234.gz'
+              backup: 20240102-000000F, status: valid, total files checked: 50, total valid files: 50
+"""
+        for line in text.splitlines():
+            parser.feed(line)
+        assert parser.files_checked == 150
+        assert parser.files_valid == 149
+        assert parser.bad_files == ["20240101-000000F/pg_data/base/1/1234.gz"]
+
+    def test_info_lines_ignored(self) -> None:
+        parser = VerifyParser()
+        parser.feed("P00   INFO: checking 'invalid-looking/file'")
+        assert parser.bad_files == []
+
+
+class TestVerifyResult:
+    def test_ok(self) -> None:
+        result = VerifyResult(
+            stanza="main", duration=2.0, size=2048, files_checked=1, files_valid=1
+        )
+        assert result.ok
+        assert result.throughput == 1024.0
+
+    def test_bad(self) -> None:
+        result = VerifyResult(stanza="main", bad_files=("file",))
+        assert not result.ok
+        assert result.throughput == 0.0
+
+
+class TestReadAndWriteVerifyState:
+    def test_main(self, *, tmp_path: Path) -> None:
+        state = {"main/1": {"20240101-000000F": "2024-02-01T00:00:00+00:00"}}
+        path = tmp_path / "dir" / "verify.json"
+        write_verify_state(state, path=path)
+        assert read_verify_state(path) == state
+
+    def test_missing(self, *, tmp_path: Path) -> None:
+        assert read_verify_state(tmp_path / "verify.json") == {}
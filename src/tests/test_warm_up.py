@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from postgres import read_hot_relations, save_hot_relations, write_hot_relations
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest import MonkeyPatch
+
+    from tests.conftest import FakeBin
+
+
+class TestReadAndWriteHotRelations:
+    def test_main(self, *, tmp_path: Path) -> None:
+        relations = [("db1", "public.table"), ("db2", 'public."Table\twith tab"')]
+        path = tmp_path / "dir" / "relations.tsv"
+        write_hot_relations(relations, path=path)
+        assert read_hot_relations(path) == relations
+
+    def test_blank_lines(self, *, tmp_path: Path) -> None:
+        path = tmp_path / "relations.tsv"
+        _ = path.write_text("db\tpublic.table\n\n")
+        assert read_hot_relations(path) == [("db", "public.table")]
+
+
+class TestSaveHotRelations:
+    def test_stopped_cluster(
+        self, *, fake_bin: FakeBin, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        def has_driver(**_: Any) -> bool:
+            return False
+
+        monkeypatch.setattr("postgres._utilities.has_driver", has_driver)
+        _ = fake_bin.add("psql", exit_code=2)
+        path = tmp_path / "relations.tsv"
+        _ = path.write_text("db\tpublic.table\n")
+        save_hot_relations(path, user=None)
+        assert len(fake_bin.calls("psql")) == 1
+        assert read_hot_relations(path) == [("db", "public.table")]